@@ -0,0 +1,87 @@
+import sys
+from os import path
+
+manga_root_directory = path.dirname(path.dirname(
+    path.dirname(path.abspath(__file__))))
+sys.path.append(manga_root_directory)
+
+import ProjectLib
+import unittest
+import numpy as np
+from lxml import etree
+from ResourceLib.AboveGround.AsymmetricZOI.AsymmetricZOI import AsymmetricZOI
+from ResourceLib.BelowGround.Individual.SymmetricZOI.SymmetricZOI import SymmetricZOI
+
+
+## Minimal plant providing the attributes read by the ZOI modules
+class Plant:
+    def __init__(self, x, y, r_crown, h_stem, r_root):
+        self.x, self.y = x, y
+        self.geometry = {"r_crown": r_crown, "h_stem": h_stem, "r_root": r_root}
+
+    def getPosition(self):
+        return self.x, self.y
+
+    def getGeometry(self):
+        return self.geometry
+
+
+## Compares the analytic backend of the ZOI modules with the grid backend
+class AnalyticZOITests(unittest.TestCase):
+    l_x, l_y, resolution = 20., 16., 400
+
+    def makeArgs(self, case, backend, extra=""):
+        return etree.fromstring(
+            "<resources><type>{}</type><domain>\n<x_1>0</x_1><y_1>0</y_1>"
+            "<x_2>{}</x_2><y_2>{}</y_2><x_resolution>{}</x_resolution>"
+            "<y_resolution>{}</y_resolution></domain><backend>{}</backend>{}"
+            "</resources>".format(case, self.l_x, self.l_y, self.resolution,
+                                  int(self.resolution * self.l_y / self.l_x),
+                                  backend, extra))
+
+    def getResources(self, plants):
+        resources = {}
+        for backend in ["grid", "analytic"]:
+            asymmetric = AsymmetricZOI(self.makeArgs(
+                "AsymmetricZOI", backend, "<curved_crown>False</curved_crown>"))
+            symmetric = SymmetricZOI(self.makeArgs("SymmetricZOI", backend))
+            for module in [asymmetric, symmetric]:
+                module.prepareNextTimeStep(0, 1)
+                for plant in plants:
+                    module.addPlant(plant)
+            asymmetric.calculateAbovegroundResources()
+            symmetric.calculateBelowgroundResources()
+            resources[backend] = (asymmetric.getAbovegroundResources(),
+                                  symmetric.getBelowgroundResources())
+        return resources["grid"], resources["analytic"]
+
+    ## Two overlapping plants with equal radii share a lens, which is won by
+    #  the higher plant (asymmetric) or split between both plants (symmetric)
+    def test_lens(self):
+        r, d = 1., 1.
+        lens = 2 * r**2 * np.arccos(d / (2 * r)) - d / 2 * (4 * r**2 - d**2)**0.5
+        plants = [Plant(8., 8., r, 2., r), Plant(8. + d, 8., r, 1., r)]
+        grid, analytic = self.getResources(plants)
+        np.testing.assert_allclose(analytic[0], [1, 1 - lens / (np.pi * r**2)], rtol=1e-12)
+        np.testing.assert_allclose(analytic[1], 1 - lens / (2 * np.pi * r**2), rtol=1e-12)
+        np.testing.assert_allclose(analytic[0], grid[0], atol=0.02)
+        np.testing.assert_allclose(analytic[1], grid[1], atol=0.02)
+
+    ## Random stand with many overlaps, the grid approximates the analytic
+    #  areas up to the mesh size
+    def test_random(self):
+        rng = np.random.default_rng(0)
+        n = 200
+        plants = [Plant(x, y, r_crown, h_stem, r_root) for x, y, r_crown, h_stem, r_root in zip(
+            rng.uniform(2, self.l_x - 2, n), rng.uniform(2, self.l_y - 2, n),
+            rng.uniform(0.5, 1.5, n), rng.uniform(0, 5, n), rng.uniform(0.5, 1.5, n))]
+        grid, analytic = self.getResources(plants)
+        for grid_resources, analytic_resources in zip(grid, analytic):
+            self.assertTrue(np.all(analytic_resources < 1 + 1e-12))
+            self.assertTrue(np.any(analytic_resources < 0.5))
+            np.testing.assert_allclose(analytic_resources, grid_resources, atol=0.05)
+            self.assertLess(np.mean(np.abs(analytic_resources - grid_resources)), 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
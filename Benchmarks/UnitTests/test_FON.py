@@ -0,0 +1,107 @@
+import sys
+from os import path
+
+manga_root_directory = path.dirname(path.dirname(
+    path.dirname(path.abspath(__file__))))
+sys.path.append(manga_root_directory)
+
+import ProjectLib
+import unittest
+import numpy as np
+from lxml import etree
+from ResourceLib.BelowGround.Individual.FON.FON import FON
+
+
+## Minimal plant providing the attributes read by FON
+class Plant:
+    def __init__(self, x, y, r_stem):
+        self.x, self.y, self.r_stem = x, y, r_stem
+
+    def getPosition(self):
+        return self.x, self.y
+
+    def getGeometry(self):
+        return {"r_stem": self.r_stem}
+
+    def getParameter(self):
+        return {"aa": 10., "bb": 1., "fmin": 0.1}
+
+
+## Compares the fft backend of FON with the grid backend on random stands
+class FONBackendTests(unittest.TestCase):
+    l_x, l_y, resolution = 20., 16., 100
+
+    def makeFON(self, backend):
+        args = etree.fromstring(
+            "<resources><type>FON</type><domain>\n<x_1>0</x_1><y_1>0</y_1>"
+            "<x_2>{}</x_2><y_2>{}</y_2><x_resolution>{}</x_resolution>"
+            "<y_resolution>{}</y_resolution></domain><backend>{}</backend>"
+            "</resources>".format(self.l_x, self.l_y, self.resolution,
+                                  int(self.resolution * self.l_y / self.l_x),
+                                  backend))
+        return FON(args)
+
+    def getResources(self, x, y, r_stem):
+        resources = []
+        for backend in ["grid", "fft"]:
+            fon = self.makeFON(backend)
+            fon.prepareNextTimeStep(0, 1)
+            for i in range(len(x)):
+                fon.addPlant(Plant(x[i], y[i], r_stem[i]))
+            fon.calculateBelowgroundResources()
+            resources.append(fon.getBelowgroundResources())
+        return resources
+
+    ## Plants on nodes are exact, including plants with distinct stem radii,
+    #  plants with a FON radius smaller than a grid cell and plants outside
+    #  the grid
+    def test_nodes(self):
+        rng = np.random.default_rng(0)
+        fon = self.makeFON("grid")
+        n = 300
+        x = fon.grid_x[rng.integers(0, len(fon.grid_x), n)]
+        y = fon.grid_y[rng.integers(0, len(fon.grid_y), n)]
+        r_stem = rng.choice([0.005, 0.0517, 0.1031, 0.1543], n)
+        r_stem[:20] = rng.uniform(0.005, 0.2, 20)
+        x[0], y[0] = -3., self.l_y
+        grid, fft = self.getResources(x, y, r_stem)
+        np.testing.assert_allclose(fft, grid, rtol=0, atol=1e-12)
+
+    ## Plants at random positions, only the FON heights of neighbours are
+    #  approximated
+    def test_random(self):
+        rng = np.random.default_rng(1)
+        n = 300
+        x = rng.uniform(0, self.l_x, n)
+        y = rng.uniform(0, self.l_y, n)
+        r_stem = rng.choice([0.005, 0.0517, 0.1031, 0.1543], n)
+        r_stem[:20] = rng.uniform(0.005, 0.2, 20)
+        grid, fft = self.getResources(x, y, r_stem)
+        np.testing.assert_allclose(fft, grid, rtol=0, atol=0.15)
+        self.assertLess(np.mean(np.abs(fft - grid)), 0.01)
+
+    ## Distinct stem radii are binned, the number of FON kernels is limited by
+    #  radius_bins and no FON is calculated per plant within the grid
+    def test_scaling(self):
+        rng = np.random.default_rng(2)
+        for n in [100, 1000]:
+            fon = self.makeFON("fft")
+            calls = {"getFon": 0, "getFonKernel": 0}
+            for name in calls:
+                def count(*args, method=getattr(fon, name), name=name):
+                    calls[name] += 1
+                    return method(*args)
+                setattr(fon, name, count)
+            fon.prepareNextTimeStep(0, 1)
+            for x, y, r_stem in zip(rng.uniform(3, self.l_x - 3, n),
+                                    rng.uniform(3, self.l_y - 3, n),
+                                    rng.uniform(0.05, 0.15, n)):
+                fon.addPlant(Plant(x, y, r_stem))
+            fon.calculateBelowgroundResources()
+            self.assertEqual(calls["getFon"], 0)
+            self.assertLessEqual(calls["getFonKernel"], fon.radius_bins)
+            self.assertTrue(np.all(fon.getBelowgroundResources() <= 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
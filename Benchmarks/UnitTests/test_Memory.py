@@ -0,0 +1,63 @@
+import sys
+from os import path
+
+manga_root_directory = path.dirname(path.dirname(
+    path.dirname(path.abspath(__file__))))
+sys.path.append(manga_root_directory)
+
+import ProjectLib
+import unittest
+import numpy as np
+from types import SimpleNamespace
+from lxml import etree
+from PopulationLib.PopManager.PlantStore import PlantStore
+from PlantModelLib.Mortality.Memory.Memory import Memory
+
+
+## Tests the ring buffer of the Memory mortality module
+class MemoryTests(unittest.TestCase):
+    n_plants, steps = 4, 3
+
+    def makeStore(self):
+        store = PlantStore()
+        for i in range(self.n_plants):
+            plant = SimpleNamespace(row=None)
+            plant.row = store.addPlant(plant, x=float(i), y=0., plant_id=i,
+                                       geometry={}, network={})
+        return store
+
+    ## The buffer wraps around in place, the running sum and the growth
+    #  memory in chronological order hold the values of the last steps
+    def test_wrap_around(self):
+        memory = Memory(etree.fromstring(
+            "<group><mortality>Memory</mortality><period>{}</period>"
+            "<threshold>0.5</threshold></group>".format(self.steps)))
+        store = self.makeStore()
+        columns = store.growth_concept_information
+        plant_module = SimpleNamespace(time=1., number_of_plants=self.n_plants,
+                                       volume=np.full(self.n_plants, 2e7))
+        rng = np.random.default_rng(0)
+        history = []
+        for step in range(2 * self.steps + 1):
+            plant_module.grow = rng.uniform(0, 1, self.n_plants)
+            history.append(plant_module.grow)
+            memory.setMortalityVariablesGroup(plant_module, columns)
+            if step > 0:
+                self.assertTrue(np.shares_memory(plant_module.grow_memory,
+                                                 columns.getColumn("grow_memory_buffer")))
+            memory.getMortalityVariablesGroup(plant_module, columns)
+
+            recent = np.array(history[-self.steps:])
+            np.testing.assert_allclose(columns.getColumn("grow_memory_sum"), recent.sum(axis=0))
+            for row in range(self.n_plants):
+                self.assertEqual(columns.getValue(row, "grow_memory"), recent[:, row].tolist())
+            memory.setMortalityVariablesGroup(plant_module, columns)
+            memory.setSurviveGroup(plant_module)
+            relative_grow = recent.mean(axis=0) / plant_module.volume
+            np.testing.assert_array_equal(memory.getSurvive(),
+                                          relative_grow * 365.25 * 24 * 3600 >= 0.5)
+        self.assertIsInstance(columns.getValue(0, "grow_memory")[0], float)
+
+
+if __name__ == "__main__":
+    unittest.main()
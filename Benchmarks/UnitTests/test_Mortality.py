@@ -0,0 +1,104 @@
+import sys
+from os import path
+
+manga_root_directory = path.dirname(path.dirname(
+    path.dirname(path.abspath(__file__))))
+sys.path.append(manga_root_directory)
+
+import ProjectLib
+import unittest
+import numpy as np
+from types import SimpleNamespace
+from lxml import etree
+from PopulationLib.PopManager.PlantStore import PlantStore
+from PopulationLib.PopManager.Plant import Plant
+from PlantModelLib.PlantModel import PlantModel
+from PlantModelLib.Mortality.MortalityModel import MortalityModel
+from PlantModelLib.Mortality.NoGrowth import NoGrowth
+from PlantModelLib.Mortality.RandomGrowth.RandomGrowth import RandomGrowth
+
+
+## Mortality module implementing only the per-plant methods
+class MinimumVolume(MortalityModel):
+    def setMortalityVariables(self, plant_module, growth_concept_information):
+        plant_module.volume_min = growth_concept_information.get("volume_min", 0.5)
+
+    def setSurvive(self, plant_module):
+        self._survive = int(plant_module.volume >= plant_module.volume_min and plant_module.grow > 0)
+
+    def getMortalityVariables(self, plant_module, growth_concept_information):
+        growth_concept_information["volume_min"] = plant_module.volume_min * 1.5
+        return growth_concept_information
+
+
+## Compares the group evaluation of mortality modules with the evaluation
+#  plant by plant
+class MortalityGroupTests(unittest.TestCase):
+    n_plants = 50
+
+    def makeStore(self):
+        store = PlantStore()
+        group = SimpleNamespace(store=store, species=None, xml_args=None,
+                                group_name="Initial", plant_model=None)
+        store.addPlants(x=np.arange(self.n_plants, dtype=float),
+                        y=np.zeros(self.n_plants),
+                        plant_id=np.arange(self.n_plants), geometry={},
+                        network={},
+                        create_plant=lambda row: Plant(group, row=row))
+        return store
+
+    def makePlantModel(self, concepts, grow, volume):
+        plant_model = PlantModel()
+        plant_model.mortality_concepts = concepts
+        plant_model.time = 30 * 24 * 3600.
+        plant_model.grow, plant_model.volume = grow, volume
+        return plant_model
+
+    ## Survival status of all plants in each time step, evaluated for the
+    #  group and plant by plant
+    def getSurvival(self, concepts, grow, volume, n_steps=3, seed=0):
+        results = []
+        for group in [True, False]:
+            np.random.seed(seed)
+            store = self.makeStore()
+            plant_model = self.makePlantModel(concepts, grow, volume)
+            survival = []
+            for step in range(n_steps):
+                if group:
+                    plant_model.setTreeKillerGroup(store)
+                    survival.append(plant_model.survive)
+                    continue
+                survive = []
+                for row, plant in enumerate(store.getPlants()):
+                    plant_model.grow, plant_model.volume = grow[row], volume[row]
+                    plant_model.survive = 1
+                    gci = plant.getGrowthConceptInformation()
+                    plant_model.setMortalityVariables(gci)
+                    plant_model.setTreeKiller()
+                    plant.setGrowthConceptInformation(plant_model.getMortalityVariables(gci))
+                    survive.append(plant_model.survive)
+                survival.append(np.array(survive))
+            results.append(np.array(survival))
+        return results
+
+    def test_per_plant_fallback(self):
+        rng = np.random.default_rng(0)
+        grow = rng.uniform(-0.1, 1, self.n_plants)
+        volume = rng.uniform(0, 2, self.n_plants)
+        group, per_plant = self.getSurvival([MinimumVolume(None)], grow, volume)
+        np.testing.assert_array_equal(group, per_plant)
+        self.assertTrue(0 < group.sum() < group.size)
+
+    def test_vectorised_modules(self):
+        rng = np.random.default_rng(1)
+        grow = rng.uniform(-0.1, 1, self.n_plants)
+        volume = rng.uniform(0.5, 2, self.n_plants)
+        args = etree.fromstring("<group><mortality>RandomGrowth</mortality>"
+                                "<k_die>1e-7</k_die></group>")
+        for concepts in [[NoGrowth(None)], [RandomGrowth(args)]]:
+            group, per_plant = self.getSurvival(concepts, grow, volume)
+            np.testing.assert_array_equal(group, per_plant)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import sys
+from os import path
+
+manga_root_directory = path.dirname(path.dirname(
+    path.dirname(path.abspath(__file__))))
+sys.path.append(manga_root_directory)
+
+import ProjectLib
+import unittest
+import numpy as np
+from ProjectLib import XMLtoProject
+from PlantModelLib.PlantModel import PlantModel
+
+
+## Compares the update of whole plant groups (progressGroup) with the update
+#  plant by plant (progressPlant)
+class ProgressGroupTests(unittest.TestCase):
+    n_steps = 4
+    time_step = 30 * 24 * 3600.
+
+    def getPlantGroups(self, project_file):
+        prj = XMLtoProject(xml_project_file=path.join(
+            manga_root_directory, "Benchmarks", "ModuleBenchmarks",
+            "PlantModules", project_file))
+        return prj.getPopulationConcept().getPlantGroups()
+
+    ## Plant stores of all groups after some time steps with random resources
+    def getPlantStores(self, project_file, group):
+        rng = np.random.default_rng(0)
+        plant_groups = self.getPlantGroups(project_file)
+        for step in range(self.n_steps):
+            for plant_group in plant_groups.values():
+                plant_model = plant_group.plant_dynamic_concept
+                plant_model.prepareNextTimeStep(step * self.time_step,
+                                                (step + 1) * self.time_step)
+                plant_store = plant_group.getPlantStore()
+                n_plants = plant_store.getNumberOfPlants()
+                ag = rng.uniform(0.2, 1, n_plants)
+                bg = rng.uniform(0.2, 1, n_plants)
+                if group:
+                    plant_model.progressGroup(plant_store, ag, bg)
+                else:
+                    PlantModel.progressGroup(plant_model, plant_store, ag, bg)
+        return [plant_group.getPlantStore() for plant_group in plant_groups.values()]
+
+    def assertColumnsEqual(self, columns, reference):
+        n_plants = columns.store.getNumberOfPlants()
+        for key in reference.keys():
+            for row in range(n_plants):
+                value, expected = columns.getValue(row, key), reference.getValue(row, key)
+                if isinstance(expected, str):
+                    self.assertEqual(value, expected)
+                else:
+                    np.testing.assert_allclose(value, expected, rtol=1e-12, atol=0, err_msg=key)
+
+    def compareUpdates(self, project_file):
+        stores = self.getPlantStores(project_file, group=True)
+        references = self.getPlantStores(project_file, group=False)
+        for store, reference in zip(stores, references):
+            self.assertGreater(reference.getNumberOfPlants(), 0)
+            np.testing.assert_array_equal(store.survival, reference.survival)
+            self.assertColumnsEqual(store.geometry, reference.geometry)
+            self.assertColumnsEqual(store.growth_concept_information,
+                                    reference.growth_concept_information)
+
+    def test_bettina(self):
+        self.compareUpdates("Bettina/Mortality/NoGrowth/NoGrowth_CI.xml")
+        self.compareUpdates("Bettina/Mortality/Memory/Memory_CI.xml")
+
+    def test_jabowa(self):
+        self.compareUpdates("Jabowa/Mortality/NoGrowth/NoGrowth_CI.xml")
+        self.compareUpdates("Jabowa/Mortality/Memory/Memory_CI.xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import sys
+from os import path
+
+manga_root_directory = path.dirname(path.dirname(
+    path.dirname(path.abspath(__file__))))
+sys.path.append(manga_root_directory)
+
+import ProjectLib
+import unittest
+import numpy as np
+from types import SimpleNamespace
+from PopulationLib.PopManager.PlantStore import PlantStore
+
+
+## Tests column types and compaction of the columnar plant store
+class PlantStoreTests(unittest.TestCase):
+    def makeStore(self, n_plants):
+        store = PlantStore()
+        for i in range(n_plants):
+            plant = SimpleNamespace(row=None)
+            plant.row = store.addPlant(plant, x=float(i), y=2. * i, plant_id=i,
+                                       geometry={"r_stem": i}, network={})
+        return store
+
+    ## Columns are widened from integer to float to object values
+    def test_widening(self):
+        store = self.makeStore(3)
+        columns = store.geometry
+        self.assertEqual(columns.getColumn("r_stem").dtype.kind, "i")
+        columns.setValue(1, "r_stem", 0.5)
+        self.assertEqual(columns.getColumn("r_stem").dtype.kind, "f")
+        self.assertEqual(columns.getValue(0, "r_stem"), 0)
+        self.assertEqual(columns.getValue(1, "r_stem"), 0.5)
+        columns.setValue(2, "r_stem", "large")
+        self.assertEqual(columns.getColumn("r_stem").dtype, object)
+        self.assertEqual([columns.getValue(i, "r_stem") for i in range(3)], [0, 0.5, "large"])
+        # Block of values
+        columns.setValues(0, "h_stem", np.array([1, 2, 3]))
+        columns.setValues(1, "h_stem", np.array([2.5, 3.5]))
+        self.assertEqual(columns.getColumn("h_stem").tolist(), [1., 2.5, 3.5])
+
+    ## Vectors of different length are padded with zeros
+    def test_vectors(self):
+        store = self.makeStore(2)
+        columns = store.growth_concept_information
+        columns.setValue(0, "memory", np.array([1., 2.]))
+        columns.setValue(1, "memory", np.array([1., 2., 3.]))
+        np.testing.assert_array_equal(columns.getColumn("memory"), [[1., 2., 0.], [1., 2., 3.]])
+        np.testing.assert_array_equal(columns.getValue(0, "memory"), [1., 2., 0.])
+
+    ## Removing plants keeps the order of the remaining plants and their variables
+    def test_compaction(self):
+        store = self.makeStore(6)
+        store.growth_concept_information.setValue(1, "age", 10)
+        store.growth_concept_information.setValue(4, "age", 40)
+        store.geometry.setValue(3, "name", "plant_3")
+        store.removePlants([1, 4])
+        self.assertEqual(store.getNumberOfPlants(), 4)
+        np.testing.assert_array_equal(store.plant_id, [0, 2, 3, 5])
+        np.testing.assert_array_equal(store.x, [0., 2., 3., 5.])
+        np.testing.assert_array_equal(store.y, [0., 4., 6., 10.])
+        self.assertEqual(store.geometry.getColumn("r_stem").tolist(), [0, 2, 3, 5])
+        self.assertEqual([plant.row for plant in store.getPlants()], [0, 1, 2, 3])
+        # Removed plants do not leave values behind
+        self.assertFalse(store.growth_concept_information.getPresent("age").any())
+        self.assertEqual(store.geometry.getValue(2, "name"), "plant_3")
+        self.assertEqual(store.geometry.getRowKeys(1), ["r_stem"])
+
+    ## Plants not marked to be kept are removed in one pass
+    def test_keep_plants(self):
+        store = self.makeStore(6)
+        store.geometry.setValue(3, "name", "plant_3")
+        store.keepPlants(np.array([True, False, True, True, False, True]))
+        np.testing.assert_array_equal(store.plant_id, [0, 2, 3, 5])
+        np.testing.assert_array_equal(store.y, [0., 4., 6., 10.])
+        self.assertEqual([plant.row for plant in store.getPlants()], [0, 1, 2, 3])
+        self.assertFalse(store.geometry.getPresent("name")[[0, 1, 3]].any())
+        store.keepPlants(np.array([False, True, True, False]))
+        np.testing.assert_array_equal(store.plant_id, [2, 3])
+        self.assertEqual(store.geometry.getValue(1, "name"), "plant_3")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import sys
+from os import path
+
+manga_root_directory = path.dirname(path.dirname(
+    path.dirname(path.abspath(__file__))))
+sys.path.append(manga_root_directory)
+
+import ProjectLib
+import unittest
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree
+from ResourceLib import ResourceModel
+from ResourceLib.AboveGround.AsymmetricZOI.AsymmetricZOI import AsymmetricZOI
+from ResourceLib.BelowGround.Individual.SymmetricZOI.SymmetricZOI import SymmetricZOI
+from ResourceLib.BelowGround.Individual.FON.FON import FON
+
+
+## Minimal plant providing the attributes read by the ZOI and FON modules
+class Plant:
+    def __init__(self, x, y, r_crown, h_stem, r_root, r_stem):
+        self.x, self.y = x, y
+        self.geometry = {"r_crown": r_crown, "h_stem": h_stem,
+                         "r_root": r_root, "r_stem": r_stem}
+
+    def getPosition(self):
+        return self.x, self.y
+
+    def getGeometry(self):
+        return self.geometry
+
+    def getParameter(self):
+        return {"aa": 10., "bb": 1., "fmin": 0.1}
+
+
+## Below-ground module drawing random numbers from the global random state
+class RandomResources(ResourceModel):
+    def __init__(self, n_plants):
+        self.n_plants = n_plants
+
+    def calculateBelowgroundResources(self):
+        self.belowground_resources = np.random.random(self.n_plants)
+
+
+## Compares resources calculated on a thread pool with the serial calculation
+class ResourceThreadTests(unittest.TestCase):
+    l_x, l_y, resolution = 20., 16., 100
+    ## Grid configurations: whole grid, bands, tiles and stencil cache
+    configurations = ["", "<memory_limit>0.02</memory_limit>",
+                      "<tile_size>16</tile_size>", "<stencil_cache>True</stencil_cache>"]
+
+    def makeArgs(self, case, extra):
+        return etree.fromstring(
+            "<resources><type>{}</type><domain>\n<x_1>0</x_1><y_1>0</y_1>"
+            "<x_2>{}</x_2><y_2>{}</y_2><x_resolution>{}</x_resolution>"
+            "<y_resolution>{}</y_resolution></domain>{}"
+            "</resources>".format(case, self.l_x, self.l_y, self.resolution,
+                                  int(self.resolution * self.l_y / self.l_x), extra))
+
+    def makePlants(self, seed, n=300):
+        rng = np.random.default_rng(seed)
+        return [Plant(*values) for values in zip(
+            rng.uniform(0, self.l_x, n), rng.uniform(0, self.l_y, n),
+            rng.uniform(0.2, 2, n), rng.uniform(-1, 10, n),
+            rng.uniform(0.2, 2, n), rng.uniform(0.02, 0.15, n))]
+
+    ## Resources of all modules for a number of threads
+    def getResources(self, plants, configuration, n_threads):
+        extra = configuration + "<n_threads>{}</n_threads>".format(n_threads)
+        modules = [AsymmetricZOI(self.makeArgs("AsymmetricZOI", extra)),
+                   SymmetricZOI(self.makeArgs("SymmetricZOI", extra)),
+                   FON(self.makeArgs("FON", extra))]
+        resources = []
+        for module in modules:
+            module.prepareNextTimeStep(0, 1)
+            for plant in plants:
+                module.addPlant(plant)
+            if isinstance(module, AsymmetricZOI):
+                module.calculateAbovegroundResources()
+                resources.append(module.getAbovegroundResources())
+            else:
+                module.calculateBelowgroundResources()
+                resources.append(module.getBelowgroundResources())
+            module.shutdownThreadPool()
+        return resources
+
+    ## Results on the thread pool are identical to the serial results
+    def test_threads(self):
+        for seed, configuration in enumerate(self.configurations):
+            with self.subTest(configuration=configuration):
+                plants = self.makePlants(seed)
+                serial = self.getResources(plants, configuration, 1)
+                threaded = self.getResources(plants, configuration, 4)
+                for serial_resources, threaded_resources in zip(serial, threaded):
+                    self.assertTrue(np.any(serial_resources < 1))
+                    np.testing.assert_array_equal(threaded_resources, serial_resources)
+
+    ## Modules calculated concurrently (see ResourceModel.calculateConcurrently)
+    #  give the serial results, also if modules draw random numbers
+    def test_concurrent_resources(self):
+        plants = self.makePlants(seed=10)
+        results = []
+        for thread_pool in [None, ThreadPoolExecutor(max_workers=2)]:
+            np.random.seed(0)
+            modules = [AsymmetricZOI(self.makeArgs("AsymmetricZOI", "")),
+                       RandomResources(len(plants)),
+                       SymmetricZOI(self.makeArgs("SymmetricZOI", "")),
+                       RandomResources(len(plants))]
+            for module in modules[::2]:
+                module.prepareNextTimeStep(0, 1)
+                for plant in plants:
+                    module.addPlant(plant)
+            calculations = [modules[0].calculateAbovegroundResources] + [
+                module.calculateBelowgroundResources for module in modules[1:]]
+            ResourceModel.calculateConcurrently(modules, calculations, thread_pool)
+            results.append([modules[0].getAbovegroundResources()] + [
+                module.getBelowgroundResources() for module in modules[1:]])
+            if thread_pool is not None:
+                thread_pool.shutdown()
+        serial, concurrent = results
+        self.assertFalse(np.array_equal(serial[1], serial[3]))
+        for serial_resources, concurrent_resources in zip(serial, concurrent):
+            np.testing.assert_array_equal(concurrent_resources, serial_resources)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import sys
+from os import path
+
+manga_root_directory = path.dirname(path.dirname(
+    path.dirname(path.abspath(__file__))))
+sys.path.append(manga_root_directory)
+
+import ProjectLib
+import unittest
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from ResourceLib.SharedGrid import SharedGrid
+
+
+## Tests the registry and the footprints of shared grids
+class SharedGridTests(unittest.TestCase):
+    def getGrid(self, y_resolution=50):
+        return SharedGrid.getGrid(0, 10, 0, 5, 100, y_resolution)
+
+    def test_release(self):
+        grid = self.getGrid(y_resolution=51)
+        self.assertFalse(grid.isShared())
+        self.assertIs(self.getGrid(y_resolution=51), grid)
+        self.assertTrue(grid.isShared())
+        grid.getDistance(2., 3., (slice(20, 40), slice(10, 30)))
+        self.assertEqual(len(grid.footprints), 1)
+        grid.releaseGrid()
+        self.assertFalse(grid.isShared())
+        self.assertEqual(grid.footprints, {})
+
+    ## Footprints extended on several threads give the same distances
+    def test_threads(self):
+        grid = self.getGrid()
+        rng = np.random.default_rng(0)
+        windows = []
+        for start in rng.integers(0, 40, (200, 2)):
+            windows.append((slice(start[0], start[0] + 10), slice(start[1], start[1] + 20)))
+        with ThreadPoolExecutor(max_workers=4) as thread_pool:
+            distances = list(thread_pool.map(lambda window: grid.getDistance(4.2, 2.1, window), windows))
+        for window, distance in zip(windows, distances):
+            np.testing.assert_array_equal(distance, grid.calculateDistance(4.2, 2.1, window))
+        self.assertTrue(SharedGrid.coversWindow(grid.footprints[(4.2, 2.1)][0], windows[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import sys
+from os import path
+
+manga_root_directory = path.dirname(path.dirname(
+    path.dirname(path.abspath(__file__))))
+sys.path.append(manga_root_directory)
+
+import ProjectLib
+import unittest
+import numpy as np
+from PopulationLib.PopManager.SpatialIndex import SpatialIndex, NeighbourList
+
+
+## Compares neighbour queries of the KD-tree with brute force
+class SpatialIndexTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = rng.uniform(0, 20, 400)
+        self.y = rng.uniform(0, 10, 400)
+        self.radius = rng.uniform(0.1, 1., 400)
+        # Duplicate positions
+        self.x[1], self.y[1] = self.x[0], self.y[0]
+        self.distance = ((self.x[:, np.newaxis] - self.x[np.newaxis, :])**2 +
+                         (self.y[:, np.newaxis] - self.y[np.newaxis, :])**2)**0.5
+
+    def getBrutePairs(self, mask):
+        i, j = np.nonzero(np.triu(mask, k=1))
+        return np.stack((i, j), axis=1)
+
+    def test_plants_within(self):
+        spatial_index = SpatialIndex(self.x, self.y)
+        for k in [0, 17, 399]:
+            np.testing.assert_array_equal(spatial_index.getPlantsWithin(self.x[k], self.y[k], 1.5),
+                                          np.flatnonzero(self.distance[k] <= 1.5))
+
+    def test_pairs_within(self):
+        spatial_index = SpatialIndex(self.x, self.y)
+        np.testing.assert_array_equal(spatial_index.getPairsWithin(1.),
+                                      self.getBrutePairs(self.distance <= 1.))
+
+    def test_overlapping_pairs(self):
+        overlap = self.distance < self.radius[:, np.newaxis] + self.radius[np.newaxis, :]
+        expected = self.getBrutePairs(overlap)
+        np.testing.assert_array_equal(SpatialIndex(self.x, self.y).getOverlappingPairs(self.radius), expected)
+        np.testing.assert_array_equal(NeighbourList(skin=0.2).getOverlappingPairs(self.x, self.y, self.radius),
+                                      expected)
+
+    ## A single large plant does not change the result for small plants
+    def test_overlapping_pairs_large_plant(self):
+        radius = self.radius.copy()
+        radius[5] = 5.
+        overlap = self.distance < radius[:, np.newaxis] + radius[np.newaxis, :]
+        np.testing.assert_array_equal(SpatialIndex(self.x, self.y).getOverlappingPairs(radius),
+                                      self.getBrutePairs(overlap))
+
+    def test_few_plants(self):
+        self.assertEqual(SpatialIndex([], []).getOverlappingPairs([]).shape, (0, 2))
+        self.assertEqual(SpatialIndex([1.], [1.]).getPairsWithin(1.).shape, (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import sys
+from os import path
+
+manga_root_directory = path.dirname(path.dirname(
+    path.dirname(path.abspath(__file__))))
+sys.path.append(manga_root_directory)
+
+import ProjectLib
+import unittest
+import numpy as np
+from ResourceLib.StencilCache import StencilCache
+
+
+## Tests the least recently used eviction of the stencil cache
+class StencilCacheTests(unittest.TestCase):
+    def setUp(self):
+        grid_x = np.linspace(0.05, 9.95, 100)
+        grid_y = np.linspace(0.05, 4.95, 50)
+        self.cache = StencilCache(grid_x=grid_x, grid_y=grid_y, resolution=4, size=2)
+
+    def getKeys(self):
+        return [key[0] for key in self.cache.stencils.keys()]
+
+    def test_eviction(self):
+        radius_step = self.cache.radius_step
+        # Stencils keyed on the radius only (same sub-cell offset)
+        self.cache.getStencil(5.05, 2.05, 1 * radius_step)
+        self.cache.getStencil(5.05, 2.05, 2 * radius_step)
+        self.assertEqual(self.getKeys(), [1, 2])
+        # A hit marks the stencil as recently used
+        self.cache.getStencil(1.05, 1.05, 1 * radius_step)
+        self.assertEqual(self.getKeys(), [2, 1])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+        # The least recently used stencil is removed
+        self.cache.getStencil(5.05, 2.05, 3 * radius_step)
+        self.assertEqual(self.getKeys(), [1, 3])
+        self.cache.getStencil(5.05, 2.05, 2 * radius_step)
+        self.assertEqual(self.getKeys(), [3, 2])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 4))
+
+    def test_distance(self):
+        # Positions on nodes are exact
+        (rows, columns), distance = self.cache.getStencil(5.05, 2.05, 0.5)
+        grid_x, grid_y = self.cache.grid_x[columns], self.cache.grid_y[rows]
+        expected = ((grid_x[np.newaxis, :] - 5.05)**2 + (grid_y[:, np.newaxis] - 2.05)**2)**0.5
+        np.testing.assert_allclose(distance, expected, atol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
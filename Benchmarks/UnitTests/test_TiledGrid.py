@@ -0,0 +1,38 @@
+import sys
+from os import path
+
+manga_root_directory = path.dirname(path.dirname(
+    path.dirname(path.abspath(__file__))))
+sys.path.append(manga_root_directory)
+
+import ProjectLib
+import unittest
+import numpy as np
+from ResourceLib.TiledGrid import TiledGrid
+
+
+## Compares the sparse tiled grid with a dense array
+class TiledGridTests(unittest.TestCase):
+    def test_dense(self):
+        rng = np.random.default_rng(0)
+        background = np.arange(23, dtype=float)
+        dense = np.tile(background, (17, 1))
+        tiled = TiledGrid((17, 23), tile_size=5, background=background)
+        for rows, columns in [(slice(0, 3), slice(4, 12)), (slice(10, 17), slice(20, 23)),
+                              (slice(2, 8), slice(0, 6))]:
+            values = rng.uniform(size=(rows.stop - rows.start, columns.stop - columns.start))
+            tiled[rows, columns] += values
+            dense[rows, columns] += values
+        # Only tiles intersecting the windows are allocated
+        self.assertEqual(len(tiled.getAllocatedTileKeys()), 7)
+        np.testing.assert_array_equal(tiled.toArray(), dense)
+        np.testing.assert_array_equal(tiled[slice(1, 16), slice(3, 21)], dense[1:16, 3:21])
+        rows, columns = rng.integers(0, 17, 50), rng.integers(0, 23, 50)
+        np.testing.assert_array_equal(tiled[rows, columns], dense[rows, columns])
+        tiled[rows, columns] = -1.
+        dense[rows, columns] = -1.
+        np.testing.assert_array_equal(tiled.map(np.exp).toArray(), np.exp(dense))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -91,6 +91,62 @@ class Bettina(PlantModel):
         else:
             tree.setSurvival(0)
 
+    def progressGroup(self, plant_store, aboveground_resources, belowground_resources):
+        """
+        Manage growth procedures of all plants of a group for a timestep.
+        Same procedure as ``progressPlant``, but evaluated as array expressions on the columns of the plant store.
+        Args:
+            plant_store (PlantStore): columnar store of the plants of a group
+            aboveground_resources (array): aboveground resource growth reduction factors, shape(number_of_plants)
+            belowground_resources (array): belowground resource growth reduction factors, shape(number_of_plants)
+        """
+        geometry = plant_store.geometry
+        growth_concept_information = plant_store.growth_concept_information
+        aboveground_resources = np.asarray(aboveground_resources)
+        belowground_resources = np.asarray(belowground_resources)
+        self.parameter = plant_store.getParameter()
+        self.r_crown = np.array(geometry.getColumn("r_crown"), dtype=float)
+        self.h_crown = np.array(geometry.getColumn("h_crown"), dtype=float)
+        self.r_root = np.array(geometry.getColumn("r_root"), dtype=float)
+        self.h_root = np.array(geometry.getColumn("h_root"), dtype=float)
+        self.r_stem = np.array(geometry.getColumn("r_stem"), dtype=float)
+        self.h_stem = np.array(geometry.getColumn("h_stem"), dtype=float)
+
+        self.flowLength()
+        self.treeVolume()
+        self.treeMaintenance()
+        self.bgResources(belowground_resources)
+        self.agResources(aboveground_resources)
+        self.biomassIncrement()
+        # Check if trees survive based on selected mortality concepts
+        super().setTreeKillerGroup(plant_store)
+        self.treeGrowthWeights()
+        self.treeGrowth()
+        geometry.setColumn("r_crown", self.r_crown)
+        geometry.setColumn("h_crown", self.h_crown)
+        geometry.setColumn("r_root", self.r_root)
+        geometry.setColumn("h_root", self.h_root)
+        geometry.setColumn("r_stem", self.r_stem)
+        geometry.setColumn("h_stem", self.h_stem)
+        growth_concept_information.setColumn(
+            "root_surface_resistance", self.root_surface_resistance)
+        growth_concept_information.setColumn("xylem_resistance", self.xylem_resistance)
+        growth_concept_information.setColumn("ag_resources", self.ag_resources)
+        growth_concept_information.setColumn("bg_resources", self.bg_resources)
+        growth_concept_information.setColumn("growth", self.grow)
+        growth_concept_information.setColumn("available_resources", self.available_resources)
+        growth_concept_information.setColumn("psi_zero", self.deltaPsi())
+        growth_concept_information.setColumn("weight_girthgrowth", self.weight_girthgrowth)
+        growth_concept_information.setColumn("weight_stemgrowth", self.weight_stemgrowth)
+        growth_concept_information.setColumn("weight_crowngrowth", self.weight_crowngrowth)
+        growth_concept_information.setColumn("weight_rootgrowth", self.weight_rootgrowth)
+        growth_concept_information.setColumn("bg_factor", belowground_resources)
+        growth_concept_information.setColumn("ag_factor", aboveground_resources)
+        growth_concept_information.setColumn(
+            "age", growth_concept_information.getColumnWithDefault("age", 0) + self.time)
+
+        plant_store.survival[:] = self.survive == 1
+
     def treeGrowth(self):
         """
         Update tree geometry.
@@ -265,8 +321,16 @@ class Bettina(PlantModel):
         Sets:
             multiple float
         """
-        self.available_resources = min(self.ag_resources, self.bg_resources)
-        self.grow = (self.parameter["growth_factor"] *
-                     (self.available_resources - self.maint))
+        self.biomassIncrement()
         # Check if trees survive based on selected mortality concepts
         super().setTreeKiller()
+
+    def biomassIncrement(self):
+        """
+        Calculate the available resources and the biomass increment, without evaluating mortality.
+        Sets:
+            multiple float or arrays
+        """
+        self.available_resources = np.minimum(self.ag_resources, self.bg_resources)
+        self.grow = (self.parameter["growth_factor"] *
+                     (self.available_resources - self.maint))
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 from PlantModelLib.Bettina import Bettina
+from PlantModelLib.PlantModel import PlantModel
 import numpy as np
 
 
@@ -68,6 +69,18 @@ class BettinaNetwork(Bettina):
         else:
             tree.setSurvival(0)
 
+    def progressGroup(self, plant_store, aboveground_resources, belowground_resources):
+        """
+        Manage growth procedures of all plants of a group for a timestep.
+        Root graft formation depends on the network of each plant, hence ``progressPlant`` is called for each plant
+        (see `pyMANGA.PlantModelLib.PlantModel`).
+        Args:
+            plant_store (PlantStore): columnar store of the plants of a group
+            aboveground_resources (array): above-ground resource growth reduction factors, shape(number_of_plants)
+            belowground_resources (array): below-ground resource growth reduction factors, shape(number_of_plants)
+        """
+        PlantModel.progressGroup(self, plant_store, aboveground_resources, belowground_resources)
+
     def treeGrowthWeights(self):
         """
         Calculate the growth weights for distributing biomass increment to the tree geometries.
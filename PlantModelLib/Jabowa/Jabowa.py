@@ -5,6 +5,7 @@
 @author: ronny.peters@tu-dresden.de
 """
 from PlantModelLib import PlantModel
+import numpy as np
 
 
 class Jabowa(PlantModel):
@@ -78,3 +79,55 @@ class Jabowa(PlantModel):
             tree.setSurvival(1)
         else:
             tree.setSurvival(0)
+
+    def progressGroup(self, plant_store, aboveground_resources, belowground_resources):
+        """
+        Manage growth procedures of all plants of a group for a timestep.
+        Same procedure as ``progressPlant``, but evaluated as array expressions on the columns of the plant store.
+        Args:
+            plant_store (PlantStore): columnar store of the plants of a group
+            aboveground_resources (array): aboveground resource growth reduction factors, shape(number_of_plants)
+            belowground_resources (array): belowground resource growth reduction factors, shape(number_of_plants)
+        """
+        geometry = plant_store.geometry
+        growth_concept_information = plant_store.growth_concept_information
+        parameter = plant_store.getParameter()
+        aboveground_resources = np.asarray(aboveground_resources)
+        belowground_resources = np.asarray(belowground_resources)
+
+        # dbh and height are in cm as in Berger & Hildenbrandt 2000
+        dbh = np.array(geometry.getColumn("r_stem"), dtype=float) * 200
+
+        height = (137 + parameter["b2"] * dbh - parameter["b3"] * dbh**2)
+        self.grow = (
+            parameter["max_growth"] * dbh *
+            (1 - (dbh * height) / (parameter["max_dbh"] * parameter["max_height"]))
+            /
+            (274 + 3 * parameter["b2"] * dbh - 4 * parameter["b3"] * dbh**2) *
+            belowground_resources * aboveground_resources)
+        dbh = dbh + self.grow * self.time / (3600 * 24 * 365.25)
+
+        # Scaling dbh to zone of influence (ZOI) based on eq. 1 in
+        # Berger & Hildenbrandt 2000
+        r_zoi = parameter["a_zoi_scaling"] * (dbh/2/100)**0.5
+
+        # Update plant store columns
+        geometry.setColumn("r_stem", dbh / 200)
+        geometry.setColumn("r_root", r_zoi)
+        geometry.setColumn("r_crown", r_zoi)
+        geometry.setColumn("height", height / 100)
+        geometry.setColumn("h_stem", height / 100 - 2*r_zoi)
+
+        growth_concept_information.setColumn("growth", self.grow)
+        growth_concept_information.setColumn("bg_factor", belowground_resources)
+        growth_concept_information.setColumn("ag_factor", aboveground_resources)
+        growth_concept_information.setColumn(
+            "age", growth_concept_information.getColumnWithDefault("age", 0) + self.time)
+
+        # Mortality
+        # Write dbh in volume variable to be used in mortality concept `Memory`
+        self.volume = dbh
+        # Check if trees survive based on selected mortality concepts
+        super().setTreeKillerGroup(plant_store)
+
+        plant_store.survival[:] = self.survive == 1
@@ -38,6 +38,20 @@ class MaxAge(NoGrowth):
         if r * steps_per_year < self.p:
             self._survive = 0
 
+    def setSurviveGroup(self, plant_module):
+        """
+        Determine for all plants of a group if they survive based on annual probability to reach maximum age.
+        One random number is drawn per plant.
+        Args:
+            plant_module (class): "PlantModel" object
+        Sets:
+            survival status (array)
+        """
+        r = np.random.uniform(0, 1, plant_module.number_of_plants)
+        # Number of time steps per year
+        steps_per_year = super().getStepsPerYear(plant_module)
+        self._survive = np.where(r * steps_per_year < self.p, 0, 1)
+
     def getSurvive(self):
         """
         Get survival status of a plant.
@@ -2,7 +2,6 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 from PlantModelLib.Mortality.NoGrowth import NoGrowth
-from PlantModelLib.PlantModel import PlantModel
 
 
 class Memory(NoGrowth):
@@ -28,35 +27,51 @@ class Memory(NoGrowth):
         Sets:
             survival status (bool)
         """
-        self._survive = 1
+        self._survive = int(self.getMemorySurvival(plant_module)[0])
 
-        # Get the number of values representing the memory period
-        steps = int(self.period / plant_module.time)
+    def setSurviveGroup(self, plant_module):
+        """
+        Determine for all plants of a group if they survive based on memory period and average growth during
+        this period.
+        Args:
+            plant_module (class): "PlantModel" object
+        Sets:
+            survival status (array)
+        """
+        self._survive = self.getMemorySurvival(plant_module)
 
-        # Slice grow_memory array to get only relevant data
-        relevant_grow_memory = plant_module.grow_memory[-steps:]
-        # Check only for survival if memory exist
-        if relevant_grow_memory:
-            # Calculate average growth during memory period
-            grow_memory = np.mean(relevant_grow_memory)
+    def getMemorySurvival(self, plant_module):
+        """
+        Calculate survival status from the average growth stored in the growth memory of the plant(s).
+        Args:
+            plant_module (class): "PlantModel" object
+        Returns:
+            array
+        """
+        count = plant_module.grow_memory_count
+        # Calculate average growth during memory period (running sum of the memory)
+        grow_memory = plant_module.grow_memory_sum / np.maximum(count, 1)
 
-            # Calculate growth relative to biomass (volume per volume or diameter per diameter)
+        # Calculate growth relative to biomass (volume per volume or diameter per diameter)
+        with np.errstate(divide="ignore", invalid="ignore"):
             relative_grow = grow_memory / plant_module.volume
 
-            # Number of time steps per year
-            steps_per_year = super().getStepsPerYear(plant_module)
-            # Check if relative growth is below a certain threshold (multiply relative growth
-            # with number of time steps per year to induce a yearly mortality)
-            if relative_grow*steps_per_year < self.threshold:
-                self._survive = 0
+        # Number of time steps per year
+        steps_per_year = super().getStepsPerYear(plant_module)
+        # Check only for survival if memory exist
+        # Check if relative growth is below a certain threshold (multiply relative growth
+        # with number of time steps per year to induce a yearly mortality)
+        return np.where((count > 0) & (relative_grow*steps_per_year < self.threshold), 0, 1)
 
-    def getSurvive(self):
+    def getMemoryLength(self, plant_module):
         """
-        Get survival status of a plant.
+        Return the number of time steps representing the memory period, i.e., the length of the growth memory.
+        Args:
+            plant_module (class): "PlantModel" object
         Returns:
-            survival status (bool), 0 = plant died, 1 = plant lived.
+            int
         """
-        return self._survive
+        return max(int(self.period / plant_module.time), 1)
 
     def setMortalityVariables(self, plant_module, growth_concept_information):
         """
@@ -66,13 +81,19 @@ class Memory(NoGrowth):
             plant_module (class): "PlantModel" object
             growth_concept_information (dict): dictionary containing growth information of the respective plant
         Sets:
-            value in dictionary
+            growth memory of the plant
         """
         # Variable to store growth (m³ per time step)
         try:
-            plant_module.grow_memory = growth_concept_information["grow_memory"]
+            buffer = np.asarray(growth_concept_information["grow_memory_buffer"], dtype=float)[np.newaxis, :]
+            position = growth_concept_information["grow_memory_position"]
+            count = growth_concept_information["grow_memory_count"]
+            grow_memory_sum = growth_concept_information["grow_memory_sum"]
         except KeyError:
-            plant_module.grow_memory = []
+            buffer = np.zeros((1, 0))
+            position, count, grow_memory_sum = 0, 0, 0.
+        self.setMemory(plant_module, buffer, position=np.array([position]), count=np.array([count]),
+                       grow_memory_sum=np.array([grow_memory_sum], dtype=float))
 
     def getMortalityVariables(self, plant_module, growth_concept_information):
         """
@@ -83,11 +104,141 @@ class Memory(NoGrowth):
         Returns:
             dictionary with updated growth concept information
         """
-        plant_module.grow_memory.append(plant_module.grow)
-        growth_concept_information["grow_memory"] = \
-            plant_module.grow_memory
+        self.updateMemory(plant_module)
+        growth_concept_information["grow_memory_buffer"] = plant_module.grow_memory[0]
+        growth_concept_information["grow_memory_position"] = int(plant_module.grow_memory_position[0])
+        growth_concept_information["grow_memory_count"] = int(plant_module.grow_memory_count[0])
+        growth_concept_information["grow_memory_sum"] = float(plant_module.grow_memory_sum[0])
+        growth_concept_information["grow_memory"] = self.getMemoryHistory(
+            plant_module.grow_memory[0], plant_module.grow_memory_position[0], plant_module.grow_memory_count[0])
         return growth_concept_information
 
+    def setMortalityVariablesGroup(self, plant_module, growth_concept_information):
+        """
+        Initiate variables for all plants of a group, see ``setMortalityVariables``.
+        The ring buffers are used in place, i.e., they are only copied if their length changed.
+        Args:
+            plant_module (class): "PlantModel" object
+            growth_concept_information (PlantColumns): growth information of all plants of the group
+        Sets:
+            growth memory of the plants
+        """
+        if growth_concept_information.hasColumn("grow_memory_buffer"):
+            buffer = growth_concept_information.getColumn("grow_memory_buffer")
+        else:
+            buffer = np.zeros((plant_module.number_of_plants, 0))
+        self.setMemory(plant_module, buffer,
+                       position=growth_concept_information.getColumnWithDefault("grow_memory_position", 0),
+                       count=growth_concept_information.getColumnWithDefault("grow_memory_count", 0),
+                       grow_memory_sum=growth_concept_information.getColumnWithDefault("grow_memory_sum", 0.))
+
+    def getMortalityVariablesGroup(self, plant_module, growth_concept_information):
+        """
+        Store relevant plant attributes required for mortality concept for all plants of a group.
+        The growth memory in chronological order (``grow_memory``) is derived from the ring buffers when it is read,
+        e.g. by the model output.
+        Args:
+            plant_module (class): "PlantModel" object
+            growth_concept_information (PlantColumns): growth information of all plants of the group
+        Sets:
+            columns of plant store
+        """
+        self.updateMemory(plant_module)
+        if (growth_concept_information.hasColumn("grow_memory_buffer") and
+                np.shares_memory(growth_concept_information.getColumn("grow_memory_buffer"),
+                                 plant_module.grow_memory)):
+            growth_concept_information.getPresent("grow_memory_buffer")[:] = True
+        else:
+            growth_concept_information.setColumn("grow_memory_buffer", plant_module.grow_memory)
+        growth_concept_information.setColumn("grow_memory_position", plant_module.grow_memory_position)
+        growth_concept_information.setColumn("grow_memory_count", plant_module.grow_memory_count)
+        growth_concept_information.setColumn("grow_memory_sum", plant_module.grow_memory_sum)
+        growth_concept_information.setDerived("grow_memory", self.getMemoryValue, base="grow_memory_buffer")
+
+    def setMemory(self, plant_module, buffer, position, count, grow_memory_sum):
+        """
+        Set the growth memory of the plant(s), i.e., a ring buffer per plant holding the growth of the last time steps
+        within the memory period, and the running sum of the buffer.
+        If the length of the memory period in time steps changed (e.g. due to a different time step length), the
+        buffers are rebuilt keeping the most recent values.
+        Args:
+            plant_module (class): "PlantModel" object
+            buffer (array): stored ring buffers, shape(number_of_plants, length_of_buffer)
+            position (array): position of the next value in the ring buffer of each plant
+            count (array): number of values in the ring buffer of each plant
+            grow_memory_sum (array): sum of the values in the ring buffer of each plant
+        Sets:
+            multiple arrays
+        """
+        steps = self.getMemoryLength(plant_module)
+        position = np.array(position, dtype=int)
+        count = np.array(count, dtype=int)
+        grow_memory_sum = np.array(grow_memory_sum, dtype=float)
+        if buffer.shape[1] != steps:
+            new_buffer = np.zeros((len(count), steps))
+            for i in np.flatnonzero(count > 0):
+                history = self.getMemoryHistory(buffer[i], position[i], count[i])[-steps:]
+                new_buffer[i, :len(history)] = history
+                grow_memory_sum[i] = np.sum(history)
+            buffer = new_buffer
+            count = np.minimum(count, steps)
+            position = count % steps
+        plant_module.grow_memory = buffer
+        plant_module.grow_memory_position = position
+        plant_module.grow_memory_count = count
+        plant_module.grow_memory_sum = grow_memory_sum
+
+    @staticmethod
+    def getMemoryHistory(buffer, position, count):
+        """
+        Get the growth memory of a plant in chronological order, i.e., the ring buffer unrolled starting with the
+        oldest value.
+        Args:
+            buffer (array): ring buffer of the plant
+            position (int): position of the next value in the ring buffer
+            count (int): number of values in the ring buffer
+        Returns:
+            list
+        """
+        start = (position - count) % len(buffer) if len(buffer) > 0 else 0
+        return [float(buffer[(start + k) % len(buffer)]) for k in range(count)]
+
+    @classmethod
+    def getMemoryValue(cls, columns, row):
+        """
+        Get the growth memory of a plant in chronological order from the columns of the plant store,
+        see ``getMemoryHistory``.
+        Args:
+            columns (PlantColumns): growth information of all plants of the group
+            row (int): row of the plant in the store
+        Returns:
+            list
+        """
+        return cls.getMemoryHistory(columns.getValue(row, "grow_memory_buffer"),
+                                    columns.getValue(row, "grow_memory_position"),
+                                    columns.getValue(row, "grow_memory_count"))
+
+    @staticmethod
+    def updateMemory(plant_module):
+        """
+        Add the current growth of the plant(s) to the growth memory, replacing the oldest value if the memory is full,
+        and update the running sum (sum += new value - replaced value).
+        Args:
+            plant_module (class): "PlantModel" object
+        Sets:
+            multiple arrays
+        """
+        buffer = plant_module.grow_memory
+        steps = buffer.shape[1]
+        rows = np.arange(len(buffer))
+        position = plant_module.grow_memory_position
+        grow = np.asarray(plant_module.grow, dtype=float)
+        evicted = np.where(plant_module.grow_memory_count == steps, buffer[rows, position], 0.)
+        plant_module.grow_memory_sum = plant_module.grow_memory_sum + grow - evicted
+        buffer[rows, position] = grow
+        plant_module.grow_memory_position = (position + 1) % steps
+        plant_module.grow_memory_count = np.minimum(plant_module.grow_memory_count + 1, steps)
+
     def getInputParameters(self, args):
         tags = {
             "prj_file": args,
@@ -99,6 +250,6 @@ class Memory(NoGrowth):
         if not hasattr(self, "threshold"):
             self.threshold = 0.5 / 100
             print("> Set mortality parameter 'threshold' to default:", self.threshold)
-        if not hasattr(self, "threshold"):
+        if not hasattr(self, "period"):
             self.period = 1 * 365.25 * 24 * 3600
             print("> Set mortality parameter 'period' to default:", self.period)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import numpy as np
+
+
+class PlantModelRow:
+    """
+    View on the attributes of a plant model for a single plant of a group, e.g. to evaluate per-plant methods of a
+    mortality module for a group.
+    Attributes of the plant model that are arrays with one value per plant of the group (e.g. ``grow``, ``volume``)
+    are read at the row of the plant, all other attributes are read from the plant model.
+    Attributes set on the view are kept by the view, i.e., the plant model is not changed.
+    """
+    def __init__(self, plant_module, row):
+        """
+        Args:
+            plant_module (class): "PlantModel" object
+            row (int): row of the plant in the plant store
+        """
+        self.plant_module = plant_module
+        self.row = row
+
+    def __getattr__(self, name):
+        if name == "plant_module":
+            raise AttributeError(name)
+        value = getattr(self.plant_module, name)
+        if isinstance(value, np.ndarray) and value.ndim > 0 and len(value) == self.plant_module.number_of_plants:
+            return value[self.row]
+        return value
+
+
+class MortalityModel:
+    """
+    Super class of all mortality modules.
+    Mortality modules implement the per-plant methods ``setSurvive``, ``setMortalityVariables`` and
+    ``getMortalityVariables``. By default, the group methods evaluate these methods plant by plant (see
+    ``PlantModelRow``). Modules that can process whole groups (e.g. as array expressions) override the group methods.
+    """
+    def __init__(self, args):
+        """
+        Args:
+            args (lxml.etree._Element): mortality module specifications from project file tags
+        """
+
+    def setSurvive(self, plant_module):
+        """
+        Constructor for child classes.
+        Determine if plant survives. Default is 1 if plant lived.
+        Args:
+            plant_module (class): "PlantModel" object
+        Sets:
+            survival status (bool)
+        """
+        self._survive = 1
+
+    def setSurviveGroup(self, plant_module):
+        """
+        Determine for all plants of a group if they survive, by default with ``setSurvive`` plant by plant.
+        Args:
+            plant_module (class): "PlantModel" object
+        Sets:
+            survival status (array)
+        """
+        survive = []
+        for plant_module_row in self.getPlantModelRows(plant_module):
+            self.setSurvive(plant_module_row)
+            survive.append(self.getSurvive())
+        self._survive = np.array(survive, dtype=int).reshape(-1)
+
+    def getSurvive(self):
+        """
+        Get survival status of a plant.
+        Returns:
+            survival status (bool), 0 = plant died, 1 = plant lived.
+        """
+        return self._survive
+
+    def getStepsPerYear(self, plant_module):
+        """
+        Calculate the number of time steps per year.
+        Args:
+            plant_module (class): "PlantModel" object
+        Returns:
+            float
+        """
+        return (3600 * 24 * 365.25) / plant_module.time
+
+    def setMortalityVariables(self, plant_module, growth_concept_information):
+        """
+        Constructor for child classes.
+        Initiate variables that are not yet in available in the selected growth module but are required
+        in this mortality module.
+        Args:
+            plant_module (class): "PlantModel" object
+            growth_concept_information (dict): dictionary containing growth information of the respective plant
+        Returns:
+            pass
+        """
+        pass
+
+    def getMortalityVariables(self, plant_module, growth_concept_information):
+        """
+        Constructor for child classes.
+        Get relevant plant attributes required for mortality concept.
+        Args:
+            plant_module (class): "PlantModel" object
+            growth_concept_information (dict): dictionary containing growth information of the respective plant
+        Returns:
+            dictionary with updated growth concept information
+        """
+        return growth_concept_information
+
+    def setMortalityVariablesGroup(self, plant_module, growth_concept_information):
+        """
+        Initiate variables for all plants of a group, by default with ``setMortalityVariables`` plant by plant.
+        The per-plant views of the plant model are kept until ``getMortalityVariablesGroup``.
+        Args:
+            plant_module (class): "PlantModel" object
+            growth_concept_information (PlantColumns): growth information of all plants of the group
+        Sets:
+            list of PlantModelRow
+        """
+        self._plant_model_rows = [PlantModelRow(plant_module, row) for row in range(plant_module.number_of_plants)]
+        for plant, plant_module_row in zip(growth_concept_information.store.getPlants(), self._plant_model_rows):
+            self.setMortalityVariables(plant_module=plant_module_row,
+                                       growth_concept_information=plant.getGrowthConceptInformation())
+
+    def getMortalityVariablesGroup(self, plant_module, growth_concept_information):
+        """
+        Store plant attributes required for mortality concept for all plants of a group, by default with
+        ``getMortalityVariables`` plant by plant.
+        Args:
+            plant_module (class): "PlantModel" object
+            growth_concept_information (PlantColumns): growth information of all plants of the group
+        Sets:
+            columns of plant store
+        """
+        for plant, plant_module_row in zip(growth_concept_information.store.getPlants(),
+                                           self.getPlantModelRows(plant_module)):
+            plant.setGrowthConceptInformation(self.getMortalityVariables(
+                plant_module=plant_module_row, growth_concept_information=plant.getGrowthConceptInformation()))
+        self._plant_model_rows = None
+
+    def getPlantModelRows(self, plant_module):
+        """
+        Get the per-plant views of the plant model for all plants of a group. The views created by
+        ``setMortalityVariablesGroup`` are reused within a time step, i.e., attributes set by ``setMortalityVariables``
+        are available in ``setSurvive`` and ``getMortalityVariables``.
+        Args:
+            plant_module (class): "PlantModel" object
+        Returns:
+            list of PlantModelRow
+        """
+        plant_model_rows = getattr(self, "_plant_model_rows", None)
+        if (plant_model_rows is None or len(plant_model_rows) != plant_module.number_of_plants or
+                (plant_model_rows and plant_model_rows[0].plant_module is not plant_module)):
+            plant_model_rows = [PlantModelRow(plant_module, row) for row in range(plant_module.number_of_plants)]
+        return plant_model_rows
+
+    def getConceptName(self):
+        """
+        Return name of mortality module.
+        Returns:
+            string
+        """
+        return type(self).__name__
+
+    def getInputParameters(self, **tags):
+        """
+        Read module tags from project file.
+        Args:
+            tags (dict): dictionary containing tags found in the project file as well as required and optional tags of
+            the module under consideration.
+        """
+        try:
+            prj_file_tags = tags["prj_file"]
+        except KeyError:
+            prj_file_tags = []
+            print("WARNING: Module attributes are missing.")
+        try:
+            required_tags = tags["required"]
+        except KeyError:
+            required_tags = []
+        try:
+            optional_tags = tags["optional"]
+        except KeyError:
+            optional_tags = []
+
+        for arg in prj_file_tags.iterdescendants():
+            tag = arg.tag
+            for i in range(0, len(required_tags)):
+                if tag == required_tags[i]:
+                    try:
+                        super(MortalityModel, self).__setattr__(tag, float(eval(arg.text)))
+                    except (ValueError, NameError, SyntaxError):
+                        super(MortalityModel, self).__setattr__(tag, str(arg.text))
+            try:
+                required_tags.remove(tag)
+            except ValueError:
+                pass
+
+            for i in range(0, len(optional_tags)):
+                if tag == optional_tags[i]:
+                    try:
+                        super(MortalityModel, self).__setattr__(tag, float(eval(arg.text)))
+                    except (ValueError, NameError, SyntaxError):
+                        super(MortalityModel, self).__setattr__(tag, str(arg.text))
+
+        if len(required_tags) > 0:
+            string = ""
+            for tag in required_tags:
+                string += tag + " "
+            raise KeyError(
+                "Missing input parameters (in project file) for mortality module initialisation: " + string)
@@ -1,17 +1,22 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+import numpy as np
+from PlantModelLib.Mortality.MortalityModel import MortalityModel
 
 
-class NoGrowth:
+class NoGrowth(MortalityModel):
     """
     NoGrowth mortality module.
-    This serves the constructor (super class) for other mortality modules.
+    This serves the constructor (super class) for mortality modules without mortality variables, i.e., the group
+    methods for mortality variables do nothing. Modules requiring mortality variables override these group methods
+    or derive from ``MortalityModel``.
     """
     def __init__(self, args):
         """
         Args:
             args (lxml.etree._Element): mortality module specifications from project file tags
         """
+        super().__init__(args)
 
     def setSurvive(self, plant_module):
         """
@@ -26,101 +31,35 @@ class NoGrowth:
         if plant_module.grow <= 0:
             self._survive = 0
 
-    def getSurvive(self):
+    def setSurviveGroup(self, plant_module):
         """
-        Get survival status of a plant.
-        Returns:
-            survival status (bool), 0 = plant died, 1 = plant lived.
-        """
-        return self._survive
-
-    def getStepsPerYear(self, plant_module):
-        """
-        Calculate the number of time steps per year.
+        Determine for all plants of a group if they survive, i.e., plants with growth <= 0 die.
         Args:
             plant_module (class): "PlantModel" object
-        Returns:
-            float
+        Sets:
+            survival status (array)
         """
-        return (3600 * 24 * 365.25) / plant_module.time
+        self._survive = np.where(plant_module.grow <= 0, 0, 1)
 
-    def setMortalityVariables(self, plant_module, growth_concept_information):
+    def setMortalityVariablesGroup(self, plant_module, growth_concept_information):
         """
-        Constructor for child classes.
-        Initiate variables that are not yet in available in the selected growth module but are required
-        in this mortality module.
+        Initiate variables for all plants of a group. NoGrowth does not require any variables.
         Args:
             plant_module (class): "PlantModel" object
-            growth_concept_information (dict): dictionary containing growth information of the respective plant
+            growth_concept_information (PlantColumns): growth information of all plants of the group
         Returns:
             pass
         """
         pass
 
-    def getMortalityVariables(self, plant_module, growth_concept_information):
+    def getMortalityVariablesGroup(self, plant_module, growth_concept_information):
         """
-        Constructor for child classes.
-        Get relevant plant attributes required for mortality concept.
+        Store plant attributes required for mortality concept for all plants of a group. NoGrowth does not require
+        any variables.
         Args:
             plant_module (class): "PlantModel" object
-            growth_concept_information (dict): dictionary containing growth information of the respective plant
-        Returns:
-            dictionary with updated growth concept information
-        """
-        return growth_concept_information
-
-    def getConceptName(self):
-        """
-        Return name of mortality module.
+            growth_concept_information (PlantColumns): growth information of all plants of the group
         Returns:
-            string
-        """
-        return type(self).__name__
-
-    def getInputParameters(self, **tags):
-        """
-        Read module tags from project file.
-        Args:
-            tags (dict): dictionary containing tags found in the project file as well as required and optional tags of
-            the module under consideration.
+            pass
         """
-        try:
-            prj_file_tags = tags["prj_file"]
-        except KeyError:
-            prj_file_tags = []
-            print("WARNING: Module attributes are missing.")
-        try:
-            required_tags = tags["required"]
-        except KeyError:
-            required_tags = []
-        try:
-            optional_tags = tags["optional"]
-        except KeyError:
-            optional_tags = []
-
-        for arg in prj_file_tags.iterdescendants():
-            tag = arg.tag
-            for i in range(0, len(required_tags)):
-                if tag == required_tags[i]:
-                    try:
-                        super(NoGrowth, self).__setattr__(tag, float(eval(arg.text)))
-                    except (ValueError, NameError, SyntaxError):
-                        super(NoGrowth, self).__setattr__(tag, str(arg.text))
-            try:
-                required_tags.remove(tag)
-            except ValueError:
-                pass
-
-            for i in range(0, len(optional_tags)):
-                if tag == optional_tags[i]:
-                    try:
-                        super(NoGrowth, self).__setattr__(tag, float(eval(arg.text)))
-                    except (ValueError, NameError, SyntaxError):
-                        super(NoGrowth, self).__setattr__(tag, str(arg.text))
-
-        if len(required_tags) > 0:
-            string = ""
-            for tag in required_tags:
-                string += tag + " "
-            raise KeyError(
-                "Missing input parameters (in project file) for mortality module initialisation: " + string)
+        pass
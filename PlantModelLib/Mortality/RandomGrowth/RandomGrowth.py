@@ -40,6 +40,28 @@ class RandomGrowth(Random):
         if r < p_die:
             self._survive = 0
 
+    def setSurviveGroup(self, plant_module):
+        """
+        Determine for all plants of a group if they survive based on relative biomass increment per time step and
+        the calibration factor. One random number is drawn per plant.
+        Args:
+            plant_module (class): "PlantModel" object
+        Sets:
+            survival status (array)
+        """
+        # Calculate the probability to die
+        plant_module.delta_volume = plant_module.volume - plant_module.volume_before
+
+        # = dV/dt/V
+        relative_volume_increment = plant_module.delta_volume / (plant_module.time *
+                                                                 plant_module.volume)
+        with np.errstate(divide="ignore"):
+            p_die = self.k_die / relative_volume_increment
+
+        # Get random numbers
+        r = np.random.uniform(0, 1, plant_module.number_of_plants)
+        self._survive = np.where(r < p_die, 0, 1)
+
     def getSurvive(self):
         """
         Get survival status of a plant.
@@ -82,6 +104,33 @@ class RandomGrowth(Random):
             plant_module.volume
         return growth_concept_information
 
+    def setMortalityVariablesGroup(self, plant_module, growth_concept_information):
+        """
+        Initiate variables for all plants of a group, see ``setMortalityVariables``.
+        Args:
+            plant_module (class): "PlantModel" object
+            growth_concept_information (PlantColumns): growth information of all plants of the group
+        Sets:
+            array
+        """
+        volume_before = growth_concept_information.getColumnWithDefault("volume_previous_ts", 0)
+        if volume_before.dtype == object:
+            volume_before[volume_before == "NaN"] = 0
+            volume_before = volume_before.astype(float)
+        plant_module.volume_before = volume_before
+
+    def getMortalityVariablesGroup(self, plant_module, growth_concept_information):
+        """
+        Store relevant plant attributes required for mortality concept for all plants of a group.
+        Args:
+            plant_module (class): "PlantModel" object
+            growth_concept_information (PlantColumns): growth information of all plants of the group
+        Sets:
+            column of plant store
+        """
+        # The current plant volume is the volume of t-1 in the next time step
+        growth_concept_information.setColumn("volume_previous_ts", plant_module.volume)
+
     def getInputParameters(self, args):
         tags = {
             "prj_file": args,
@@ -11,6 +11,10 @@ To select multiple mortality modules, list the names of the modules separated by
 You must also add the attributes of the selected modules.
 For information about these attributes, see the pages for each module.
 
+All mortality modules derive from ``MortalityModel``. Plants of a group are evaluated with the group methods
+(``setSurviveGroup``, ``setMortalityVariablesGroup``, ``getMortalityVariablesGroup``), which by default call the
+per-plant methods plant by plant. Modules that can process whole groups override the group methods.
+
 Example:
     ```xml
         <mortality>NoGrowth Random</mortality>
@@ -4,6 +4,7 @@
 @date: 2018-Today
 @author: jasper.bathmann@ufz.de, mcwimmler
 """
+import numpy as np
 
 
 class PlantModel:
@@ -90,6 +91,48 @@ class PlantModel:
         if 0 in survive:
             self.survive = 0
 
+    def setMortalityVariablesGroup(self, growth_concept_information):
+        """
+        Call all selected mortality modules and initiate variables for all plants of a group.
+        Args:
+            growth_concept_information (PlantColumns): growth information of all plants of the group
+        """
+        for mortality_concept in self.mortality_concepts:
+            mortality_concept.setMortalityVariablesGroup(
+                plant_module=self,
+                growth_concept_information=growth_concept_information)
+
+    def getMortalityVariablesGroup(self, growth_concept_information):
+        """
+        Call all selected mortality modules and store required plant growth parameters for all plants of a group.
+        Args:
+            growth_concept_information (PlantColumns): growth information of all plants of the group
+        """
+        for mortality_concept in self.mortality_concepts:
+            mortality_concept.getMortalityVariablesGroup(
+                plant_module=self,
+                growth_concept_information=growth_concept_information)
+
+    def setTreeKillerGroup(self, plant_store):
+        """
+        Call all selected mortality modules for all plants of a group and retrieve their survival status.
+        Requires the attributes ``grow`` and ``volume`` as arrays of shape(number_of_plants).
+        A plant dies if its survival status is zero in one of the modules.
+        Args:
+            plant_store (PlantStore): columnar store of the plants of a group
+        Sets:
+            array of shape(number_of_plants)
+        """
+        self.number_of_plants = plant_store.getNumberOfPlants()
+        growth_concept_information = plant_store.growth_concept_information
+        self.setMortalityVariablesGroup(growth_concept_information)
+        survive = np.ones(self.number_of_plants, dtype=int)
+        for mortality_concept in self.mortality_concepts:
+            mortality_concept.setSurviveGroup(plant_module=self)
+            survive[mortality_concept.getSurvive() == 0] = 0
+        self.survive = survive
+        self.getMortalityVariablesGroup(growth_concept_information)
+
     def progressPlant(self, tree, aboveground_resources, belowground_resources):
         """
         Manage growth procedures for a timestep --- read tree geometry and parameters,
@@ -101,6 +144,20 @@ class PlantModel:
         """
         pass
 
+    def progressGroup(self, plant_store, aboveground_resources, belowground_resources):
+        """
+        Manage growth procedures of all plants of a group for a timestep.
+        Plant models that can process whole groups (e.g. as array expressions) override this method,
+        by default ``progressPlant`` is called for each plant.
+        Args:
+            plant_store (PlantStore): columnar store of the plants of a group,
+                see ``pyMANGA.PopulationLib.PopManager.PlantStore``
+            aboveground_resources (array): aboveground resource growth reduction factors, shape(number_of_plants)
+            belowground_resources (array): belowground resource growth reduction factors, shape(number_of_plants)
+        """
+        for i, plant in enumerate(plant_store.getPlants()):
+            self.progressPlant(plant, aboveground_resources[i], belowground_resources[i])
+
     def getInputParameters(self, **tags):
         """
         Read module tags from project file.
@@ -36,6 +36,16 @@ class Dispersal:
         """
         return self.dispersal.getPositions(number_of_plants, plants)
 
+    def setSpatialIndex(self, spatial_index):
+        """
+        Pass the spatial index of all plants of the current time step to the selected dispersal module, if the module
+        uses neighbourhood queries (i.e., implements ``setSpatialIndex``).
+        Args:
+            spatial_index (SpatialIndex): spatial index, see ``pyMANGA.PopulationLib.PopManager.SpatialIndex``
+        """
+        if hasattr(self.dispersal, "setSpatialIndex"):
+            self.dispersal.setSpatialIndex(spatial_index)
+
     def setModelDomain(self, x1, x2, y1, y2):
         """
         Adds model domain boundaries to the object.
@@ -1,17 +1,18 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-import importlib.util
-import os
-import importlib
+from PopulationLib.PopManager.PlantStore import PlantRow
 
 
 class Plant:
     """
     Module defining structure of a plant.
+    A plant is a lightweight view on a row of the columnar plant store of its group
+    (see ``pyMANGA.PopulationLib.PopManager.PlantStore``).
     """
-    def __init__(self, other, x, y,
+    def __init__(self, other, x=None, y=None,
                  initial_geometry=False,
-                 initial_network=False):
+                 initial_network=False,
+                 row=None):
         """
         Args:
             other: instance of class PlantGroup
@@ -19,49 +20,70 @@ class Plant:
             y (numeric): y-position of plant
             initial_geometry (dict): geometry of the plant
             initial_network (dict): network variables of the plant
+            row (int): row of a plant that already exists in the store of the group. If given, the plant becomes a
+                view on this row and no new plant is added to the store.
         """
-        self.x = x
-        self.y = y
-        self.plant_id = other.max_id
+        self.store = other.store
         self.species = other.species
         self.args = other.xml_args
-        self.survival = 1
         self.group_name = other.group_name
         self.plant_model = other.plant_model
+        if row is not None:
+            self.row = row
+            return
 
-        # Retrieve geometry and plant parameters from species files
-        current_path = os.path.dirname(os.path.realpath(__file__))
-        poplib_path = os.path.abspath(os.path.join(current_path, os.pardir))
-        species_file_exists = os.path.isfile(os.path.join(poplib_path, "Species", self.species, self.species + ".py"))
-        if species_file_exists:
-            module_name = 'PopulationLib.Species.' + self.species
-            module = importlib.import_module(module_name)
-            self.geometry, self.parameter = module.createPlant()
-        elif "/" in self.species:
-            try:
-                spec = importlib.util.spec_from_file_location("", self.species)
-                foo = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(foo)
-                self.geometry, self.parameter = foo.createPlant()
-            except FileNotFoundError:
-                raise FileNotFoundError("The file " + self.species +
-                                        " does not exist.")
-            except AttributeError:
-                raise AttributeError("The file " + self.species + " is not " +
-                                     "correctly defining a plant species. "
-                                     "Please review the file.")
-        else:
-            raise KeyError("Species " + self.species + " unknown!")
+        # Retrieve geometry template and shared parameter table of the species
+        geometry, parameter = other.species_registry.createPlant(self.species)
+        self.store.setParameter(parameter)
         if initial_geometry:
-            self.geometry.update(initial_geometry)
-
-        self.growth_concept_information = {}
+            geometry.update(initial_geometry)
 
         ## This initialization is only required if networks (root grafts) are
         # simulated
-        self.iniNetwork()
+        network = self.iniNetwork()
         if initial_network:
-            self.network.update(initial_network)
+            network.update(initial_network)
+
+        self.row = self.store.addPlant(plant=self, x=x, y=y,
+                                       plant_id=other.max_id,
+                                       geometry=geometry,
+                                       network=network)
+
+    @property
+    def x(self):
+        """
+        x-position of plant.
+        Returns:
+            numeric
+        """
+        return self.store.x.item(self.row)
+
+    @property
+    def y(self):
+        """
+        y-position of plant.
+        Returns:
+            numeric
+        """
+        return self.store.y.item(self.row)
+
+    @property
+    def plant_id(self):
+        """
+        ID of plant.
+        Returns:
+            int
+        """
+        return self.store.plant_id.item(self.row)
+
+    @property
+    def survival(self):
+        """
+        Survival status of plant.
+        Returns:
+            int
+        """
+        return self.store.survival.item(self.row)
 
     def getPosition(self):
         """
@@ -77,7 +99,7 @@ class Plant:
         Returns:
             dict
         """
-        return self.geometry
+        return PlantRow(self.store.geometry, self)
 
     def setGeometry(self, geometry):
         """
@@ -85,7 +107,7 @@ class Plant:
         Args:
             geometry (dict): plant geometry
         """
-        self.geometry = geometry
+        self.setRow(self.store.geometry, geometry)
 
     def getGrowthConceptInformation(self):
         """
@@ -93,7 +115,7 @@ class Plant:
         Returns:
             dict
         """
-        return self.growth_concept_information
+        return PlantRow(self.store.growth_concept_information, self)
 
     def setGrowthConceptInformation(self, growth_concept_information):
         """
@@ -101,15 +123,16 @@ class Plant:
         Args:
             growth_concept_information (dict): plant growth variables
         """
-        self.growth_concept_information = growth_concept_information
+        self.setRow(self.store.growth_concept_information, growth_concept_information)
 
     def getParameter(self):
         """
         Return dictionary with plant growth parameters.
+        The parameters are shared by all plants of a species and are read-only.
         Returns:
             dict
         """
-        return self.parameter
+        return self.store.parameter
 
     def getSurvival(self):
         """
@@ -125,7 +148,7 @@ class Plant:
         Args:
             survival (bool): plant survival
         """
-        self.survival = survival
+        self.store.survival[self.row] = survival
 
     def getId(self):
         """
@@ -135,33 +158,37 @@ class Plant:
         """
         return self.plant_id
 
-    def iniNetwork(self):
+    @staticmethod
+    def iniNetwork():
         """
         Initialize network dictionary.
+        Returns:
+            dict
         """
-        self.network = {}
+        network = {}
         ## Counter to track or define the time required for root graft
         # formation, if -1 no root graft formation takes place at the moment
-        self.network['rgf'] = -1
+        network['rgf'] = -1
         ## List with the names of plants (plant_name) with which an root graft
         # is currently being formed
-        self.network['potential_partner'] = []
+        network['potential_partner'] = []
         # List with the names of plants (plant_name) with which it is connected
-        self.network['partner'] = []
-        self.network['groupID'] = []
-        self.network['node_degree'] = 0
-        self.network['water_absorbed'] = []
-        self.network['water_available'] = []
-        self.network['water_exchanged'] = []
+        network['partner'] = []
+        network['groupID'] = []
+        network['node_degree'] = 0
+        network['water_absorbed'] = []
+        network['water_available'] = []
+        network['water_exchanged'] = []
         ## List with lengths of grafted roots (proportional to r_root of
         # adjacent plants
-        self.network['weight_gr'] = 0
-        self.network['psi_osmo'] = []
+        network['weight_gr'] = 0
+        network['psi_osmo'] = []
         # List with minimum grafted root radius, only for rgf variant V2
-        self.network['r_gr_min'] = []
-        self.network['r_gr_rgf'] = []
-        self.network['l_gr_rgf'] = []
-        self.network['variant'] = None
+        network['r_gr_min'] = []
+        network['r_gr_rgf'] = []
+        network['l_gr_rgf'] = []
+        network['variant'] = None
+        return network
 
     def getNetwork(self):
         """
@@ -169,7 +196,7 @@ class Plant:
         Returns:
             dict
         """
-        return self.network
+        return PlantRow(self.store.network, self)
 
     def setNetwork(self, network):
         """
@@ -177,4 +204,20 @@ class Plant:
         Args:
             network (dict): dictionary with network (root graft) variables
         """
-        self.network = network
+        self.setRow(self.store.network, network)
+
+    def setRow(self, columns, variables):
+        """
+        Replace all variables of the plant in a collection of columns.
+        Args:
+            columns (PlantColumns): columns of the plant store, e.g. geometry
+            variables (dict): new variables of the plant
+        """
+        if isinstance(variables, PlantRow) and variables.columns is columns and variables.plant is self:
+            return
+        variables = dict(variables)
+        for key in columns.getRowKeys(self.row):
+            if key not in variables:
+                columns.deleteValue(self.row, key)
+        for key, value in variables.items():
+            columns.setValue(self.row, key, value)
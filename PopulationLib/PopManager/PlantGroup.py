@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+import copy
 import numpy as np
 from PopulationLib.InitialPop import InitialPop
 from PopulationLib.Production import Production
@@ -8,6 +9,8 @@ from PopulationLib.Dispersal_v310 import Dispersal_v310
 from PopulationLib.Recruitment import Recruitment
 from ProjectLib import helpers as helpers
 from PopulationLib.PopManager.Plant import Plant
+from PopulationLib.PopManager.PlantStore import PlantStore, PlantColumns
+from PopulationLib.PopManager.SpeciesRegistry import SpeciesRegistry
 
 
 class PlantGroup:
@@ -17,16 +20,21 @@ class PlantGroup:
     Backward compatibility is maintained by retaining deprecated objects and methods, indicated by '_v310_'.
     """
 
-    def __init__(self, xml_args):
+    def __init__(self, xml_args, species_registry=None):
         """
         Args:
             xml_args (lxml.etree._Element): group module specifications from project file tags
+            species_registry (SpeciesRegistry): registry of loaded species, shared by all groups of a population
         """
         self.xml_args = xml_args  # ToDo: unify name for tag variable
+        if species_registry is None:
+            species_registry = SpeciesRegistry()
+        self.species_registry = species_registry
         self.max_id = 0
-        self.plants = []
+        self.store = PlantStore()
         self.positions, self.geometry, self.network = {}, {}, {}
         self.number_of_seeds = None
+        self.spatial_index = None
 
         self.iniPlantDynamicConcept()
 
@@ -132,7 +140,7 @@ class PlantGroup:
         """
         Set the number of new seeds or seedlings produced.
         """
-        self.number_of_seeds = self.production.getNumberSeeds(plants=self.plants)
+        self.number_of_seeds = self.production.getNumberSeeds(plants=self.getPlants())
 
     def recruitPlants(self):
         """
@@ -146,7 +154,7 @@ class PlantGroup:
             self.setNumberOfSeeds()
             if self.number_of_seeds:
                 positions = self.dispersal.getPositions(number_of_plants=self.number_of_seeds,
-                                                        plants=self.plants)
+                                                        plants=self.getPlants())
                 # Check if produced plants establish
                 if self.recruitment is not None:
                     positions = self.recruitment.updatePositions(positions)
@@ -157,11 +165,75 @@ class PlantGroup:
 
     def planting(self, positions, geometry, network):
         """
-        Add new plants to the model, by calling Plant object.
+        Add new plants to the model.
+        All plants are appended to the plant store of the group in one block. IDs are allocated consecutively,
+        starting from the current maximum ID of the group.
+        Args:
+            positions (dict): plant positions, i.e., arrays of x- and y-positions
+            geometry (dict or array): plant geometries, i.e., one array per variable. If not a dictionary,
+                plants are initialized with the geometry of the species.
+            network (dict or array): plant network characteristics, i.e., one array per variable
+        """
+        n_plants = len(positions["x"])
+        if n_plants == 0:
+            return
+        # Geometry and network given per plant (e.g. list of dictionaries) are added plant by plant
+        if not self.isColumnInput(geometry) or not self.isColumnInput(network):
+            self.plantingPerPlant(positions, geometry, network)
+            return
+
+        template, parameter = self.species_registry.createPlant(self.species)
+        self.store.setParameter(parameter)
+        plant_id = self.max_id + np.arange(1, n_plants + 1)
+        self.max_id += n_plants
+        self.store.addPlants(x=positions["x"], y=positions["y"], plant_id=plant_id,
+                             geometry=self.getInitialColumns(template, geometry, n_plants),
+                             network=self.getInitialColumns(Plant.iniNetwork(), network, n_plants),
+                             create_plant=lambda row: Plant(other=self, row=row))
+
+    @staticmethod
+    def isColumnInput(variables):
+        """
+        Check whether plant variables are given as one array per variable or are not given at all.
+        Args:
+            variables (dict or array): plant variables
+        Returns:
+            bool
+        """
+        if isinstance(variables, dict):
+            return True
+        return not any(variables)
+
+    @staticmethod
+    def getInitialColumns(template, initial, n_plants):
+        """
+        Combine the variables of the species (or network) template with given initial values.
+        Given values replace template values.
+        Args:
+            template (dict): default variables of a plant
+            initial (dict or array): initial variables, one array per variable
+            n_plants (int): number of plants
+        Returns:
+            dict
+        """
+        if not isinstance(initial, dict):
+            initial = {}
+        columns = {}
+        for key, value in template.items():
+            if key not in initial:
+                columns[key] = PlantColumns.fullColumn(value, n_plants)
+        for key, values in initial.items():
+            columns[key] = values[:n_plants]
+        # Keep the order of variables of the template
+        return {key: columns[key] for key in list(template.keys()) + list(initial.keys()) if key in columns}
+
+    def plantingPerPlant(self, positions, geometry, network):
+        """
+        Add new plants to the model one by one, by calling Plant object.
         Args:
             positions (dict): plant positions
-            geometry (dict): plant geometries
-            network (dict): plant network characteristics
+            geometry (dict or list): plant geometries
+            network (dict or list): plant network characteristics
         """
         for i in range(0, len(positions["x"])):
             # If geometry and network are defined, use these values
@@ -179,19 +251,49 @@ class PlantGroup:
             else:
                 plant_network = network[i]
             self.max_id += 1
-            self.plants.append(Plant(other=self,
-                                     x=positions["x"][i],
-                                     y=positions["y"][i],
-                                     initial_geometry=plant_geometry,
-                                     initial_network=plant_network))
+            Plant(other=self,
+                  x=positions["x"][i],
+                  y=positions["y"][i],
+                  initial_geometry=plant_geometry,
+                  initial_network=plant_network)
 
     def getPlants(self):
         """
         Return list with plants.
+        Plants are views on the columnar plant store of the group (see ``getPlantStore``).
         Returns:
             list
         """
-        return self.plants
+        return self.store.getPlants()
+
+    def getPlantStore(self):
+        """
+        Return the columnar store holding all plants of the group.
+        Returns:
+            PlantStore
+        """
+        return self.store
+
+    def setSpatialIndex(self, spatial_index):
+        """
+        Set the spatial index of all plants of the current time step and pass it on to the dispersal and recruitment
+        module.
+        Args:
+            spatial_index (SpatialIndex): spatial index, see ``pyMANGA.PopulationLib.PopManager.SpatialIndex``
+        """
+        self.spatial_index = spatial_index
+        if not self.use_v310:
+            self.dispersal.setSpatialIndex(spatial_index)
+            if self.recruitment is not None:
+                self.recruitment.setSpatialIndex(spatial_index)
+
+    def getSpatialIndex(self):
+        """
+        Return the spatial index of all plants of the current time step, see ``setSpatialIndex``.
+        Returns:
+            SpatialIndex or None
+        """
+        return self.spatial_index
 
     def getGroupName(self):
         """
@@ -207,7 +309,7 @@ class PlantGroup:
         Returns:
             numeric
         """
-        return len(self.plants)
+        return self.store.getNumberOfPlants()
 
     def removePlantsAtIndices(self, indices):
         """
@@ -215,8 +317,31 @@ class PlantGroup:
         Args:
             indices (int): indice(s) of dead plant(s)
         """
-        for i in sorted(indices)[::-1]:
-            self.plants.pop(i)
+        self.store.removePlants(indices)
+
+    def removeDeadPlants(self):
+        """
+        Remove all plants with survival status 0 from group.
+        The plant store is compacted in a single pass, the order of the remaining plants is kept.
+        Returns:
+            int (number of removed plants)
+        """
+        alive = self.store.survival != 0
+        n_dead = len(alive) - int(np.count_nonzero(alive))
+        if n_dead > 0:
+            self.store.keepPlants(alive)
+        return n_dead
+
+    def getSnapshot(self):
+        """
+        Return a copy of the group that is not affected by later changes of the group, e.g. to write model output.
+        Only the plant store is copied, all other attributes (e.g. modules) are shared with the group.
+        Returns:
+            PlantGroup
+        """
+        snapshot = copy.copy(self)
+        snapshot.store = self.store.copy()
+        return snapshot
 
     def getNRecruits(self):
         """
@@ -237,22 +362,4 @@ class PlantGroup:
             initial_group (bool): indicate whether this is model initialization (true) or a later time step (false)
         """
         positions, geometry, network = self.dispersal_v310.getPlantAttributes(initial_group=initial_group)
-        for i in range(0, len(positions["x"])):
-            if isinstance(geometry, dict):
-                plant_geometry = {}
-                for key, value in geometry.items():
-                    plant_geometry[key] = value[i]
-            else:
-                plant_geometry = geometry[i]
-            if isinstance(network, dict):
-                plant_network = {}
-                for key, value in network.items():
-                    plant_network[key] = value[i]
-            else:
-                plant_network = network[i]
-            self.max_id += 1
-            self.plants.append(Plant(other=self,
-                                     x=positions["x"][i],
-                                     y=positions["y"][i],
-                                     initial_geometry=plant_geometry,
-                                     initial_network=plant_network))
+        self.planting(positions, geometry, network)
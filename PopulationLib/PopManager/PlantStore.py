@@ -0,0 +1,685 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from collections.abc import MutableMapping
+import copy
+import numpy as np
+
+
+class PlantColumns:
+    """
+    Collection of per-plant variables (e.g. geometry) stored as one contiguous array per key.
+    Numeric variables are kept in float or integer arrays, all other variables (lists, strings, ...) in object
+    arrays. Numeric vectors (e.g. buffers of fixed length) are kept in two-dimensional arrays with one row per plant,
+    shorter vectors are padded with zeros. A mask per key indicates whether a variable is defined for a plant.
+    Derived variables are calculated from other variables when they are read (see ``setDerived``).
+    """
+    def __init__(self, store):
+        """
+        Args:
+            store (PlantStore): store the columns belong to
+        """
+        self.store = store
+        self.values = {}
+        self.present = {}
+        self.derived = {}
+
+    def keys(self):
+        """
+        Return names of all variables stored in the columns.
+        Returns:
+            list
+        """
+        return list(self.values.keys())
+
+    def hasColumn(self, key):
+        """
+        Check whether a variable exists for at least one plant.
+        Args:
+            key (string): name of variable
+        Returns:
+            bool
+        """
+        return key in self.values or key in self.derived
+
+    def getColumn(self, key):
+        """
+        Return the values of a variable for all plants of the store.
+        The returned array is a view, i.e. it becomes invalid if plants are added or removed.
+        Args:
+            key (string): name of variable
+        Returns:
+            numpy array of shape(number_of_plants)
+        """
+        return self.values[key][:self.store.n_plants]
+
+    def getColumnWithDefault(self, key, default):
+        """
+        Return the values of a variable for all plants of the store.
+        For plants for which the variable is not defined, the default value is returned.
+        Args:
+            key (string): name of variable
+            default (numeric): value for plants without the variable
+        Returns:
+            numpy array of shape(number_of_plants)
+        """
+        if key not in self.values:
+            return np.full(self.store.n_plants, default)
+        present = self.getPresent(key)
+        values = self.getColumn(key)
+        if values.ndim > 1:
+            present = present[:, np.newaxis]
+        return np.where(present, values, default)
+
+    def setDerived(self, key, function, base):
+        """
+        Define a variable that is calculated from other variables of a plant when it is read, e.g. for the model
+        output. A derived variable is defined for a plant if the variable base is defined.
+        Derived variables are read-only, i.e., setting or deleting them has no effect.
+        Args:
+            key (string): name of variable
+            function (function): function of the columns and the row of a plant returning the value
+            base (string): name of the variable the derived variable is defined with
+        """
+        self.derived[key] = (function, base)
+
+    def getPresent(self, key):
+        """
+        Return mask indicating for which plants a variable is defined.
+        Args:
+            key (string): name of variable
+        Returns:
+            numpy array with bools of shape(number_of_plants)
+        """
+        if key not in self.present:
+            return np.zeros(self.store.n_plants, dtype=bool)
+        return self.present[key][:self.store.n_plants]
+
+    def setColumn(self, key, values):
+        """
+        Set a variable for all plants of the store.
+        Args:
+            key (string): name of variable
+            values (array): values of shape(number_of_plants) or shape(number_of_plants, length_of_vector)
+        """
+        n = self.store.n_plants
+        values = np.asarray(values)
+        if (key not in self.values or not self._fitsColumn(self.values[key], values.dtype) or
+                self.values[key].shape[1:] != values.shape[1:]):
+            self._newColumn(key, dtype=self._getColumnType(values.dtype), shape=values.shape[1:])
+        self.values[key][:n] = values
+        self.present[key][:n] = True
+
+    def setValues(self, start, key, values):
+        """
+        Set a variable for a block of consecutive plants.
+        If required, the column is created or its type is widened (integer -> float -> object).
+        Args:
+            start (int): row of the first plant of the block
+            key (string): name of variable
+            values (array): values of shape(number_of_plants_in_block)
+        """
+        values = np.asarray(values)
+        value_type = self._getColumnType(values.dtype)
+        if key not in self.values:
+            self._newColumn(key, dtype=value_type)
+        elif not self._fitsColumn(self.values[key], value_type):
+            self.values[key] = self.values[key].astype(self._widen(self.values[key].dtype, value_type))
+        stop = start + len(values)
+        self.values[key][start:stop] = values
+        self.present[key][start:stop] = True
+
+    def getValue(self, row, key):
+        """
+        Return the value of a variable of a single plant.
+        Args:
+            row (int): row of the plant in the store
+            key (string): name of variable
+        Returns:
+            numeric or object, raise KeyError if the variable is not defined for the plant
+        """
+        if key in self.derived:
+            function, base = self.derived[key]
+            self.getValue(row, base)
+            return function(self, row)
+        try:
+            if not self.present[key][row]:
+                raise KeyError(key)
+        except IndexError:
+            raise KeyError(key)
+        values = self.values[key]
+        if values.dtype == object or values.ndim > 1:
+            return values[row]
+        return values.item(row)
+
+    def setValue(self, row, key, value):
+        """
+        Set the value of a variable of a single plant.
+        If required, the column is created or its type is widened (integer -> float -> object).
+        Args:
+            row (int): row of the plant in the store
+            key (string): name of variable
+            value (numeric or object): new value
+        """
+        if key in self.derived:
+            return
+        if self._isVector(value):
+            self.setVector(row, key, value)
+            return
+        value_type = self._getValueType(value)
+        if key not in self.values:
+            self._newColumn(key, dtype=value_type)
+        elif self.values[key].ndim > 1:
+            self.values[key] = self._toObjectColumn(self.values[key])
+        elif not self._fitsColumn(self.values[key], value_type):
+            self.values[key] = self.values[key].astype(self._widen(self.values[key].dtype, value_type))
+        self.values[key][row] = value
+        self.present[key][row] = True
+
+    def setVector(self, row, key, vector):
+        """
+        Set a numeric vector of a single plant.
+        The column is widened if the vector is longer than the vectors of other plants,
+        shorter vectors are padded with zeros.
+        Args:
+            row (int): row of the plant in the store
+            key (string): name of variable
+            vector (array): numeric vector
+        """
+        value_type = self._getColumnType(vector.dtype)
+        length = len(vector)
+        if key not in self.values:
+            self._newColumn(key, dtype=value_type, shape=(length,))
+        elif self.values[key].ndim == 1:
+            # Existing scalar or object values cannot be combined with vectors
+            self._newColumn(key, dtype=value_type, shape=(length,))
+        else:
+            column = self.values[key]
+            dtype = column.dtype
+            if not self._fitsColumn(column, value_type):
+                dtype = self._widen(column.dtype, value_type)
+            width = max(column.shape[1], length)
+            if dtype != column.dtype or width != column.shape[1]:
+                new_column = np.zeros((len(column), width), dtype=dtype)
+                new_column[:, :column.shape[1]] = column
+                self.values[key] = new_column
+        self.values[key][row, :length] = vector
+        self.values[key][row, length:] = 0
+        self.present[key][row] = True
+
+    def deleteValue(self, row, key):
+        """
+        Mark a variable of a single plant as undefined.
+        Args:
+            row (int): row of the plant in the store
+            key (string): name of variable
+        """
+        if key in self.derived:
+            return
+        if not self.present[key][row]:
+            raise KeyError(key)
+        self.present[key][row] = False
+        if self.values[key].dtype == object:
+            self.values[key][row] = None
+        elif self.values[key].ndim > 1:
+            self.values[key][row] = 0
+
+    def getRowKeys(self, row):
+        """
+        Return names of all variables defined for a single plant.
+        Args:
+            row (int): row of the plant in the store
+        Returns:
+            list
+        """
+        keys = [key for key, present in self.present.items() if present[row]]
+        return keys + [key for key, (_, base) in self.derived.items() if base in keys]
+
+    def resize(self, capacity):
+        """
+        Change the number of rows that can be stored without reallocation.
+        Args:
+            capacity (int): new number of rows
+        """
+        for key in self.values.keys():
+            self.values[key] = self._resizeArray(self.values[key], capacity)
+            self.present[key] = self._resizeArray(self.present[key], capacity)
+
+    def compact(self, keep, n_keep):
+        """
+        Move the rows of plants to be kept to the front of all columns, preserving their order.
+        Args:
+            keep (array): mask indicating which of the current rows are kept
+            n_keep (int): number of rows kept
+        """
+        n = self.store.n_plants
+        for key in self.values.keys():
+            values, present = self.values[key], self.present[key]
+            values[:n_keep] = values[:n][keep]
+            present[:n_keep] = present[:n][keep]
+            present[n_keep:n] = False
+            if values.dtype == object:
+                values[n_keep:n] = None
+
+    def copy(self, store):
+        """
+        Return a copy of the columns.
+        Args:
+            store (PlantStore): store the copy belongs to
+        Returns:
+            PlantColumns
+        """
+        columns = PlantColumns(store)
+        for key in self.values.keys():
+            columns.values[key] = self.values[key][:store.n_plants].copy()
+            columns.present[key] = self.present[key][:store.n_plants].copy()
+        columns.derived = dict(self.derived)
+        return columns
+
+    def _newColumn(self, key, dtype, shape=()):
+        """
+        Create an empty column.
+        Args:
+            key (string): name of variable
+            dtype (numpy dtype): type of the column
+            shape (tuple): shape of the value of a single plant, empty for scalars
+        """
+        capacity = self.store.capacity
+        if dtype == object:
+            self.values[key] = np.full((capacity,) + tuple(shape), None, dtype=object)
+        else:
+            self.values[key] = np.zeros((capacity,) + tuple(shape), dtype=dtype)
+        self.present[key] = np.zeros(capacity, dtype=bool)
+
+    def _resizeArray(self, array, capacity):
+        """
+        Return a copy of an array with a different length, new elements are empty.
+        Args:
+            array (array): array to resize
+            capacity (int): new length
+        Returns:
+            array
+        """
+        shape = (capacity,) + array.shape[1:]
+        if array.dtype == object:
+            new_array = np.full(shape, None, dtype=object)
+        else:
+            new_array = np.zeros(shape, dtype=array.dtype)
+        n = min(capacity, len(array))
+        new_array[:n] = array[:n]
+        return new_array
+
+    @classmethod
+    def fullColumn(cls, value, n_rows):
+        """
+        Return an array in which each row holds a value.
+        Mutable values (e.g. lists) are copied for each row.
+        Args:
+            value (numeric or object): value
+            n_rows (int): number of rows
+        Returns:
+            numpy array of shape(n_rows)
+        """
+        value_type = cls._getValueType(value)
+        if value_type != object or value is None or isinstance(value, (bool, str)):
+            return np.full(n_rows, value, dtype=value_type)
+        if isinstance(value, (list, dict, set)):
+            copies = (value.copy() for _ in range(n_rows))
+        else:
+            copies = (copy.copy(value) for _ in range(n_rows))
+        return np.fromiter(copies, dtype=object, count=n_rows)
+
+    @staticmethod
+    def _isVector(value):
+        """
+        Check whether a value is a numeric vector that is stored in a two-dimensional column.
+        Args:
+            value (numeric or object): value
+        Returns:
+            bool
+        """
+        return isinstance(value, np.ndarray) and value.ndim == 1 and value.dtype.kind in "iuf"
+
+    @staticmethod
+    def _toObjectColumn(column):
+        """
+        Convert a two-dimensional column into an object column holding one vector per plant.
+        Args:
+            column (array): two-dimensional column
+        Returns:
+            array
+        """
+        new_column = np.empty(len(column), dtype=object)
+        for row in range(len(column)):
+            new_column[row] = column[row].copy()
+        return new_column
+
+    @staticmethod
+    def _getValueType(value):
+        """
+        Return the column type required to store a value.
+        Bools are stored as objects to keep their string representation in the model output.
+        Args:
+            value (numeric or object): value
+        Returns:
+            numpy dtype
+        """
+        if isinstance(value, (bool, np.bool_)):
+            return np.dtype(object)
+        if isinstance(value, (int, np.integer)):
+            return np.dtype(np.int64)
+        if isinstance(value, (float, np.floating)):
+            return np.dtype(np.float64)
+        return np.dtype(object)
+
+    @staticmethod
+    def _getColumnType(dtype):
+        """
+        Return the column type required to store an array.
+        Args:
+            dtype (numpy dtype): type of the array
+        Returns:
+            numpy dtype
+        """
+        if dtype.kind in "iu":
+            return np.dtype(np.int64)
+        if dtype.kind == "f":
+            return np.dtype(np.float64)
+        return np.dtype(object)
+
+    @staticmethod
+    def _fitsColumn(column, dtype):
+        """
+        Check whether values of a type can be stored in a column without loss.
+        Args:
+            column (array): existing column
+            dtype (numpy dtype): type of new values
+        Returns:
+            bool
+        """
+        if column.dtype == object:
+            return True
+        if column.dtype.kind == "f":
+            return dtype.kind in "iuf"
+        return dtype.kind in "iu"
+
+    @staticmethod
+    def _widen(dtype_a, dtype_b):
+        """
+        Return the column type that can hold values of both types.
+        Args:
+            dtype_a (numpy dtype): type of existing column
+            dtype_b (numpy dtype): type of new values
+        Returns:
+            numpy dtype
+        """
+        if object in (dtype_a, dtype_b):
+            return np.dtype(object)
+        return np.dtype(np.float64)
+
+
+class PlantRow(MutableMapping):
+    """
+    Dictionary-like view on the variables of a single plant in a collection of columns.
+    Reading and writing items reads and writes the underlying arrays.
+    """
+    def __init__(self, columns, plant):
+        """
+        Args:
+            columns (PlantColumns): columns of the plant store
+            plant (Plant): plant the view refers to
+        """
+        self.columns = columns
+        self.plant = plant
+
+    def __getitem__(self, key):
+        return self.columns.getValue(self.plant.row, key)
+
+    def __setitem__(self, key, value):
+        self.columns.setValue(self.plant.row, key, value)
+
+    def __delitem__(self, key):
+        self.columns.deleteValue(self.plant.row, key)
+
+    def __iter__(self):
+        return iter(self.columns.getRowKeys(self.plant.row))
+
+    def __len__(self):
+        return len(self.columns.getRowKeys(self.plant.row))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def copy(self):
+        """
+        Return a copy of the plant variables as dictionary.
+        Returns:
+            dict
+        """
+        return dict(self)
+
+
+class PlantStore:
+    """
+    Columnar (structure-of-arrays) storage of all plants of a group.
+    Positions, IDs and survival status as well as geometry, growth and network variables are stored in contiguous
+    arrays with one row per plant. Plants (see ``pyMANGA.PopulationLib.PopManager.Plant``) are lightweight views on a
+    row of the store.
+    """
+    def __init__(self):
+        self.n_plants = 0
+        self.capacity = 0
+        self._x = np.zeros(0)
+        self._y = np.zeros(0)
+        self._plant_id = np.zeros(0, dtype=np.int64)
+        self._survival = np.zeros(0, dtype=np.int64)
+        self.geometry = PlantColumns(self)
+        self.growth_concept_information = PlantColumns(self)
+        self.network = PlantColumns(self)
+        self.parameter = None
+        self.plants = []
+
+    @property
+    def x(self):
+        """
+        x-positions of all plants.
+        Returns:
+            numpy array of shape(number_of_plants)
+        """
+        return self._x[:self.n_plants]
+
+    @property
+    def y(self):
+        """
+        y-positions of all plants.
+        Returns:
+            numpy array of shape(number_of_plants)
+        """
+        return self._y[:self.n_plants]
+
+    @property
+    def plant_id(self):
+        """
+        IDs of all plants.
+        Returns:
+            numpy array of shape(number_of_plants)
+        """
+        return self._plant_id[:self.n_plants]
+
+    @property
+    def survival(self):
+        """
+        Survival status of all plants.
+        Returns:
+            numpy array of shape(number_of_plants)
+        """
+        return self._survival[:self.n_plants]
+
+    def setParameter(self, parameter):
+        """
+        Set the parameter table shared by all plants of the store.
+        Args:
+            parameter (ParameterTable): species parameters
+        """
+        self.parameter = parameter
+
+    def getParameter(self):
+        """
+        Return the parameter table shared by all plants of the store.
+        Returns:
+            ParameterTable
+        """
+        return self.parameter
+
+    def getColumnGroups(self):
+        """
+        Return all variable collections of the store.
+        Returns:
+            list
+        """
+        return [self.geometry, self.growth_concept_information, self.network]
+
+    def reserve(self, n_plants):
+        """
+        Make sure that a number of plants fits into the store without reallocation.
+        Capacity grows geometrically to keep appending plants amortized O(1).
+        Args:
+            n_plants (int): number of plants that need to fit in the store
+        """
+        if n_plants <= self.capacity:
+            return
+        capacity = max(n_plants, 2 * self.capacity, 16)
+        for name in ["_x", "_y", "_plant_id", "_survival"]:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.n_plants] = old[:self.n_plants]
+            setattr(self, name, new)
+        self.capacity = capacity
+        for columns in self.getColumnGroups():
+            columns.resize(capacity)
+
+    def addPlant(self, plant, x, y, plant_id, geometry, network):
+        """
+        Append a plant to the store.
+        Args:
+            plant (Plant): view that will refer to the new row
+            x (float): x-position of plant
+            y (float): y-position of plant
+            plant_id (int): ID of plant
+            geometry (dict): geometry of the plant
+            network (dict): network variables of the plant
+        Returns:
+            int (row of the new plant)
+        """
+        self.reserve(self.n_plants + 1)
+        row = self.n_plants
+        self._x[row] = x
+        self._y[row] = y
+        self._plant_id[row] = plant_id
+        self._survival[row] = 1
+        self.n_plants += 1
+        for key, value in geometry.items():
+            self.geometry.setValue(row, key, value)
+        for key, value in network.items():
+            self.network.setValue(row, key, value)
+        self.plants.append(plant)
+        return row
+
+    def addPlants(self, x, y, plant_id, geometry, network, create_plant):
+        """
+        Append a block of plants to the store.
+        Args:
+            x (array): x-positions of plants
+            y (array): y-positions of plants
+            plant_id (array): IDs of plants
+            geometry (dict): geometry of the plants, one array of shape(number_of_new_plants) per variable
+            network (dict): network variables of the plants, one array of shape(number_of_new_plants) per variable
+            create_plant (function): returns the view referring to a given row
+        Returns:
+            range (rows of the new plants)
+        """
+        n_new = len(x)
+        self.reserve(self.n_plants + n_new)
+        start, stop = self.n_plants, self.n_plants + n_new
+        self._x[start:stop] = x
+        self._y[start:stop] = y
+        self._plant_id[start:stop] = plant_id
+        self._survival[start:stop] = 1
+        self.n_plants = stop
+        for key, values in geometry.items():
+            self.geometry.setValues(start, key, values)
+        for key, values in network.items():
+            self.network.setValues(start, key, values)
+        rows = range(start, stop)
+        self.plants.extend([create_plant(row) for row in rows])
+        return rows
+
+    def removePlants(self, indices):
+        """
+        Remove plants from the store.
+        Args:
+            indices (array): rows of the plants to be removed
+        """
+        keep = np.ones(self.n_plants, dtype=bool)
+        keep[np.asarray(indices, dtype=int)] = False
+        self.keepPlants(keep)
+
+    def keepPlants(self, keep):
+        """
+        Remove all plants that are not marked to be kept.
+        The store is compacted in a single pass, i.e., remaining plants are moved to the front of all arrays while
+        keeping their order (and thus the order of their IDs).
+        Args:
+            keep (array): mask of shape(number_of_plants) indicating which plants are kept
+        """
+        keep = np.asarray(keep, dtype=bool)
+        n_keep = int(np.count_nonzero(keep))
+        if n_keep == self.n_plants:
+            return
+        for name in ["_x", "_y", "_plant_id", "_survival"]:
+            array = getattr(self, name)
+            array[:n_keep] = array[:self.n_plants][keep]
+        for columns in self.getColumnGroups():
+            columns.compact(keep, n_keep)
+        self.plants = [plant for plant, kept in zip(self.plants, keep.tolist()) if kept]
+        self.n_plants = n_keep
+        for row, plant in enumerate(self.plants):
+            plant.row = row
+
+    def copy(self):
+        """
+        Return a copy of the store.
+        Arrays are copied, while objects stored in object columns (e.g. lists) and the parameter table are shared.
+        The plant views of the copy refer to the copy.
+        Returns:
+            PlantStore
+        """
+        store = PlantStore()
+        store.n_plants = self.n_plants
+        store.capacity = self.n_plants
+        for name in ["_x", "_y", "_plant_id", "_survival"]:
+            setattr(store, name, getattr(self, name)[:self.n_plants].copy())
+        store.geometry = self.geometry.copy(store)
+        store.growth_concept_information = self.growth_concept_information.copy(store)
+        store.network = self.network.copy(store)
+        store.parameter = self.parameter
+        for plant in self.plants:
+            view = copy.copy(plant)
+            view.store = store
+            store.plants.append(view)
+        return store
+
+    def getPlants(self):
+        """
+        Return list with plant views, ordered by row.
+        Returns:
+            list
+        """
+        return self.plants
+
+    def getNumberOfPlants(self):
+        """
+        Return number of plants in the store.
+        Returns:
+            int
+        """
+        return self.n_plants
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 from PopulationLib.PopManager.PlantGroup import PlantGroup
+from PopulationLib.PopManager.SpeciesRegistry import SpeciesRegistry
 
 
 class Population:
@@ -14,6 +15,8 @@ class Population:
         """
         self.plant_groups = {}
         self.plants = []
+        # Species files are loaded once per run and shared by all groups
+        self.species_registry = SpeciesRegistry()
         for arg in args.iter("group"):
             self.addPlantGroup(arg)
 
@@ -23,7 +26,7 @@ class Population:
         Args:
             args: plant group module specifications from project file tags
         """
-        plant_group = PlantGroup(xml_args=args)
+        plant_group = PlantGroup(xml_args=args, species_registry=self.species_registry)
         self.plant_groups[plant_group.group_name] = plant_group
 
     def getPlantGroups(self):
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class SpatialIndex:
+    """
+    Spatial index (k-d tree) of plant positions for neighbourhood queries.
+    The index is created once per time step by the time stepper. Plants are indexed in the order of the plant groups
+    and of the plants within each group, i.e., in the order plants are added to the resource modules.
+    The k-d tree is built with the first query.
+    """
+    def __init__(self, x, y):
+        """
+        Args:
+            x (array): x-positions of plants
+            y (array): y-positions of plants
+        """
+        self.x = np.array(x, dtype=float)
+        self.y = np.array(y, dtype=float)
+        self._tree = None
+
+    @classmethod
+    def fromPlantStores(cls, plant_stores):
+        """
+        Create spatial index from the plant stores of all groups.
+        Args:
+            plant_stores (list): plant stores, see ``pyMANGA.PopulationLib.PopManager.PlantStore``
+        Returns:
+            SpatialIndex
+        """
+        x = [plant_store.x for plant_store in plant_stores]
+        y = [plant_store.y for plant_store in plant_stores]
+        return cls(np.concatenate(x) if x else [], np.concatenate(y) if y else [])
+
+    def getNumberOfPlants(self):
+        return len(self.x)
+
+    def hasPositions(self, x, y):
+        """
+        Check whether the index contains the given plant positions (in the same order).
+        Args:
+            x (array): x-positions of plants
+            y (array): y-positions of plants
+        Returns:
+            bool
+        """
+        return (len(x) == len(self.x) and len(y) == len(self.y) and
+                np.array_equal(self.x, x) and np.array_equal(self.y, y))
+
+    def getTree(self):
+        """
+        Get the k-d tree of plant positions, build it if required.
+        Returns:
+            scipy.spatial.cKDTree
+        """
+        if self._tree is None:
+            self._tree = cKDTree(np.column_stack((self.x, self.y)))
+        return self._tree
+
+    def getPlantsWithin(self, x, y, radius):
+        """
+        Get all plants within a radius around a position.
+        Args:
+            x (float): x-position
+            y (float): y-position
+            radius (float): radius
+        Returns:
+            numpy array with sorted plant indices
+        """
+        if self.getNumberOfPlants() == 0:
+            return np.empty(0, dtype=int)
+        return np.sort(np.array(self.getTree().query_ball_point((x, y), radius), dtype=int))
+
+    def getPairsWithin(self, radius):
+        """
+        Get all pairs of plants with a distance <= radius.
+        Args:
+            radius (float): radius
+        Returns:
+            numpy array of shape(number_of_pairs, 2), with first index < second index, sorted lexicographically
+        """
+        if self.getNumberOfPlants() < 2:
+            return np.empty((0, 2), dtype=int)
+        pairs = self.getTree().query_pairs(radius, output_type="ndarray")
+        pairs = np.sort(pairs.reshape(-1, 2), axis=1)
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    def getOverlappingPairs(self, radius):
+        """
+        Get all pairs of plants (i, j) with distance < radius_i + radius_j, e.g. plants with overlapping root plates.
+        Args:
+            radius (array): radius of each plant
+        Returns:
+            numpy array of shape(number_of_pairs, 2), with first index < second index, sorted lexicographically
+        """
+        radius = np.asarray(radius, dtype=float)
+        if self.getNumberOfPlants() < 2:
+            return np.empty((0, 2), dtype=int)
+        # Candidates of plant i are all plants within radius_i + max(radius), the margin accounts for rounding errors
+        candidates = self.getTree().query_ball_point(np.column_stack((self.x, self.y)),
+                                                     (radius + np.max(radius)) * (1 + 1e-9))
+        i = np.repeat(np.arange(len(candidates)), [len(c) for c in candidates])
+        j = np.concatenate([np.asarray(c, dtype=int) for c in candidates])
+        pairs = np.column_stack((i, j))[i < j]
+        pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+        i, j = pairs[:, 0], pairs[:, 1]
+        distance = ((self.x[j] - self.x[i])**2 + (self.y[j] - self.y[i])**2)**0.5
+        return pairs[distance < radius[j] + radius[i]]
+
+
+class NeighbourList:
+    """
+    Persistent list of pairs of neighbouring plants (Verlet list).
+    The list contains all pairs of plants (i, j) with distance < radius_i + radius_j + 2 * skin at the time it is
+    built. As plants do not move, it is only rebuilt if plants were added or removed or if the radius of a plant grew
+    by more than the skin since the last build.
+    """
+    def __init__(self, skin):
+        """
+        Args:
+            skin (float): skin distance (m)
+        """
+        self.skin = skin
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.radius = np.empty(0)
+        self.pairs = np.empty((0, 2), dtype=int)
+        self.n_builds = 0
+
+    def requiresBuild(self, x, y, radius):
+        """
+        Check whether the list has to be rebuilt, i.e., whether plants were added or removed or whether the radius of
+        a plant grew by more than the skin.
+        Args:
+            x (array): x-positions of plants
+            y (array): y-positions of plants
+            radius (array): radius of each plant
+        Returns:
+            bool
+        """
+        if not (len(x) == len(self.x) and np.array_equal(self.x, x) and np.array_equal(self.y, y)):
+            return True
+        return bool(np.any(np.asarray(radius) - self.radius > self.skin))
+
+    def build(self, x, y, radius, spatial_index=None):
+        """
+        Build the list of neighbouring plants.
+        Args:
+            x (array): x-positions of plants
+            y (array): y-positions of plants
+            radius (array): radius of each plant
+            spatial_index (SpatialIndex): (optional) spatial index of the plant positions
+        """
+        self.x = np.array(x, dtype=float)
+        self.y = np.array(y, dtype=float)
+        self.radius = np.array(radius, dtype=float)
+        if spatial_index is None:
+            spatial_index = SpatialIndex(self.x, self.y)
+        self.pairs = spatial_index.getOverlappingPairs((self.radius + self.skin) * (1 + 1e-9))
+        self.n_builds += 1
+
+    def getOverlappingPairs(self, x, y, radius, spatial_index=None):
+        """
+        Get all pairs of plants (i, j) with distance < radius_i + radius_j, see ``SpatialIndex.getOverlappingPairs``.
+        The list is rebuilt if required.
+        Args:
+            x (array): x-positions of plants
+            y (array): y-positions of plants
+            radius (array): radius of each plant
+            spatial_index (SpatialIndex): (optional) spatial index of the plant positions, used to rebuild the list
+        Returns:
+            numpy array of shape(number_of_pairs, 2), with first index < second index, sorted lexicographically
+        """
+        if self.requiresBuild(x, y, radius):
+            self.build(x, y, radius, spatial_index=spatial_index)
+        radius = np.asarray(radius, dtype=float)
+        i, j = self.pairs[:, 0], self.pairs[:, 1]
+        distance = ((self.x[j] - self.x[i])**2 + (self.y[j] - self.y[i])**2)**0.5
+        return self.pairs[distance < radius[j] + radius[i]]
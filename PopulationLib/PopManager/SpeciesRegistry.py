@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from collections.abc import Mapping
+import importlib.util
+import os
+import importlib
+
+
+class ParameterTable(Mapping):
+    """
+    Read-only table of species parameters.
+    One table is shared by all plants of a species. Copies of the table return the table itself.
+    """
+    def __init__(self, parameter):
+        """
+        Args:
+            parameter (dict): species parameters
+        """
+        self._parameter = dict(parameter)
+
+    def __getitem__(self, key):
+        return self._parameter[key]
+
+    def __iter__(self):
+        return iter(self._parameter)
+
+    def __len__(self):
+        return len(self._parameter)
+
+    def __repr__(self):
+        return repr(self._parameter)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class SpeciesRegistry:
+    """
+    Registry of the plant species used in a model run.
+    Each species file is loaded only once. New plants receive a copy of the geometry template of their species and
+    a reference to the shared parameter table of their species.
+    """
+    def __init__(self):
+        self.species = {}
+
+    def createPlant(self, species):
+        """
+        Return geometry and parameters of a new plant of a species.
+        Args:
+            species (string): name of an implemented species or path to a species file
+        Returns:
+            dict, ParameterTable
+        """
+        geometry, parameter = self.getSpecies(species)
+        return dict(geometry), parameter
+
+    def getSpecies(self, species):
+        """
+        Return geometry template and parameter table of a species.
+        The species file is loaded when the species is requested for the first time.
+        Args:
+            species (string): name of an implemented species or path to a species file
+        Returns:
+            dict, ParameterTable
+        """
+        try:
+            return self.species[species]
+        except KeyError:
+            geometry, parameter = self.loadSpecies(species)
+            self.species[species] = (geometry, ParameterTable(parameter))
+            return self.species[species]
+
+    def loadSpecies(self, species):
+        """
+        Load a species file, i.e., call its ``createPlant`` function.
+        Args:
+            species (string): name of an implemented species or path to a species file
+        Returns:
+            dict, dict
+        """
+        current_path = os.path.dirname(os.path.realpath(__file__))
+        poplib_path = os.path.abspath(os.path.join(current_path, os.pardir))
+        species_file_exists = os.path.isfile(os.path.join(poplib_path, "Species", species, species + ".py"))
+        if species_file_exists:
+            module_name = 'PopulationLib.Species.' + species
+            module = importlib.import_module(module_name)
+            return module.createPlant()
+        elif "/" in species:
+            try:
+                spec = importlib.util.spec_from_file_location("", species)
+                foo = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(foo)
+                return foo.createPlant()
+            except FileNotFoundError:
+                raise FileNotFoundError("The file " + species +
+                                        " does not exist.")
+            except AttributeError:
+                raise AttributeError("The file " + species + " is not " +
+                                     "correctly defining a plant species. "
+                                     "Please review the file.")
+        else:
+            raise KeyError("Species " + species + " unknown!")
@@ -6,3 +6,6 @@
 from . import Population
 from . import PlantGroup
 from . import Plant
+from . import PlantStore
+from . import SpeciesRegistry
+from . import SpatialIndex
@@ -36,6 +36,16 @@ class Recruitment:
         """
         return self.recruitment.updatePositions(positions)
 
+    def setSpatialIndex(self, spatial_index):
+        """
+        Pass the spatial index of all plants of the current time step to the selected recruitment module, if the module
+        uses neighbourhood queries (i.e., implements ``setSpatialIndex``).
+        Args:
+            spatial_index (SpatialIndex): spatial index, see ``pyMANGA.PopulationLib.PopManager.SpatialIndex``
+        """
+        if hasattr(self.recruitment, "setSpatialIndex"):
+            self.recruitment.setSpatialIndex(spatial_index)
+
     def setModelDomain(self, x1, x2, y1, y2):
         """
         Adds model domain boundaries to the object.
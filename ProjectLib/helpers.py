@@ -50,6 +50,25 @@ def getInputParameters(myself, **tags):
             "Missing input parameters (in project file) for resource module initialisation: " + string)
 
 
+def makeBoolFromArg(myself, var_name):
+    """
+    Transform input variable in boolean, excepting various options to indicate True.
+    Args:
+        var_name (string): name of variable
+    Returns:
+        bool
+    """
+    if hasattr(myself, var_name):
+        var = str(getattr(myself, var_name))
+        if var.lower() in ['true', '1', '1.0', 't', 'y', 'yes']:
+            var = True
+        else:
+            var = False
+    else:
+        var = False
+    return var
+
+
 def setModelDomain(self, x1, x2, y1, y2):
     """
     Adds model domain boundaries to the object.
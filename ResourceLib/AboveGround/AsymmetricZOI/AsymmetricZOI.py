@@ -23,43 +23,113 @@ class AsymmetricZOI(ResourceModel):
         Sets:
             numpy array of shape(number_of_trees)
         """
-        #Array to save value of highest plant with shape = (res_x, res_y)
-        canopy_height = np.zeros_like(self.my_grid[0])
-        #Array to safe index of highest plant with shape = (res_x, res_y)
-        highest_plant = np.full_like(self.my_grid[0], fill_value=-99999)
+        if self.backend == "analytic":
+            self.calculateAbovegroundResourcesAnalytic()
+            return
+        n_plants = len(self.xe)
+        min_distances = self.getMinimumDistances()
+        #Plants without overlapping crowns are the highest plant on all nodes of their crown, i.e., the factor is 1,
+        #if the crown is higher than the empty canopy. Small crowns extend to the closest node
+        #(see calculateHeightFromDistance)
+        r_ag, h_stem = np.array(self.r_ag, dtype=float), np.array(self.h_stem, dtype=float)
+        r_ag = np.maximum(r_ag, min_distances)
+        min_heights = h_stem + (3**0.5 if self.curved_crown else 2) * r_ag
+        isolated = super().getIsolatedPlants(self.xe, self.ye, r_ag) & (min_heights > 0)
+        plants = np.flatnonzero(~isolated)
+        #Grid windows covering the crowns, as a plant has no height outside its crown. The window contains the node
+        #closest to the plant, i.e., the node defining the minimum distance used for small crowns
+        #(see calculateHeightFromDistance)
+        windows = [self.getStencilWindow(self.xe[i], self.ye[i], self.r_ag[i]) for i in plants]
+        #Split grid into bands if the arrays of grid size (16 bytes per node) exceed the memory limit, or into tiles
+        #if the grid is tiled. Blocks are processed on the thread pool, if enabled (see ResourceModel.makeThreadPool)
+        blocks = super().getGridBlocks(bytes_per_cell=16, windows=windows)
+        results = super().mapParallel(
+            lambda block: self.calculateBlockWins(block[0], plants[block[1]], windows=[windows[k] for k in block[1]],
+                                                  min_distances=min_distances),
+            blocks)
         #Array to safe number of wins per plant with shape = (n_plants)
-        wins = np.zeros_like(self.xe)
+        wins = np.zeros(n_plants, dtype=int)
         #Array to safe number of grid_points per plant with shape = (n_plants)
-        crown_areas = np.zeros_like(self.xe)
+        crown_areas = np.zeros(n_plants)
+        for block_wins, block_crown_areas in results:
+            wins += block_wins
+            crown_areas += block_crown_areas
+        self.aboveground_resources = np.ones(n_plants)
+        self.aboveground_resources[plants] = wins[plants] / crown_areas[plants]
+
+    def calculateBlockWins(self, block, block_plants, windows, min_distances):
+        """
+        Identify the highest plant at each node of a block of the grid (see ``ResourceModel.getGridBlocks``).
+        Args:
+            block (tuple): grid window of the block
+            block_plants (array): indices of the plants intersecting the block, in ascending order
+            windows (list): grid window of each plant in block_plants
+            min_distances (array): distance between each plant and its closest node, see ``getMinimumDistances``
+        Returns:
+            numpy array with shape(n_plants) (number of nodes won by each plant),
+            numpy array with shape(n_plants) (number of nodes within the crown of each plant)
+        """
+        n_plants = len(self.xe)
+        crown_areas = np.zeros(n_plants)
+        #Array to save value of highest plant with shape = (block_res_x, block_res_y)
+        canopy_height = np.zeros((block[0].stop - block[0].start, block[1].stop - block[1].start))
+        #Array to safe index of highest plant with shape = (block_res_x, block_res_y)
+        highest_plant = np.full(np.shape(canopy_height), fill_value=-99999, dtype=int)
         #Iteration over plants to identify highest plant at gridpoint
-        for i in range(len(self.xe)):
-            distance = (((self.my_grid[0] - np.array(self.xe)[i])**2 +
-                         (self.my_grid[1] - np.array(self.ye)[i])**2)**0.5)
+        for i, plant_window in zip(block_plants, windows):
+            rows = slice(max(plant_window[0].start, block[0].start), min(plant_window[0].stop, block[0].stop))
+            columns = slice(max(plant_window[1].start, block[1].start), min(plant_window[1].stop, block[1].stop))
+            if rows.start >= rows.stop or columns.start >= columns.stop:
+                continue
+            window = (rows, columns)
+            distance = super().getStencilDistance(self.xe[i], self.ye[i], self.r_ag[i], window)
             # As the geometry is "complex", my_height is position dependent
             my_height, canopy_bools = self.calculateHeightFromDistance(
                 np.array([self.h_stem[i]]), np.array([self.r_ag[i]]),
-                distance)
-            crown_areas[i] = np.sum(canopy_bools)
-            indices = np.where(np.less(canopy_height, my_height))
-            canopy_height[indices] = my_height[indices]
-            highest_plant[indices] = i
-        #Check for each plant, at which gridpoint it is the highest plant
-        for i in range(len(self.xe)):
-            wins[i] = len(np.where(highest_plant == i)[0])
-        self.aboveground_resources = wins / crown_areas
-
-    def calculateHeightFromDistance(self, stem_height, crown_radius, distance):
+                distance, min_distance=min_distances[i])
+            crown_areas[i] += np.sum(canopy_bools)
+            block_window = (slice(rows.start - block[0].start, rows.stop - block[0].start),
+                            slice(columns.start - block[1].start, columns.stop - block[1].start))
+            canopy_height_window = canopy_height[block_window]
+            highest_plant_window = highest_plant[block_window]
+            indices = np.where(np.less(canopy_height_window, my_height))
+            canopy_height_window[indices] = my_height[indices]
+            highest_plant_window[indices] = i
+        #Count for each plant the number of gridpoints where it is the highest plant
+        return super().countCells(highest_plant, n_plants), crown_areas
+
+    def calculateAbovegroundResourcesAnalytic(self):
+        """
+        Calculate a growth reduction factor for each plant like ``calculateAbovegroundResources``, but from the
+        exact area of the crown, in which the plant is the highest plant, instead of counting grid nodes (see
+        ``pyMANGA.ResourceLib.AnalyticZOI``). Only flat crowns are supported. Plants without crown are not limited.
+        Sets:
+            numpy array of shape(number_of_trees)
+        """
+        r_ag = np.array(self.r_ag, dtype=float)
+        height = np.array(self.h_stem, dtype=float) + 2 * r_ag
+        zoi = super().getAnalyticZOI(self.xe, self.ye, r_ag)
+        self.aboveground_resources = np.divide(zoi.getAsymmetricAreas(height), np.pi * r_ag**2,
+                                               out=np.ones(len(r_ag)), where=r_ag > 0)
+
+    def usesRandomState(self):
+        return False
+
+    def calculateHeightFromDistance(self, stem_height, crown_radius, distance, min_distance=None):
         """
         Calculate plant heights at each mesh point (node) based on the distance between plant and node.
         Args:
             stem_height (array): stem heights (shape: n_plants)
             crown_radius (array): crown radii (shape: n_plants)
             distance (array): distance between node and stem positions (shape: x_res, y_res)
+            min_distance (float): (optional) distance between stem position and closest node of the grid.
+                Default: minimum of distance
 
         Returns:
             array, array (shape: x_res, y_res)
         """
-        min_distance = np.min(distance)
+        if min_distance is None:
+            min_distance = np.min(distance)
         # If crown radius < mesh size, set it to mesh size
         crown_radius[np.where(crown_radius < min_distance)] = min_distance
 
@@ -74,11 +144,29 @@ class AsymmetricZOI(ResourceModel):
             height[idx] = stem_height + 2 * crown_radius
         return height, bools
 
+    def getMinimumDistances(self):
+        """
+        Calculate the distance between each plant and its closest node of the grid.
+        Returns:
+            numpy array with shape(n_plants)
+        """
+        xe, ye = np.array(self.xe), np.array(self.ye)
+        closest_x = self.getClosestNodes(self.grid_x, xe)
+        closest_y = self.getClosestNodes(self.grid_y, ye)
+        min_distances = ((closest_x - xe)**2 + (closest_y - ye)**2)**0.5
+        # Use the distances of the stencil cache, if enabled
+        if self.distance_stencils is not None:
+            for i in range(len(xe)):
+                if self.distance_stencils.covers(xe[i], ye[i], self.r_ag[i]):
+                    min_distances[i] = self.distance_stencils.getMinimumDistance(xe[i], ye[i])
+        return min_distances
+
     def getInputParameters(self, args):
         tags = {
             "prj_file": args,
             "required": ["type", "domain", "x_1", "x_2", "y_1", "y_2", "x_resolution", "y_resolution"],
-            "optional": ["allow_interpolation", "curved_crown"]
+            "optional": ["allow_interpolation", "curved_crown", "memory_limit", "tile_size", "backend",
+                         "stencil_cache", "stencil_resolution", "stencil_cache_size", "n_threads"]
         }
         super().getInputParameters(**tags)
         self._x_1 = self.x_1
@@ -96,6 +184,12 @@ class AsymmetricZOI(ResourceModel):
         else:
             self.curved_crown = super().makeBoolFromArg("curved_crown")
 
+        self.backend = super().makeBackend(["grid", "analytic"])
+        if self.backend == "analytic" and self.curved_crown:
+            print("ERROR: the analytic backend of AsymmetricZOI requires flat crowns.")
+            print("Please set 'curved_crown' to False or use the grid backend.")
+            exit()
+
     def prepareNextTimeStep(self, t_ini, t_end):
         self.xe = []
         self.ye = []
@@ -114,7 +208,7 @@ class AsymmetricZOI(ResourceModel):
         except KeyError:
             r_ag = geometry["r_ag"]
             h_stem = geometry["height"] - 2*r_ag
-        if r_ag < (self.mesh_size * 1 / 2**0.5):
+        if self.backend == "grid" and r_ag < (self.mesh_size * 1 / 2**0.5):
             if not hasattr(self, "allow_interpolation") or not self.allow_interpolation:
                 print("Error: mesh not fine enough for crown dimensions!")
                 print(
@@ -126,3 +220,23 @@ class AsymmetricZOI(ResourceModel):
         self.ye.append(y)
         self.h_stem.append(h_stem)
         self.r_ag.append(r_ag)
+
+    def addPlants(self, plant_store):
+        geometry = plant_store.geometry
+        # ToDo: resolve when all geometries are renamed
+        if not (geometry.getPresent("r_crown").all() and geometry.getPresent("h_stem").all()):
+            super().addPlants(plant_store)
+            return
+        r_ag = geometry.getColumn("r_crown")
+        if self.backend == "grid" and np.any(r_ag < (self.mesh_size * 1 / 2**0.5)):
+            if not hasattr(self, "allow_interpolation") or not self.allow_interpolation:
+                print("Error: mesh not fine enough for crown dimensions!")
+                print(
+                    "Please refine mesh or increase initial crown radius above " +
+                    str(self.mesh_size) + "m !")
+                exit()
+
+        self.xe.extend(plant_store.x.tolist())
+        self.ye.extend(plant_store.y.tolist())
+        self.h_stem.extend(geometry.getColumn("h_stem").tolist())
+        self.r_ag.extend(r_ag.tolist())
@@ -22,6 +22,9 @@ class Default(ResourceModel):
         """
         self.aboveground_resources = self.plants
 
+    def usesRandomState(self):
+        return False
+
     def prepareNextTimeStep(self, t_ini, t_end):
         self.plants = []
         self.t_ini = t_ini
@@ -29,3 +32,6 @@ class Default(ResourceModel):
 
     def addPlant(self, plant):
         self.plants.append(1)
+
+    def addPlants(self, plant_store):
+        self.plants.extend([1] * plant_store.getNumberOfPlants())
@@ -164,3 +164,6 @@ class SolarRadiation(ResourceModel):
     def addPlant(self, plant):
         # Count the number of plants in the system
         self.no_plants += 1
+
+    def addPlants(self, plant_store):
+        self.no_plants += plant_store.getNumberOfPlants()
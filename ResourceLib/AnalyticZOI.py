@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import numpy as np
+
+
+class AnalyticZOI:
+    """
+    Grid-free calculation of zone of influence (ZOI) areas from circle geometry.
+    Areas are integrated along the boundaries of the circles (Green's theorem), which are split into arcs at the
+    intersection points with overlapping circles. Only pairs of overlapping circles are considered, see
+    ``pyMANGA.PopulationLib.PopManager.SpatialIndex.getOverlappingPairs``.
+    Circles with identical position and radius are ordered by their index, i.e., the circle with the higher index
+    is treated as infinitesimally larger.
+    """
+    def __init__(self, x, y, radius, pairs):
+        """
+        Args:
+            x (array): x-positions of circle centers
+            y (array): y-positions of circle centers
+            radius (array): radius of each circle
+            pairs (array): pairs of overlapping circles with shape(number_of_pairs, 2)
+        """
+        self.x = np.array(x, dtype=float)
+        self.y = np.array(y, dtype=float)
+        self.radius = np.array(radius, dtype=float)
+        self.neighbours = [[] for _ in range(len(self.x))]
+        for i, j in np.asarray(pairs, dtype=int).reshape(-1, 2):
+            self.neighbours[i].append(j)
+            self.neighbours[j].append(i)
+        self.neighbours = [np.sort(np.array(neighbours, dtype=int)) for neighbours in self.neighbours]
+
+    def getArcs(self, circle, circles, origin):
+        """
+        Split the boundary of a circle into arcs at the intersection points with other circles and check which
+        circles cover each arc.
+        Args:
+            circle (int): index of the circle
+            circles (array): indices of the other circles
+            origin (int): index of the circle used as origin of the coordinate system (to reduce rounding errors)
+        Returns:
+            numpy array with shape(number_of_arcs) (area integral of each arc, see ``getArcIntegral``),
+            numpy array of bools with shape(number_of_arcs, number_of_circles)
+        """
+        cx, cy = self.x[circle] - self.x[origin], self.y[circle] - self.y[origin]
+        r = self.radius[circle]
+        x, y = self.x[circles] - self.x[origin], self.y[circles] - self.y[origin]
+        radius = self.radius[circles]
+        dx, dy = x - cx, y - cy
+        distance = (dx**2 + dy**2)**0.5
+        contains = (distance <= radius - r) & ((radius > r) | (circles > circle))
+        intersects = (distance < radius + r) & (distance > np.abs(radius - r))
+        theta = np.arctan2(dy[intersects], dx[intersects])
+        alpha = np.arccos(np.clip((distance[intersects]**2 + r**2 - radius[intersects]**2) /
+                                  (2 * distance[intersects] * r), -1, 1))
+        breaks = np.sort(np.mod(np.concatenate((theta - alpha, theta + alpha)), 2 * np.pi))
+        if len(breaks) == 0:
+            breaks = np.zeros(1)
+        start = breaks
+        stop = np.append(breaks[1:], breaks[0] + 2 * np.pi)
+        middle = (start + stop) / 2
+        px = cx + r * np.cos(middle)
+        py = cy + r * np.sin(middle)
+        inside = (px[:, np.newaxis] - x)**2 + (py[:, np.newaxis] - y)**2 < radius**2
+        covered = np.where(intersects, inside, contains)
+        return self.getArcIntegral(cx, cy, r, start, stop), covered
+
+    @staticmethod
+    def getArcIntegral(cx, cy, r, start, stop):
+        """
+        Calculate the area integral 1/2 * (x dy - y dx) along counterclockwise arcs of a circle.
+        Args:
+            cx (float): x-position of circle center
+            cy (float): y-position of circle center
+            r (float): radius
+            start (array): start angles of arcs
+            stop (array): stop angles of arcs
+        Returns:
+            numpy array with shape of start
+        """
+        return 0.5 * (r**2 * (stop - start) + r * cx * (np.sin(stop) - np.sin(start)) -
+                      r * cy * (np.cos(stop) - np.cos(start)))
+
+    def getSymmetricAreas(self):
+        """
+        Calculate the area of each circle shared evenly with overlapping circles, i.e., the integral of
+        1 / (number of circles covering a point) over the circle.
+        Returns:
+            numpy array with shape(number_of_circles)
+        """
+        areas = np.pi * self.radius**2
+        for i, neighbours in enumerate(self.neighbours):
+            if len(neighbours) == 0:
+                continue
+            # Arcs of circle i covered by m other circles bound the regions covered by 1...m other circles
+            integral, covered = self.getArcs(i, neighbours, origin=i)
+            n_covering = np.sum(covered, axis=1)
+            loss = np.sum(integral * (1 - 1 / (n_covering + 1)))
+            # Arcs of neighbour j within circle i bound the region covered by (c + 1) other circles, with c circles
+            # (other than i and j) covering the arc
+            members = np.concatenate(([i], neighbours))
+            for j in neighbours:
+                integral, covered = self.getArcs(j, members[members != j], origin=i)
+                within = covered[:, 0]
+                n_covering = np.sum(covered[:, 1:], axis=1)
+                loss += np.sum(integral[within] / ((n_covering[within] + 1) * (n_covering[within] + 2)))
+            areas[i] -= loss
+        return areas
+
+    def getAsymmetricAreas(self, height):
+        """
+        Calculate the area of each circle, in which it is the highest circle (with constant height within the
+        circle). For circles of equal height, the circle with the lower index is the highest.
+        Args:
+            height (array): height of each circle
+        Returns:
+            numpy array with shape(number_of_circles)
+        """
+        height = np.asarray(height, dtype=float)
+        areas = np.pi * self.radius**2
+        for i, neighbours in enumerate(self.neighbours):
+            higher = neighbours[(height[neighbours] > height[i]) |
+                                ((height[neighbours] == height[i]) & (neighbours < i))]
+            if len(higher) == 0:
+                continue
+            # Area of circle i not covered by any higher circle: arcs of circle i outside all higher circles minus
+            # arcs of higher circles within circle i and outside all other higher circles
+            integral, covered = self.getArcs(i, higher, origin=i)
+            area = np.sum(integral[~np.any(covered, axis=1)])
+            members = np.concatenate(([i], higher))
+            for j in higher:
+                integral, covered = self.getArcs(j, members[members != j], origin=i)
+                free = covered[:, 0] & ~np.any(covered[:, 1:], axis=1)
+                area -= np.sum(integral[free])
+            areas[i] = area
+        return areas
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import numpy as np
 from ResourceLib import ResourceModel
 from ProjectLib.Project import MangaProject
@@ -37,6 +39,13 @@ class Merge(ResourceModel):
                                                     prj_args=args)
             self.bg_concepts.append(my_instance)
 
+        # Modules are calculated concurrently, if enabled
+        super().getInputParameters(prj_file=args, optional=["concurrent"])
+        self.concurrent = super().makeBoolFromArg("concurrent")
+        self.thread_pool = None
+        if self.concurrent and len(self.bg_concepts) > 1:
+            self.thread_pool = ThreadPoolExecutor(max_workers=len(self.bg_concepts))
+
     def prepareNextTimeStep(self, t_ini, t_end):
         for bg_concept in self.bg_concepts:
             bg_concept.prepareNextTimeStep(t_ini, t_end)
@@ -45,18 +54,46 @@ class Merge(ResourceModel):
         for bg_concept in self.bg_concepts:
             bg_concept.addPlant(plant)
 
+    def addPlants(self, plant_store):
+        for bg_concept in self.bg_concepts:
+            bg_concept.addPlants(plant_store)
+
+    def setSpatialIndex(self, spatial_index):
+        for bg_concept in self.bg_concepts:
+            bg_concept.setSpatialIndex(spatial_index)
+
     def calculateBelowgroundResources(self):
         """
         Calculate a growth reduction factor for each tree based on specified modules and multiplies the factor of
-        all modules with each other.
+        all modules with each other. Modules are calculated concurrently, if enabled by the optional tag
+        ``concurrent`` (see ``pyMANGA.ResourceLib.ResourceModel.calculateConcurrently``).
         Sets:
             numpy array of shape(number_of_trees)
         """
-        bg = []
-        for bg_concept in self.bg_concepts:
-            bg_concept.calculateBelowgroundResources()
-            bg.append(bg_concept.getBelowgroundResources())
+        bg = super().calculateConcurrently(self.bg_concepts,
+                                           [partial(self.calculateModule, bg_concept) for bg_concept in self.bg_concepts],
+                                           self.thread_pool)
         bg = np.array(bg).transpose()
         bg = list(map(np.prod, bg))
 
         self.belowground_resources = bg
+
+    @staticmethod
+    def calculateModule(bg_concept):
+        """
+        Calculate the growth reduction factor of a module.
+        Args:
+            bg_concept (class): below-ground resource module
+        Returns:
+            numpy array of shape(number_of_trees)
+        """
+        bg_concept.calculateBelowgroundResources()
+        return bg_concept.getBelowgroundResources()
+
+    def shutdownThreadPool(self):
+        for bg_concept in self.bg_concepts:
+            bg_concept.shutdownThreadPool()
+        super().shutdownThreadPool()
+
+    def usesRandomState(self):
+        return any(bg_concept.usesRandomState() for bg_concept in self.bg_concepts)
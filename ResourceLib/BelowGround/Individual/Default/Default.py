@@ -22,6 +22,9 @@ class Default(ResourceModel):
     def addPlant(self, plant):
         self.plants.append(1)
 
+    def addPlants(self, plant_store):
+        self.plants.extend([1] * plant_store.getNumberOfPlants())
+
     def calculateBelowgroundResources(self):
         """
         Calculate a growth reduction factor for each plant.
@@ -31,6 +34,9 @@ class Default(ResourceModel):
         """
         self.belowground_resources = self.plants
 
+    def usesRandomState(self):
+        return False
+
     def getOGSAccessible(self):
         """
         Check whether module is optimized for external use.
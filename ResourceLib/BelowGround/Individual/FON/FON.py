@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 import numpy as np
+from scipy import fft
 from ResourceLib import ResourceModel
 
 
@@ -20,6 +21,10 @@ class FON(ResourceModel):
             print("Error: mesh not fine enough for FON!")
             print("Please refine mesh to grid size < 0.25m !")
             exit()
+        if self.backend == "fft" and self.tile_size is not None:
+            print("ERROR: the fft backend of FON requires a dense grid.")
+            print("Please remove 'tile_size' or use the grid backend.")
+            exit()
 
     def prepareNextTimeStep(self, t_ini, t_end):
         self._fon_area = []
@@ -30,7 +35,6 @@ class FON(ResourceModel):
         self._r_stem = []
         self._t_ini = t_ini
         self._t_end = t_end
-        self._fon_height = np.zeros_like(self.my_grid[0])
 
     def addPlant(self, plant):
         x, y = plant.getPosition()
@@ -43,6 +47,17 @@ class FON(ResourceModel):
         self.bb = parameter["bb"]
         self.fmin = parameter["fmin"]
 
+    def addPlants(self, plant_store):
+        if plant_store.getNumberOfPlants() == 0:
+            return
+        parameter = plant_store.getParameter()
+        self._xe.extend(plant_store.x.tolist())
+        self._ye.extend(plant_store.y.tolist())
+        self._r_stem.extend(plant_store.geometry.getColumn("r_stem").tolist())
+        self.aa = parameter["aa"]
+        self.bb = parameter["bb"]
+        self.fmin = parameter["fmin"]
+
     def calculateBelowgroundResources(self):
         """
         Calculate a growth reduction factor for each plant based on competition with neighboring plants.
@@ -50,44 +65,327 @@ class FON(ResourceModel):
             numpy array with shape(number_of_plants)
         """
         self._r_stem = np.array(self._r_stem)
-        distance = (((self.my_grid[0][:, :, np.newaxis] -
-                      np.array(self._xe)[np.newaxis, np.newaxis, :])**2 +
-                     (self.my_grid[1][:, :, np.newaxis] -
-                      np.array(self._ye)[np.newaxis, np.newaxis, :])**2)**0.5)
-        my_fon = self.calculateFonFromDistance(distance=distance)
-
-        fon_areas = np.zeros_like(my_fon)
-        # Add a one, where plant is larger than 0
-        fon_areas[np.where(my_fon > 0)] += 1
+        n_plants = len(self._r_stem)
+        # fon radius, eq. (1) Berger et al. 2002
+        # FON heights beyond the fon radius are below fmin, i.e., only the grid window covering the fon radius is
+        # considered. If the fon radius is not larger than the stem radius, the FON covers the whole grid.
+        fon_radius = self.aa * self._r_stem**self.bb
+        fon_radius = np.where(fon_radius > self._r_stem, fon_radius, np.inf)
+        if self.backend == "fft":
+            self.calculateBelowgroundResourcesFFT(fon_radius)
+            return
+
+        # Plants without overlapping FON have no FON impact, i.e., the factor is 1
+        isolated = super().getIsolatedPlants(self._xe, self._ye, fon_radius)
+        plants = np.flatnonzero(~isolated)
+        windows = {i: self.getStencilWindow(self._xe[i], self._ye[i], fon_radius[i]) for i in plants}
+        self._fon_radius = fon_radius
+        if self.thread_pool is not None:
+            self.calculateBelowgroundResourcesParallel(windows)
+            return
+        fon_heigths = super().makeGridArray()
         # Count all nodes, which are occupied by plants
         # returns array of shape (nplants)
-        fon_areas = fon_areas.sum(axis=(0, 1))
-        fon_heigths = my_fon.sum(axis=-1)
+        fon_areas = np.zeros(n_plants)
+        # Split plants into chunks if the FON of all plants (8 bytes per node) exceeds the memory limit
+        chunks = super().getPlantChunks(window_sizes=super().getWindowSizes(list(windows.values())),
+                                        bytes_per_cell=8, grid_bytes=fon_heigths.nbytes)
+        chunks = [plants[chunk] for chunk in chunks]
+        for chunk in chunks:
+            my_fon = [self.getFon(i, windows[i]) for i in chunk]
+            for i, height in zip(chunk, my_fon):
+                fon_heigths[windows[i]] += height
+                fon_areas[i] = np.sum(height > 0)
+
+        fon_impacts = np.zeros(n_plants)
+        # Start with the last chunk, as its FON is still available
+        for chunk in reversed(chunks):
+            if chunk is not chunks[-1]:
+                my_fon = [self.getFon(i, windows[i]) for i in chunk]
+            for i, height in zip(chunk, my_fon):
+                fon_impact = fon_heigths[windows[i]] - height
+                fon_impact[np.where(height < self.fmin)] = 0
+                fon_impacts[i] = fon_impact.sum()
+
+        self.belowground_resources = np.ones(n_plants)
+        self.belowground_resources[plants] = self.getResourceLimitations(fon_impacts[plants], fon_areas[plants])
+
+    def calculateBelowgroundResourcesParallel(self, windows):
+        """
+        Calculate a growth reduction factor for each plant like ``calculateBelowgroundResources`` on the thread pool
+        (see ``ResourceModel.makeThreadPool``). FON heights are summed up per block of the grid and FON impacts per
+        group of plants, i.e., the FON of each plant is evaluated again instead of being stored, and ``memory_limit``
+        only applies to the blocks. Results are identical to the serial calculation.
+        Args:
+            windows (dict): grid window of each plant, which is not isolated
+        Sets:
+            numpy array with shape(number_of_plants)
+        """
+        n_plants = len(self._r_stem)
+        plants = np.array(list(windows.keys()), dtype=int)
+
+        def getBlockFon(i, window):
+            # The FON is evaluated on the whole grid window of the plant, such that FON heights do not depend on the
+            # blocks
+            rows = slice(window[0].start - windows[i][0].start, window[0].stop - windows[i][0].start)
+            columns = slice(window[1].start - windows[i][1].start, window[1].stop - windows[i][1].start)
+            return self.getFon(i, windows[i])[rows, columns]
+
+        def getFonImpact(i):
+            height = self.getFon(i, windows[i])
+            fon_impact = fon_heigths[windows[i]] - height
+            fon_impact[np.where(height < self.fmin)] = 0
+            return fon_impact.sum()
 
-        fon_impacts = fon_heigths[:, :, np.newaxis] - my_fon
-        fon_impacts[np.where(my_fon < self.fmin)] = 0
-        fon_impacts = fon_impacts.sum(axis=(0, 1))
+        # FON heights and number of nodes occupied by each plant
+        fon_heigths, fon_areas = super().sumPlantValues(windows, getBlockFon)
+        fon_impacts = super().mapPlants(getFonImpact, plants)
+        self.belowground_resources = np.ones(n_plants)
+        self.belowground_resources[plants] = self.getResourceLimitations(
+            np.array(fon_impacts, dtype=float), np.array([fon_areas[i] for i in plants], dtype=float))
 
+    def usesRandomState(self):
+        return False
+
+    @staticmethod
+    def getResourceLimitations(fon_impacts, fon_areas):
+        """
+        Calculate the growth reduction factor of each plant from the FON impacts of its neighbours.
+        Args:
+            fon_impacts (array): sum of FON heights of neighbours within the FON of each plant
+            fon_areas (array): number of nodes within the FON of each plant
+        Returns:
+            numpy array with shape of fon_impacts
+        """
         # tree-to-tree competition, eq. (7) Berger & Hildenbrandt (2000)
         stress_factor = fon_impacts / fon_areas
         stress_factor = np.nan_to_num(stress_factor, nan=0)
         resource_limitations = 1 - 2 * stress_factor
         resource_limitations[np.where(resource_limitations < 0)] = 0
-        self.belowground_resources = resource_limitations
+        return resource_limitations
+
+    def calculateBelowgroundResourcesFFT(self, fon_radius):
+        """
+        Calculate a growth reduction factor for each plant like ``calculateBelowgroundResources``, but by FFT
+        convolution of stem positions with FON kernels (approximation).
+        Plants are binned by stem radius (see ``getRadiusBins``) and their positions are distributed to the four
+        surrounding nodes (bilinear weights). For each bin, the FON heights of all plants are obtained by one
+        convolution of the plant weights per node with the FON of the bin. The FON impact of a plant is the sum of FON
+        heights within its FON (correlation of FON heights with the FON area of the bin, interpolated to the plant
+        position), minus its own FON heights. Thus, the computation time scales with the number of bins and grid nodes,
+        not with the number of plants. Results are exact for plants located on nodes, if each bin contains a single
+        stem radius.
+        Plants outside the grid, plants with a FON reaching the grid boundary, plants with a FON covering the whole
+        grid and plants with a FON radius not larger than a grid cell are calculated exactly.
+        Args:
+            fon_radius (array): FON radius of each plant
+        Sets:
+            numpy array with shape(number_of_plants)
+        """
+        n_plants = len(self._r_stem)
+        self._fon_radius = fon_radius
+        xe, ye = np.array(self._xe, dtype=float), np.array(self._ye, dtype=float)
+        n_rows, n_columns = self.grid_shape
+        x_step, y_step = self.getNodeDistance(self.grid_x), self.getNodeDistance(self.grid_y)
+        # Lower left node of the cell containing a plant and bilinear weights of the four nodes of the cell
+        rows, t_y = self.getCellPositions(self.grid_y, y_step, ye)
+        columns, t_x = self.getCellPositions(self.grid_x, x_step, xe)
+        weights = np.stack(((1 - t_y) * (1 - t_x), (1 - t_y) * t_x, t_y * (1 - t_x), t_y * t_x), axis=1)
+        corners = ((0, 0), (0, 1), (1, 0), (1, 1))
+
+        # Bilinear weights are a poor approximation of a FON that covers only few nodes
+        exact = (np.isinf(fon_radius) | (fon_radius <= (x_step**2 + y_step**2)**0.5) |
+                 (t_y < 0) | (t_y > 1) | (t_x < 0) | (t_x > 1))
+        bins = np.full(n_plants, -1)
+        bins[~exact], r_bins = self.getRadiusBins(self._r_stem[~exact])
+        kernels = [self.getFonKernel(r_stem, x_step, y_step) for r_stem in r_bins]
+        for b, kernel in enumerate(kernels):
+            plants = np.flatnonzero(bins == b)
+            half_rows, half_columns = kernel.shape[0] // 2, kernel.shape[1] // 2
+            reaches_boundary = ((rows[plants] < half_rows) | (rows[plants] + 1 + half_rows > n_rows - 1) |
+                                (columns[plants] < half_columns) | (columns[plants] + 1 + half_columns > n_columns - 1))
+            bins[plants[reaches_boundary]] = -1
+
+        # FFT shape avoiding wrap-around of kernels within the grid
+        fft_shape = tuple(fft.next_fast_len(n + max([kernel.shape[axis] // 2 for kernel in kernels], default=0),
+                                            real=True) for axis, n in enumerate(self.grid_shape))
+        fon_transform = np.zeros((fft_shape[0], fft_shape[1] // 2 + 1), dtype=complex)
+        for b, kernel in enumerate(kernels):
+            plants = np.flatnonzero(bins == b)
+            if len(plants) == 0:
+                continue
+            plant_weights = np.zeros(self.grid_shape)
+            for k, (d_row, d_column) in enumerate(corners):
+                np.add.at(plant_weights, (rows[plants] + d_row, columns[plants] + d_column), weights[plants, k])
+            fon_transform += (fft.rfft2(plant_weights, s=fft_shape, workers=self.n_threads) *
+                              self.getKernelTransform(kernel, fft_shape))
+        fon_heigths = fft.irfft2(fon_transform, s=fft_shape, workers=self.n_threads)[:n_rows, :n_columns]
+        exact = np.flatnonzero(bins < 0)
+        windows = {i: self.getGridWindow(xe[i], ye[i], fon_radius[i]) for i in exact}
+        for i, window in windows.items():
+            fon_heigths[window] += self.getFon(i, window)
+
+        fon_areas = np.zeros(n_plants)
+        fon_impacts = np.zeros(n_plants)
+        fon_transform = fft.rfft2(fon_heigths, s=fft_shape, workers=self.n_threads)
+        for b, kernel in enumerate(kernels):
+            plants = np.flatnonzero(bins == b)
+            if len(plants) == 0:
+                continue
+            area = (kernel > 0).astype(float)
+            # FON heights within the FON of a plant located at each node (kernels are symmetric)
+            impacts = fft.irfft2(fon_transform * self.getKernelTransform(area, fft_shape), s=fft_shape,
+                                 workers=self.n_threads)[:n_rows, :n_columns]
+            # Own FON heights within the FON of a plant located at a node, for offsets of the plant weights
+            own = self.getKernelOverlaps(area, kernel)
+            for k, (d_row, d_column) in enumerate(corners):
+                fon_impacts[plants] += (weights[plants, k] *
+                                        impacts[rows[plants] + d_row, columns[plants] + d_column])
+                for l, (e_row, e_column) in enumerate(corners):
+                    fon_impacts[plants] -= (weights[plants, k] * weights[plants, l] *
+                                            own[1 + e_row - d_row, 1 + e_column - d_column])
+            fon_areas[plants] = np.sum(area)
 
-    def calculateFonFromDistance(self, distance):
+        def getFonImpact(i):
+            height = self.getFon(i, windows[i])
+            fon_impact = fon_heigths[windows[i]] - height
+            fon_impact[np.where(height < self.fmin)] = 0
+            return fon_impact.sum(), np.sum(height > 0)
+
+        if len(exact) > 0:
+            fon_impacts[exact], fon_areas[exact] = np.array(super().mapPlants(getFonImpact, exact),
+                                                            dtype=float).reshape(-1, 2).T
+        # Plants with a FON covering no node have no FON impact
+        self.belowground_resources = np.ones(n_plants)
+        plants = np.flatnonzero(fon_areas > 0)
+        self.belowground_resources[plants] = self.getResourceLimitations(fon_impacts[plants], fon_areas[plants])
+
+    @staticmethod
+    def getNodeDistance(axis):
         """
-        Calculate the FON height of each plant at each grid point.
+        Get the distance of neighbouring nodes along an axis of the grid.
         Args:
-            distance (int): array of distances of all mesh points to plant position
+            axis (array): node coordinates along the axis (ascending, equidistant)
         Returns:
-            numpy array with shape(x_grid_points, y_grid_points, number_of_plants)
+            float, infinite for axes with a single node
+        """
+        return axis[1] - axis[0] if len(axis) > 1 else np.inf
+
+    @staticmethod
+    def getCellPositions(axis, step, positions):
+        """
+        Get the lower node of the grid cell (between nodes) containing each position, and the relative position
+        within the cell. Positions outside the nodes have relative positions below 0 or above 1.
+        Args:
+            axis (array): node coordinates along the axis (ascending)
+            step (float): distance of nodes
+            positions (array): positions on the axis
+        Returns:
+            numpy array of ints, numpy array of floats (both with shape of positions)
+        """
+        if len(axis) < 2:
+            return np.zeros(len(positions), dtype=int), np.full(len(positions), -np.inf)
+        index = (positions - axis[0]) / step
+        lower = np.clip(np.floor(index), 0, len(axis) - 2).astype(int)
+        return lower, index - lower
+
+    def getRadiusBins(self, r_stem):
+        """
+        Bin plants by stem radius. If there are not more distinct stem radii than bins (``radius_bins``), each stem
+        radius is a bin. Otherwise, the range of stem radii is split into ``radius_bins`` bins of equal width on a
+        logarithmic scale (i.e., equal relative width), represented by the mean stem radius of their plants.
+        Args:
+            r_stem (array): stem radius of each plant
+        Returns:
+            numpy array with shape of r_stem (bin of each plant), numpy array (stem radius of each bin)
+        """
+        r_bins, bins = np.unique(r_stem, return_inverse=True)
+        if len(r_bins) <= self.radius_bins:
+            return bins.reshape(-1), r_bins
+        if r_bins[0] > 0:
+            edges = np.geomspace(r_bins[0], r_bins[-1], self.radius_bins + 1)
+        else:
+            edges = np.linspace(r_bins[0], r_bins[-1], self.radius_bins + 1)
+        bins = np.clip(np.searchsorted(edges, r_stem, side="right") - 1, 0, self.radius_bins - 1)
+        bins = np.unique(bins, return_inverse=True)[1].reshape(-1)
+        return bins, np.bincount(bins, weights=r_stem) / np.bincount(bins)
+
+    def getFonKernel(self, r_stem, x_step, y_step):
+        """
+        Calculate the FON heights of a plant located on a node for all node offsets within its FON radius. Offsets
+        are limited to the grid size.
+        Args:
+            r_stem (float): stem radius of the plant
+            x_step (float): distance of nodes along the x-axis
+            y_step (float): distance of nodes along the y-axis
+        Returns:
+            numpy array with shape(2 * row offsets + 1, 2 * column offsets + 1)
+        """
+        fon_radius = self.aa * r_stem**self.bb
+        n_rows = min(int(np.ceil(fon_radius / y_step)), self.grid_shape[0] - 1)
+        n_columns = min(int(np.ceil(fon_radius / x_step)), self.grid_shape[1] - 1)
+        distance = (((np.arange(-n_columns, n_columns + 1) * x_step)[np.newaxis, :])**2 +
+                    ((np.arange(-n_rows, n_rows + 1) * y_step)[:, np.newaxis])**2)**0.5
+        return self.calculateFonFromDistance(distance=distance, r_stem=r_stem)
+
+    @staticmethod
+    def getKernelTransform(kernel, shape):
+        """
+        Get the Fourier transform of a kernel centered on the origin, i.e., with negative offsets wrapped around.
+        Args:
+            kernel (array): kernel with odd number of rows and columns
+            shape (tuple): shape of the transform (real input)
+        Returns:
+            numpy array with shape(shape[0], shape[1] // 2 + 1)
+        """
+        wrapped = np.zeros(shape)
+        wrapped[:kernel.shape[0], :kernel.shape[1]] = kernel
+        wrapped = np.roll(wrapped, (-(kernel.shape[0] // 2), -(kernel.shape[1] // 2)), axis=(0, 1))
+        return fft.rfft2(wrapped)
+
+    @staticmethod
+    def getKernelOverlaps(area, kernel):
+        """
+        Sum up the kernel within the area of a kernel shifted by one node in each direction.
+        Args:
+            area (array): area of the kernel (bools)
+            kernel (array): kernel with odd number of rows and columns
+        Returns:
+            numpy array with shape(3, 3), the sum for a kernel shifted by (row, column) is at (1 + row, 1 + column)
+        """
+        padded = np.pad(kernel, 1)
+        overlaps = np.zeros((3, 3))
+        for d_row in (-1, 0, 1):
+            for d_column in (-1, 0, 1):
+                shifted = padded[1 - d_row:1 - d_row + kernel.shape[0], 1 - d_column:1 - d_column + kernel.shape[1]]
+                overlaps[1 + d_row, 1 + d_column] = np.sum(area * shifted)
+        return overlaps
+
+    def getFon(self, i, window):
+        """
+        Calculate the FON height of a plant within a grid window.
+        Args:
+            i (int): index of plant
+            window (tuple): grid window, see ``ResourceModel.getGridWindow``
+        Returns:
+            numpy array with shape of window
+        """
+        distance = super().getStencilDistance(self._xe[i], self._ye[i], self._fon_radius[i], window)
+        return self.calculateFonFromDistance(distance=distance, r_stem=self._r_stem[i])
+
+    def calculateFonFromDistance(self, distance, r_stem):
+        """
+        Calculate the FON height of a plant at each grid point.
+        Args:
+            distance (array): array of distances of mesh points to plant position
+            r_stem (float): stem radius of the plant
+        Returns:
+            numpy array with shape of distance
         """
         # fon radius, eq. (1) Berger et al. 2002
-        fon_radius = self.aa * self._r_stem**self.bb
-        cc = -np.log(self.fmin) / (fon_radius - self._r_stem)
-        height = np.exp(-cc[np.newaxis, np.newaxis, :] *
-                        (distance - self._r_stem[np.newaxis, np.newaxis, :]))
+        fon_radius = self.aa * r_stem**self.bb
+        cc = -np.log(self.fmin) / (fon_radius - r_stem)
+        height = np.exp(-cc * (distance - r_stem))
         height[height > 1] = 1
         height[height < self.fmin] = 0
         return height
@@ -96,7 +394,9 @@ class FON(ResourceModel):
         tags = {
             "prj_file": args,
             "required": ["type", "domain", "x_1", "x_2", "y_1", "y_2", "x_resolution",
-                         "y_resolution"]
+                         "y_resolution"],
+            "optional": ["memory_limit", "tile_size", "stencil_cache", "stencil_resolution", "stencil_cache_size",
+                         "backend", "radius_bins", "n_threads"]
         }
         super().getInputParameters(**tags)
         self._x_1 = self.x_1
@@ -105,3 +405,12 @@ class FON(ResourceModel):
         self._y_2 = self.y_2
         self.x_resolution = int(self.x_resolution)
         self.y_resolution = int(self.y_resolution)
+
+        self.backend = super().makeBackend(["grid", "fft"])
+        if self.backend == "fft":
+            if not hasattr(self, "radius_bins"):
+                self.radius_bins = 32
+                print("> Set resource parameter 'radius_bins' to default:", self.radius_bins)
+            self.radius_bins = max(int(self.radius_bins), 1)
+            if hasattr(self, "memory_limit"):
+                print("WARNING: FON ignores 'memory_limit' with the fft backend.")
@@ -54,6 +54,30 @@ class FixedSalinity(ResourceModel):
         except KeyError:
             self._psi_leaf.append(None)
 
+    def addPlants(self, plant_store):
+        geometry = plant_store.geometry
+        parameter = plant_store.getParameter()
+        n_plants = plant_store.getNumberOfPlants()
+        if (n_plants == 0 or "leaf_water_potential" not in parameter or
+                not (geometry.getPresent("h_stem").all() and geometry.getPresent("r_crown").all())):
+            super().addPlants(plant_store)
+            return
+        self.plants.append(plant_store)
+
+        self._xe.extend(plant_store.x.tolist())
+        self._r_salinity.extend([parameter["r_salinity"]] * n_plants)
+        # The following parameters depend on the salinity response function of the plant
+        # (see species file)
+        try:
+            self._salt_effect_d.extend([parameter["salt_effect_d"]] * n_plants)
+            self._salt_effect_ui.extend([parameter["salt_effect_ui"]] * n_plants)
+        except KeyError:
+            self._salt_effect_d.extend([None] * n_plants)
+            self._salt_effect_ui.extend([None] * n_plants)
+        self._h_stem.extend(geometry.getColumn("h_stem").tolist())
+        self._r_crown.extend(geometry.getColumn("r_crown").tolist())
+        self._psi_leaf.extend([parameter["leaf_water_potential"]] * n_plants)
+
     def calculateBelowgroundResources(self):
         """
         Calculate a growth reduction factor for each plant based on pore-water salinity below the
@@ -64,10 +88,11 @@ class FixedSalinity(ResourceModel):
         salinity_plant = self.getPlantSalinity()
         self.calculatePlantResources(salinity_plant)
 
-        for i, plant in zip(range(0, len(self._xe)), self.plants):
-            growth_concept_information = plant.getGrowthConceptInformation()
-            growth_concept_information['salinity'] = salinity_plant[i]
-            plant.setGrowthConceptInformation(growth_concept_information)
+        super().setGrowthConceptInformation(self.plants, 'salinity', salinity_plant)
+
+    def usesRandomState(self):
+        # Random numbers are drawn for the salinity below plants (distribution) and at the boundaries (sine)
+        return hasattr(self, "distribution") or hasattr(self, "amplitude")
 
     def calculatePlantResources(self, salinity_plant):
         # find indices with r_salinity = bettina or forman
@@ -99,6 +99,9 @@ class OGS(ResourceModel):
 
         self.renameParameters()
 
+    def usesRandomState(self):
+        return False
+
     def prepareNextTimeStep(self, t_ini, t_end):
         self._t_ini = t_ini
         if self._use_fixed_ogs_delta_t:
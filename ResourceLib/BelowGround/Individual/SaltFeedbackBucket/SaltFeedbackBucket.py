@@ -1,4 +1,6 @@
 import numpy as np
+from ResourceLib import ResourceModel
+from ResourceLib.TiledGrid import TiledGrid
 from ResourceLib.BelowGround.Individual.FixedSalinity import FixedSalinity
 
 
@@ -21,15 +23,25 @@ class SaltFeedbackBucket(FixedSalinity):
 
     def assignInitialCellSalinity(self):
         if hasattr(self, "initial_salinity_file"):
-            self.sal_cell = np.loadtxt('initial_salinity_file', usecols=range(len(self.my_grid[0][0])))
+            self.sal_cell = np.loadtxt('initial_salinity_file', usecols=range(self.grid_shape[1]))
+            if self.tile_size is not None:
+                self.sal_cell = TiledGrid.fromArray(self.sal_cell, self.tile_size)
+        elif self.tile_size is not None:
+            # Tiles without plants keep the salinity of the inflowing water (profile along the x-axis)
+            self.sal_cell = super().makeGridArray(background=self.sal_cell_inflow)
         else:
             self.sal_cell = self.sal_cell_inflow
 
     def prepareNextTimeStep(self, t_ini, t_end):
         super().prepareNextTimeStep(t_ini, t_end)
         self.timesteplength = t_end - t_ini
-        self.vol_sink_cell = np.zeros(np.shape(self.my_grid[0]))
+        self.vol_sink_cell = super().makeGridArray()
         self.plant_cells = []
+        self.plant_sinks = []
+
+    def addPlants(self, plant_store):
+        # Add plants one by one (plant cells are determined per plant)
+        ResourceModel.addPlants(self, plant_store)
 
     def addPlant(self, plant):
         xp, yp = plant.getPosition()
@@ -59,14 +71,26 @@ class SaltFeedbackBucket(FixedSalinity):
         self.calculatePlantSink(xp, yp, rrp, plant_water_uptake)
 
     def calculatePlantSink(self, x, y, r_root, bg_resources):
-        # Assign plant water uptake to cells
-        idx = self.getAffectedCellsIdx(x, y, r_root)
-        self.plant_cells.append(idx)
-        if bg_resources != 0:
+        # Plant water uptake is assigned to cells with the sinks of all plants (see applyPlantSinks)
+        self.plant_sinks.append((x, y, r_root, bg_resources))
+
+    def applyPlantSinks(self):
+        """
+        Identify the cells affected by each plant and assign the plant water uptake to the cells.
+        Affected cells are identified on the thread pool, if enabled (see ``ResourceModel.makeThreadPool``), water
+        uptake is assigned in the order of the plants.
+        Sets:
+            list of index arrays, numpy array with shape of grid
+        """
+        self.plant_cells = super().mapPlants(lambda i: self.getAffectedCellsIdx(*self.plant_sinks[i][:3]),
+                                             range(len(self.plant_sinks)))
+        for idx, (x, y, r_root, bg_resources) in zip(self.plant_cells, self.plant_sinks):
             no_cells = len(idx[0])
-            # Calculate transpiration based on area of occupied cells in m³ per m² per time step = m/s
-            sink_per_cell = bg_resources / (self.cell_area * no_cells) / self.timesteplength
-            self.vol_sink_cell[idx] += sink_per_cell
+            # Plants outside the grid do not occupy any cell
+            if bg_resources != 0 and no_cells > 0:
+                # Calculate transpiration based on area of occupied cells in m³ per m² per time step = m/s
+                sink_per_cell = bg_resources / (self.cell_area * no_cells) / self.timesteplength
+                self.vol_sink_cell[idx] += sink_per_cell
 
     def calculateBelowgroundResources(self):
         self.getBorderValues()
@@ -88,12 +112,12 @@ class SaltFeedbackBucket(FixedSalinity):
         Calculate salinity of inflowing water of each cell, such as tidal water.
         Salinity is linearly interpolated between the left and right model boundaries.
         """
-        if len(self.my_grid[0]) == 1:
+        if self.grid_shape[0] == 1:
             # If only 1 cell exist take mean of border salinity
             self.sal_cell_inflow = np.array([0.5 * (self._salinity[0] + self._salinity[1])])
         else:
             x_dif = self.x_2 - self.x_1
-            self.sal_cell_inflow = (self.my_grid[0] - self.x_1) / x_dif * (self._salinity[1] - self._salinity[0]) + self._salinity[0]
+            self.sal_cell_inflow = (self.getNodeX() - self.x_1) / x_dif * (self._salinity[1] - self._salinity[0]) + self._salinity[0]
 
     def calculateCellSalinity(self):
         """
@@ -101,14 +125,66 @@ class SaltFeedbackBucket(FixedSalinity):
         - extraction of fresh water by plants
         - mixing with inflowing water.
         Additionally, write cell salinity to text file.
+        If the grid is tiled, tiles are processed on the thread pool, if enabled (see ``ResourceModel.makeThreadPool``).
+        """
+        self.applyPlantSinks()
+        if self.tile_size is None:
+            self.sal_cell = self.mixCellSalinity(self.sal_cell, self.vol_sink_cell, self.r_mix_inflow,
+                                                 self.sal_cell_inflow)
+        else:
+            # Only tiles with plants (or plants in previous time steps) are allocated, all other tiles keep the
+            # salinity profile along the x-axis
+            for key in self.vol_sink_cell.getAllocatedTileKeys():
+                self.sal_cell.getTile(key)
+            super().mapParallel(self.mixTileSalinity, self.sal_cell.getAllocatedTileKeys())
+            self.sal_cell.background = self.mixCellSalinity(self.sal_cell.background, 0,
+                                                            self.getProfile(self.r_mix_inflow, slice(None)),
+                                                            self.getProfile(self.sal_cell_inflow, slice(None)))
+
+        self.writeGridSalinity(t_end=self._t_end, tsl=self.timesteplength)
+
+    def mixTileSalinity(self, key):
+        """
+        Calculate salinity of the cells of an allocated tile, see ``mixCellSalinity``.
+        Args:
+            key (tuple): row and column of the tile
+        """
+        columns = self.sal_cell.getTileWindow(key)[1]
+        tile = self.sal_cell.tiles[key]
+        tile[:] = self.mixCellSalinity(tile, self.vol_sink_cell.tiles.get(key, 0),
+                                       self.getProfile(self.r_mix_inflow, columns),
+                                       self.getProfile(self.sal_cell_inflow, columns))
+
+    def mixCellSalinity(self, sal_cell, vol_sink_cell, r_mix_inflow, sal_cell_inflow):
+        """
+        Calculate salinity of cells after extraction of fresh water by plants and mixing with inflowing water.
+        Args:
+            sal_cell (array): salinity of cells (kg/kg)
+            vol_sink_cell (array): water extraction by plants of cells (m/s)
+            r_mix_inflow (array): mixing rate of cells (m/s)
+            sal_cell_inflow (array): salinity of inflowing water of cells (kg/kg)
+        Returns:
+            numpy array
         """
         # [-] = m/s / m * s
-        ht = np.exp(- self.r_mix_inflow / self.depth * self.timesteplength)
+        ht = np.exp(- r_mix_inflow / self.depth * self.timesteplength)
         # kg/kg = kg/kg + m/s / m/s * kg/kg
-        self.sal_cell = self.sal_cell * ht + (self.vol_sink_cell + self.r_mix_inflow) / \
-                        self.r_mix_inflow * self.sal_cell_inflow * (1 - ht)
+        return sal_cell * ht + (vol_sink_cell + r_mix_inflow) / r_mix_inflow * sal_cell_inflow * (1 - ht)
 
-        self.writeGridSalinity(t_end=self._t_end, tsl=self.timesteplength)
+    @staticmethod
+    def getProfile(profile, columns):
+        """
+        Get the values of a profile along the x-axis for a range of columns. Profiles with one value (grids with
+        one row) are constant.
+        Args:
+            profile (array): profile with shape(number_of_columns) or shape(1)
+            columns (slice): columns of the grid
+        Returns:
+            numpy array
+        """
+        if len(profile) == 1:
+            return profile
+        return profile[columns]
 
     def getPlantSalinity(self):
         """
@@ -117,12 +193,9 @@ class SaltFeedbackBucket(FixedSalinity):
             numpy array with shape(number_of_trees)
         """
         # Interpolation of salinity over space
-        salinity_plant = np.zeros(len(self.plant_cells))
-        for pc in range(len(self.plant_cells)):
-            affected_cells = self.plant_cells[pc]
-            salinity_plant[pc] = np.mean(self.sal_cell[affected_cells])
-
-        return salinity_plant
+        salinity_plant = super().mapPlants(lambda pc: np.mean(self.sal_cell[self.plant_cells[pc]]),
+                                           range(len(self.plant_cells)))
+        return np.array(salinity_plant, dtype=float)
 
     def writeGridSalinity(self, t_end, tsl):
         """
@@ -131,7 +204,8 @@ class SaltFeedbackBucket(FixedSalinity):
         """
         if hasattr(self, "save_file"):
             if t_end == 0 or t_end % (self.save_salinity_ts * tsl) == 0:
-                np.savetxt(self.save_file + "_" + str(t_end) + '.txt', self.sal_cell)
+                sal_cell = self.sal_cell.toArray() if isinstance(self.sal_cell, TiledGrid) else self.sal_cell
+                np.savetxt(self.save_file + "_" + str(t_end) + '.txt', sal_cell)
 
     def getAffectedCellsIdx(self, xp, yp, rrp):
         """
@@ -143,10 +217,11 @@ class SaltFeedbackBucket(FixedSalinity):
         Returns:
             array
         """
-        distance = (((self.my_grid[0] - np.array(xp)) ** 2 +
-                     (self.my_grid[1] - np.array(yp)) ** 2) ** 0.5)
+        # Only the grid window covering the root plate is considered
+        window = super().getStencilWindow(xp, yp, rrp)
+        distance = super().getStencilDistance(xp, yp, rrp, window)
         idx = np.where(distance < rrp)
-        return idx
+        return idx[0] + window[0].start, idx[1] + window[1].start
 
     def getBorderValues(self):
         """
@@ -190,11 +265,22 @@ class SaltFeedbackBucket(FixedSalinity):
         Calculate the mixing rate of each cell.
         The rate is linearly interpolated between the left and right model boundaries.
         """
-        if len(self.my_grid[0]) == 1:
+        if self.grid_shape[0] == 1:
             self.r_mix_inflow = np.array([0.5 * (self.r_mix[0] + self.r_mix[1])])
         else:
             x_dif = self.x_2 - self.x_1
-            self.r_mix_inflow = (self.my_grid[0] - self.x_1) / x_dif * (self.r_mix[1] - self.r_mix[0]) + self.r_mix[0]
+            self.r_mix_inflow = (self.getNodeX() - self.x_1) / x_dif * (self.r_mix[1] - self.r_mix[0]) + self.r_mix[0]
+
+    def getNodeX(self):
+        """
+        Get the x-coordinates of the grid nodes. If the grid is tiled, only the profile along the x-axis is returned,
+        i.e., one value per column.
+        Returns:
+            numpy array with shape of grid or shape(number_of_columns)
+        """
+        if self.tile_size is None:
+            return self.my_grid[0]
+        return self.grid_x
 
     def getMixingRateSine(self):
         """
@@ -217,7 +303,8 @@ class SaltFeedbackBucket(FixedSalinity):
                          "x_resolution", "y_resolution", "r_mix"],
             "optional": ["sine", "amplitude", "stretch", "offset", "noise",
                          "medium", "save_salinity_ts", "save_file",
-                         "depth", "initial_salinity_file"]
+                         "depth", "initial_salinity_file", "tile_size",
+                         "stencil_cache", "stencil_resolution", "stencil_cache_size", "n_threads"]
         }
         return tags
 
@@ -16,6 +16,7 @@ class SymmetricZOI(ResourceModel):
         case = args.find("type").text
         self.getInputParameters(args)
         super().makeGrid()
+        self.makeIncrementalState()
 
     def prepareNextTimeStep(self, t_ini, t_end):
         self.xe = []
@@ -32,7 +33,7 @@ class SymmetricZOI(ResourceModel):
             r_root = geometry["r_root"]
         except KeyError:
             r_root = geometry["r_bg"]
-        if r_root < (self.mesh_size * 1 / 2**0.5):
+        if self.backend == "grid" and r_root < (self.mesh_size * 1 / 2**0.5):
             if not hasattr(self, "allow_interpolation") or not self.allow_interpolation:
                 print("ERROR: mesh too course for below-ground module!")
                 print("Please refine mesh or increase initial root radius above " +
@@ -40,8 +41,8 @@ class SymmetricZOI(ResourceModel):
                 exit()
             else:
                 # Find closest node
-                cx = self.find_nearest(self.my_grid[0][0], x)
-                cy = self.find_nearest(np.transpose(self.my_grid[1])[0], y)
+                cx = self.find_nearest(self.grid_x, x)
+                cy = self.find_nearest(self.grid_y, y)
                 # Distance between plant and closest node
                 dist = ((cx - x) ** 2 + (cy - y) ** 2) ** 0.5
                 # Set root radius to min. distance
@@ -51,41 +52,281 @@ class SymmetricZOI(ResourceModel):
         self.ye.append(y)
         self.r_root.append(r_root)
 
+    def addPlants(self, plant_store):
+        geometry = plant_store.geometry
+        # ToDo: resolve when all geometries are renamed
+        if not geometry.getPresent("r_root").all():
+            super().addPlants(plant_store)
+            return
+        x, y = plant_store.x, plant_store.y
+        r_root = np.array(geometry.getColumn("r_root"))
+        small = np.flatnonzero(r_root < (self.mesh_size * 1 / 2**0.5))
+        if self.backend == "grid" and len(small) > 0:
+            if not hasattr(self, "allow_interpolation") or not self.allow_interpolation:
+                print("ERROR: mesh too course for below-ground module!")
+                print("Please refine mesh or increase initial root radius above " +
+                      str(self.mesh_size) + "m or allow interpolation.")
+                exit()
+            else:
+                # Find closest node
+                grid_x = self.grid_x
+                grid_y = self.grid_y
+                cx = grid_x[np.abs(grid_x[np.newaxis, :] - x[small, np.newaxis]).argmin(axis=1)]
+                cy = grid_y[np.abs(grid_y[np.newaxis, :] - y[small, np.newaxis]).argmin(axis=1)]
+                # Set root radius to distance between plant and closest node
+                r_root = r_root.astype(float)
+                r_root[small] = ((cx - x[small]) ** 2 + (cy - y[small]) ** 2) ** 0.5
+
+        self.xe.extend(x.tolist())
+        self.ye.extend(y.tolist())
+        self.r_root.extend(r_root.tolist())
+
     def calculateBelowgroundResources(self):
         """
         Calculate a growth reduction factor for each plant based on competition with neighboring plants.
         Sets:
             numpy array with shape(number_of_plants)
         """
-        # Numpy array of shape [res_x, res_y, n_plants]
-        distance = (((self.my_grid[0][:, :, np.newaxis] -
-                      np.array(self.xe)[np.newaxis, np.newaxis, :])**2 +
-                     (self.my_grid[1][:, :, np.newaxis] -
-                      np.array(self.ye)[np.newaxis, np.newaxis, :])**2)**0.5)
-
-        # Array of shape distance [res_x, res_y, n_plants], indicating which
-        # cells are occupied by plant root plates
-        plants_present = np.array(self.r_root)[np.newaxis, np.newaxis, :] >= distance
-
+        if self.backend == "analytic":
+            self.calculateBelowgroundResourcesAnalytic()
+            return
+        if self.incremental:
+            self.calculateBelowgroundResourcesIncremental()
+            return
+        n_plants = len(self.xe)
+        # Plants without overlapping root plates occupy their nodes alone, i.e., the factor is 1, if their root plate
+        # covers the closest node (with the margin of the stencil cache, see getIsolatedPlants)
+        xe, ye = np.array(self.xe, dtype=float), np.array(self.ye, dtype=float)
+        min_distances = ((super().getClosestNodes(self.grid_x, xe) - xe)**2 +
+                         (super().getClosestNodes(self.grid_y, ye) - ye)**2)**0.5
+        margin = self.mesh_size if self.distance_stencils is not None else 0
+        isolated = (super().getIsolatedPlants(xe, ye, self.r_root) &
+                    (np.array(self.r_root, dtype=float) >= min_distances + margin))
+        plants = np.flatnonzero(~isolated)
+        # Grid windows covering the root plates
+        windows = {i: self.getStencilWindow(self.xe[i], self.ye[i], self.r_root[i]) for i in plants}
+        if self.thread_pool is not None:
+            self.calculateBelowgroundResourcesParallel(windows)
+            return
+        # Count all plants, which occupy a node
+        # returns array of shape [res_x, res_y]
+        denom = super().makeGridArray(dtype=int)
         # Count all nodes, which are occupied by plants
         # returns array of shape [n_plants]
         # BETTINA ODD 2017: variable 'countbelow'
-        plant_counts = plants_present.sum(axis=(0, 1))
+        plant_counts = np.zeros(n_plants, dtype=int)
+        # Split plants into chunks if the root plates of all plants (1 byte per node) exceed the memory limit
+        chunks = super().getPlantChunks(window_sizes=super().getWindowSizes(list(windows.values())),
+                                        bytes_per_cell=1, grid_bytes=3 * denom.nbytes)
+        chunks = [plants[chunk] for chunk in chunks]
+        for chunk in chunks:
+            plants_present = [self.getRootPlate(i, windows[i]) for i in chunk]
+            for i, present in zip(chunk, plants_present):
+                denom[windows[i]] += present
+                plant_counts[i] = np.sum(present)
 
         # Calculate reciprocal of cell-own variables (array to count wins)
         # BETTINA ODD 2017: variable 'compete_below'
         # [res_x, res_y]
-        denom = plants_present.sum(axis=-1)
-        plants_present_reci = np.divide(1, denom, where=denom != 0)
+        plants_present_reci = super().mapGridArray(denom, self.getReciprocal, dtype=float)
 
         # Sum up wins of each plant = plants_present_reci[plant]
-        n_plants = len(plants_present[0, 0, :])
         plant_wins = np.zeros(n_plants)
+        # Start with the last chunk, as its root plates are still available
+        for chunk in reversed(chunks):
+            if chunk is not chunks[-1]:
+                plants_present = [self.getRootPlate(i, windows[i]) for i in chunk]
+            for i, present in zip(chunk, plants_present):
+                plant_wins[i] = np.sum(plants_present_reci[windows[i]][present])
+        self.belowground_resources = np.ones(n_plants)
+        self.belowground_resources[plants] = plant_wins[plants] / plant_counts[plants]
+
+    def calculateBelowgroundResourcesParallel(self, windows):
+        """
+        Calculate a growth reduction factor for each plant like ``calculateBelowgroundResources`` on the thread pool
+        (see ``ResourceModel.makeThreadPool``). Root plates are stamped per block of the grid and wins are summed up per
+        group of plants, i.e., root plates are evaluated twice instead of being stored, and ``memory_limit`` only
+        applies to the blocks. Results are identical to the serial calculation.
+        Args:
+            windows (dict): grid window of each plant, which is not isolated
+        Sets:
+            numpy array with shape(number_of_plants)
+        """
+        n_plants = len(self.xe)
+        plants = np.array(list(windows.keys()), dtype=int)
+        # Count all plants, which occupy a node, and all nodes, which are occupied by a plant
+        denom, plant_counts = super().sumPlantValues(windows, self.getRootPlate, dtype=int)
+        plants_present_reci = super().mapGridArray(denom, self.getReciprocal, dtype=float)
+        # Sum up wins of each plant = plants_present_reci[plant]
+        plant_wins = super().mapPlants(
+            lambda i: np.sum(plants_present_reci[windows[i]][self.getRootPlate(i, windows[i])]), plants)
+        self.belowground_resources = np.ones(n_plants)
+        self.belowground_resources[plants] = (np.array(plant_wins, dtype=float) /
+                                              np.array([plant_counts[i] for i in plants], dtype=int))
+
+    def calculateBelowgroundResourcesAnalytic(self):
+        """
+        Calculate a growth reduction factor for each plant like ``calculateBelowgroundResources``, but from the
+        exact areas of the root plates shared with overlapping root plates instead of counting grid nodes (see
+        ``pyMANGA.ResourceLib.AnalyticZOI``). Plants without root plate are not limited.
+        Sets:
+            numpy array with shape(number_of_plants)
+        """
+        r_root = np.array(self.r_root, dtype=float)
+        zoi = super().getAnalyticZOI(self.xe, self.ye, r_root)
+        self.belowground_resources = np.divide(zoi.getSymmetricAreas(), np.pi * r_root**2,
+                                               out=np.ones(len(r_root)), where=r_root > 0)
+
+    def usesRandomState(self):
+        return False
+
+    def makeIncrementalState(self):
+        """
+        Initialize the grid state of the incremental mode, if enabled by the optional tag ``incremental``.
+        The incremental mode uses exact distances, i.e., the stencil cache is disabled.
+        Sets:
+            bool, dictionary of root plates, numpy arrays with shape of grid
+        """
+        self.incremental = super().makeBoolFromArg("incremental")
+        if self.incremental and self.backend == "analytic":
+            print("WARNING: SymmetricZOI ignores 'incremental' with the analytic backend.")
+            self.incremental = False
+        if not self.incremental:
+            return
+        if self.distance_stencils is not None:
+            print("WARNING: SymmetricZOI ignores 'stencil_cache' in incremental mode.")
+            self.distance_stencils = None
+        if hasattr(self, "memory_limit"):
+            print("WARNING: SymmetricZOI ignores 'memory_limit' in incremental mode.")
+        self.root_plates = {"x": [], "y": [], "windows": [], "present": [], "d_in": [], "d_out": [],
+                            "counts": [], "wins": []}
+        self.denom = super().makeGridArray(dtype=int)
+        self.plants_present_reci = super().makeGridArray()
+
+    def calculateBelowgroundResourcesIncremental(self):
+        """
+        Calculate a growth reduction factor for each plant like ``calculateBelowgroundResources``, but update the
+        grid state of the previous time step.
+        Root plates are only re-stamped if they occupy other nodes than in the previous time step, or if plants were
+        added or removed. Wins are only re-evaluated for plants with a changed node in their grid window. Results are
+        identical to the full calculation.
+        Sets:
+            numpy array with shape(number_of_plants)
+        """
+        n_plants = len(self.xe)
+        old = self.root_plates
+        # Assign root plates of the previous time step to plants at the same position, if the root plate still
+        # occupies the same nodes, i.e., if no node moved across the root radius
+        candidates = {}
+        for j in range(len(old["x"])):
+            candidates.setdefault((old["x"][j], old["y"][j]), []).append(j)
+        reused = np.full(n_plants, -1)
+        for i in range(n_plants):
+            plates = candidates.get((self.xe[i], self.ye[i]), [])
+            for j in plates:
+                if old["d_in"][j] <= self.r_root[i] < old["d_out"][j]:
+                    reused[i] = j
+                    plates.remove(j)
+                    break
+
+        # Remove root plates of dead plants and changed root plates from the grid state
+        touched = super().makeGridArray(dtype=bool)
+        for plates in candidates.values():
+            for j in plates:
+                window, present = old["windows"][j], old["present"][j]
+                self.denom[window] -= present
+                touched[window] |= present
 
+        # Stamp root plates of new plants and changed root plates
+        new = {key: [None] * n_plants for key in old.keys()}
         for i in range(n_plants):
-            plant_wins[i] = np.sum(plants_present_reci[np.where(
-                plants_present[:, :, i])])
-        self.belowground_resources = plant_wins / plant_counts
+            j = reused[i]
+            if j >= 0:
+                for key in old.keys():
+                    new[key][i] = old[key][j]
+                continue
+            window = super().getGridWindow(self.xe[i], self.ye[i], self.r_root[i])
+            distance = super().getStencilDistance(self.xe[i], self.ye[i], self.r_root[i], window)
+            present = self.r_root[i] >= distance
+            new["x"][i], new["y"][i] = self.xe[i], self.ye[i]
+            new["windows"][i], new["present"][i] = window, present
+            new["d_in"][i], new["d_out"][i] = self.getRootPlateBounds(self.xe[i], self.ye[i], window, distance,
+                                                                       present)
+            new["counts"][i] = np.sum(present)
+            self.denom[window] += present
+            touched[window] |= present
+
+        # Update reciprocal of cell-own variables on changed nodes
+        if self.tile_size is None:
+            self.plants_present_reci[touched] = self.getReciprocal(self.denom[touched])
+        else:
+            for key in touched.getAllocatedTileKeys():
+                changed = touched.tiles[key]
+                self.plants_present_reci.getTile(key)[changed] = self.getReciprocal(self.denom.getTile(key)[changed])
+
+        # Re-evaluate wins of plants with a changed node in their grid window (summed-area table of changed nodes)
+        if self.tile_size is None:
+            changed = np.zeros((touched.shape[0] + 1, touched.shape[1] + 1), dtype=int)
+            changed[1:, 1:] = np.cumsum(np.cumsum(touched, axis=0), axis=1)
+        for i in range(n_plants):
+            rows, columns = new["windows"][i]
+            if reused[i] >= 0:
+                if self.tile_size is None:
+                    n_changed = (changed[rows.stop, columns.stop] - changed[rows.start, columns.stop] -
+                                 changed[rows.stop, columns.start] + changed[rows.start, columns.start])
+                else:
+                    n_changed = np.count_nonzero(touched[new["windows"][i]])
+                if n_changed == 0:
+                    continue
+            new["wins"][i] = np.sum(self.plants_present_reci[new["windows"][i]][new["present"][i]])
+        self.root_plates = new
+        self.belowground_resources = (np.array(new["wins"], dtype=float) /
+                                      np.array(new["counts"], dtype=int))
+
+    def getRootPlateBounds(self, x, y, window, distance, present):
+        """
+        Get the range of root radii, for which a root plate occupies the same nodes, i.e., the largest distance of an
+        occupied node and the smallest distance of a free node. Nodes outside the grid window are at least as far as
+        the closest node row or column outside the window.
+        Args:
+            x (float): x-position
+            y (float): y-position
+            window (tuple): grid window, see ``ResourceModel.getGridWindow``
+            distance (array): distance between position and nodes of the window
+            present (array): nodes occupied by the root plate
+        Returns:
+            float, float
+        """
+        d_in = np.max(distance[present]) if present.any() else -np.inf
+        d_out = np.min(distance[~present]) if not present.all() else np.inf
+        for axis, position, indices in ((self.grid_y, y, window[0]), (self.grid_x, x, window[1])):
+            outside = [k for k in (indices.start - 1, indices.stop) if 0 <= k < len(axis)]
+            if outside:
+                d_out = min(d_out, np.min(((axis[outside] - position)**2)**0.5))
+        return d_in, d_out
+
+    @staticmethod
+    def getReciprocal(denom):
+        """
+        Get the reciprocal of the number of plants occupying a node, or 0 for free nodes.
+        Args:
+            denom (array): number of plants occupying a node
+        Returns:
+            numpy array with shape of denom
+        """
+        return np.divide(1, denom, out=np.zeros(np.shape(denom)), where=denom != 0)
+
+    def getRootPlate(self, i, window):
+        """
+        Get the nodes of a grid window, which are occupied by the root plate of a plant.
+        Args:
+            i (int): index of plant
+            window (tuple): grid window, see ``ResourceModel.getGridWindow``
+        Returns:
+            numpy array of bools with shape of window
+        """
+        distance = super().getStencilDistance(self.xe[i], self.ye[i], self.r_root[i], window)
+        return self.r_root[i] >= distance
 
     def find_nearest(self, array, value):
         """
@@ -105,7 +346,8 @@ class SymmetricZOI(ResourceModel):
         tags = {
             "prj_file": args,
             "required": ["type", "domain", "x_1", "x_2", "y_1", "y_2", "x_resolution", "y_resolution"],
-            "optional": ["allow_interpolation"]
+            "optional": ["allow_interpolation", "memory_limit", "incremental", "tile_size", "backend",
+                         "stencil_cache", "stencil_resolution", "stencil_cache_size", "n_threads"]
         }
         super().getInputParameters(**tags)
         self._x_1 = self.x_1
@@ -116,4 +358,5 @@ class SymmetricZOI(ResourceModel):
         self.y_resolution = int(self.y_resolution)
 
         self.allow_interpolation = super().makeBoolFromArg("allow_interpolation")
+        self.backend = super().makeBackend(["grid", "analytic"])
 
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 from ResourceLib import ResourceModel
+from PopulationLib.PopManager.SpatialIndex import NeighbourList
 
 
 class Network(ResourceModel):
@@ -164,6 +165,10 @@ class Network(ResourceModel):
         self.belowground_resources = self.getBGfactor()
         self.updateNetworkParametersForGrowthAndDeath()
 
+    def usesRandomState(self):
+        # Root contacts and the order of root graft formation are random
+        return True
+
     def getBGfactor(self):
         """
         Calculate below-ground resource factor as fraction of water available actual:potential.
@@ -212,7 +217,7 @@ class Network(ResourceModel):
         tags = {
             "prj_file": args,
             "required": ["type", "f_radius"],
-            "optional": ["exchange"]
+            "optional": ["exchange", "neighbour_skin"]
         }
         return tags
 
@@ -414,8 +419,7 @@ class Network(ResourceModel):
         The procedures set an array with booleans indicating whether the root graft formation of a plant starts or not.
         Based on the array they update the plant attribute 'rgf_counter'.
         """
-        contact_matrix = self.getContactMatrix()
-        pairs = self.getPairsFromMatrix(contact_matrix=contact_matrix)
+        pairs = self.getContactPairs()
         self.getRGFforGrowthAndDeath(pairs=pairs)
 
     def getDistance(self, x1, x2, y1, y2):
@@ -431,52 +435,47 @@ class Network(ResourceModel):
         """
         return ((x1 - x2)**2 + (y1 - y2)**2)**0.5
 
-    def getContactMatrix(self):
+    def getContactPairs(self):
         """
-        Get contact matrix indicating whether roots of plants are in contact or not.
+        Get all pairs of plants with their roots in contact with each other.
+        Only pairs of plants with overlapping root plates can be in contact. They are obtained from the persistent
+        neighbour list of the module (see ``getNeighbourList``).
+        One random number is drawn per candidate pair (in lexicographic order of the pairs) and compared to the
+        probability for root contact.
+        Format: from, to
         Returns:
-            array with bools of shape(number_of_plants, number_of_plants)
-        """
-        x_mesh = np.array(np.meshgrid(self._xe, self._xe))
-        y_mesh = np.array(np.meshgrid(self._ye, self._ye))
-        # calculate distances between all plants
-        distances = ((x_mesh[0] - x_mesh[1])**2 +
-                     (y_mesh[0] - y_mesh[1])**2)**.5
-
-        roots = np.array(np.meshgrid(self._r_root, self._r_root))
-        root_sums = roots[0] + roots[1]
-
+            list
+        """
+        xe, ye, r_root = np.array(self._xe), np.array(self._ye), np.array(self._r_root)
+        pairs = self.getNeighbourList().getOverlappingPairs(xe, ye, r_root,
+                                                            spatial_index=super().getSpatialIndex(xe, ye))
+        i, j = pairs[:, 0], pairs[:, 1]
+        # calculate distances between plants
+        distances = ((xe[j] - xe[i])**2 + (ye[j] - ye[i])**2)**.5
+        root_sums = r_root[j] + r_root[i]
         # probability for root contact
         p_meeting = 1 - distances / root_sums
-        # probability is 0 for plant = plant (diagonal)
-        np.fill_diagonal(p_meeting, 0)
-
-        # generate matrix with random floats
-        probs = np.random.random((len(self._xe), len(self._xe)))
-        # reshape to a triangular matrix
-        probs = np.triu(probs)
-        # Mirror upper triangle of the matrix
-        probs += probs.transpose()
 
-        contact_matrix = np.zeros(np.shape(x_mesh[0]))
-        indices = np.where(probs < p_meeting)
-        contact_matrix[indices] += 1
+        # generate random floats
+        probs = np.random.random(len(pairs))
 
-        return contact_matrix
+        return pairs[probs < p_meeting].tolist()
 
-    def getPairsFromMatrix(self, contact_matrix):
+    def getNeighbourList(self):
         """
-        Get all pairs of plants with their roots in contact with each other.
-        Format: from, to
-        Args:
-            contact_matrix (array): 2D matrix indicating whether roots are in contact
+        Get the persistent list of plants with overlapping (or almost overlapping) root plates, see
+        ``pyMANGA.PopulationLib.PopManager.SpatialIndex.NeighbourList``.
+        The list is only rebuilt if plants were recruited or removed or if a root plate radius grew by more than
+        ``neighbour_skin``.
         Returns:
-            array
+            NeighbourList
         """
-        # reshape to a triangular matrix to avoid duplicated links
-        contact_matrix_upper = np.triu(contact_matrix)
-        pairs = np.argwhere(contact_matrix_upper == 1).tolist()
-        return pairs
+        if not hasattr(self, "neighbour_list"):
+            if not hasattr(self, "neighbour_skin"):
+                self.neighbour_skin = 0.1
+                print("> Set below-ground network parameter 'neighbour_skin' to default:", self.neighbour_skin)
+            self.neighbour_list = NeighbourList(skin=self.neighbour_skin)
+        return self.neighbour_list
 
     def checkRgfAbility(self, pair):
         """
@@ -739,27 +738,23 @@ class Network(ResourceModel):
                size] = self._psi_osmo[members] - self._psi_top[members]
 
         ## Kirchhoff's 2nd law: flow between two connected plants
-        x_mesh = np.array(np.meshgrid(self._xe, self._xe))
-        y_mesh = np.array(np.meshgrid(self._ye, self._ye))
-        # calculate distances between all plants of the group
-        distances = ((x_mesh[0] - x_mesh[1])**2 +
-                     (y_mesh[0] - y_mesh[1])**2)**.5
-        r_stem = np.array(np.meshgrid(self._r_stem, self._r_stem))
-        r_root = np.array(np.meshgrid(self._r_root, self._r_root))
+        xe, ye = np.array(self._xe), np.array(self._ye)
+        # calculate distances between connected plants of the group
+        distances = ((xe[to_IDs] - xe[from_IDs])**2 +
+                     (ye[to_IDs] - ye[from_IDs])**2)**.5
+        r_stem = np.array(self._r_stem)
+        r_root = np.array(self._r_root)
 
         # @mcwimm: at the moment the grafted root radius grows proportional to
         #  the stem radius. This might be updated to grow based on avail.
         #  resources.
-        r_grafts = self.f_radius * np.minimum(r_stem[0], r_stem[1])
-        l_gr = (r_root[0] + r_root[1] + distances) / 2
-        kf_sap = np.array(np.meshgrid(self._kf_sap, self._kf_sap))
-        kf_saps = (kf_sap[0] + kf_sap[1]) / 2
-        graft_resistance = self.getGraftResistance(distance=l_gr[from_IDs,
-                                                                 to_IDs],
-                                                   r_graft=r_grafts[from_IDs,
-                                                                    to_IDs],
-                                                   kf_sap=kf_saps[from_IDs,
-                                                                  to_IDs])
+        r_grafts = self.f_radius * np.minimum(r_stem[to_IDs], r_stem[from_IDs])
+        l_gr = (r_root[to_IDs] + r_root[from_IDs] + distances) / 2
+        kf_sap = np.array(self._kf_sap)
+        kf_saps = (kf_sap[to_IDs] + kf_sap[from_IDs]) / 2
+        graft_resistance = self.getGraftResistance(distance=l_gr,
+                                                   r_graft=r_grafts,
+                                                   kf_sap=kf_saps)
         matrix[link_rows, from_index] = -self._below_graft_resistance[from_IDs]
         matrix[link_rows, to_index] = self._below_graft_resistance[to_IDs]
         matrix[link_rows, g_col] = graft_resistance
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+from ResourceLib import ResourceModel
 from ResourceLib.BelowGround.Network.Network import Network
 from ResourceLib.BelowGround.Individual.FixedSalinity import FixedSalinity
 
@@ -27,6 +28,10 @@ class NetworkFixedSalinity(Network, FixedSalinity):
         # Use Network method
         super().addPlant(plant=plant)
 
+    def addPlants(self, plant_store):
+        # Add plants one by one (Network method)
+        ResourceModel.addPlants(self, plant_store)
+
     def calculateBelowgroundResources(self):
         """
         Calculate a growth reduction factor for each plant based on pore-water salinity below the
@@ -56,7 +61,7 @@ class NetworkFixedSalinity(Network, FixedSalinity):
         tags = {
             "prj_file": args,
             "required": ["f_radius"],
-            "optional": ["exchange"]
+            "optional": ["exchange", "neighbour_skin"]
 
         }
         super(FixedSalinity, self).getInputParameters(**tags)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import numpy as np
+from ResourceLib.TiledGrid import TiledGrid
+
+
+class GridWindows:
+    """
+    Grid windows, chunks and blocks of the grid of a resource module (base class of ``ResourceModel``).
+    Requires the grid attributes set by ``ResourceModel.makeGrid`` (``grid``, ``grid_x``, ``grid_y``, ``grid_shape``,
+    ``tile_size`` and ``distance_stencils``) and the optional tags ``memory_limit`` and ``n_threads``.
+    """
+    def makeGridArray(self, dtype=float, background=0):
+        """
+        Create an array of grid size, i.e., a dense numpy array or, if the grid is tiled, a sparse ``TiledGrid``
+        that only allocates the tiles values are written to.
+        Args:
+            dtype (type): data type of node values
+            background (float or array): initial value of nodes, either constant or with shape(number_of_columns)
+        Returns:
+            numpy array or TiledGrid with shape of grid
+        """
+        if self.tile_size is None:
+            return np.full(self.grid_shape, fill_value=background, dtype=dtype)
+        return TiledGrid(self.grid_shape, self.tile_size, dtype=dtype, background=background)
+
+    @staticmethod
+    def mapGridArray(grid_array, function, dtype=None):
+        """
+        Apply an element-wise function to an array of grid size (see ``makeGridArray``).
+        Args:
+            grid_array (array or TiledGrid): array of grid size
+            function (function): element-wise function of a numpy array
+            dtype (type): (optional) data type of the result (TiledGrid only)
+        Returns:
+            numpy array or TiledGrid with shape of grid
+        """
+        if isinstance(grid_array, TiledGrid):
+            return grid_array.map(function, dtype=dtype)
+        return function(grid_array)
+
+    @staticmethod
+    def countCells(cell_owner, n_plants):
+        """
+        Count the number of grid cells assigned to each plant in a single pass over the grid.
+        Args:
+            cell_owner (array): index of the plant assigned to each cell, negative values indicate unassigned cells
+            n_plants (int): number of plants
+        Returns:
+            array of shape(n_plants)
+        """
+        cell_owner = np.ravel(cell_owner)
+        cell_owner = cell_owner[cell_owner >= 0].astype(int)
+        return np.bincount(cell_owner, minlength=n_plants)[:n_plants]
+
+    @staticmethod
+    def getClosestNodes(axis, positions):
+        """
+        Get the closest node coordinate on a grid axis for each position.
+        Args:
+            axis (array): node coordinates along the axis (ascending)
+            positions (array): positions on the axis
+        Returns:
+            numpy array with shape of positions
+        """
+        right = np.clip(np.searchsorted(axis, positions), 1, len(axis) - 1)
+        left = right - 1
+        closest = np.where(np.abs(axis[right] - positions) < np.abs(axis[left] - positions), right, left)
+        return axis[closest]
+
+    def getGridWindow(self, x, y, radius):
+        """
+        Get the part of the grid (window) covering a circle around a position, i.e., the window contains all nodes
+        with a distance <= radius to the position, the node closest to the position and the nodes enclosing the
+        position.
+        Args:
+            x (float): x-position
+            y (float): y-position
+            radius (float): radius of the circle
+        Returns:
+            slice, slice (rows and columns of the grid)
+        """
+        return (self.getAxisWindow(self.grid_y, y, radius),
+                self.getAxisWindow(self.grid_x, x, radius))
+
+    def getStencilWindow(self, x, y, radius):
+        """
+        Get the part of the grid (window) covering a circle around a position.
+        If the stencil cache is enabled, the window of the cached stencil is returned, otherwise see
+        ``getGridWindow``.
+        Args:
+            x (float): x-position
+            y (float): y-position
+            radius (float): radius of the circle
+        Returns:
+            slice, slice (rows and columns of the grid)
+        """
+        stencil_cache = getattr(self, "distance_stencils", None)
+        if stencil_cache is not None and stencil_cache.covers(x, y, radius):
+            return stencil_cache.getStencil(x, y, radius)[0]
+        return self.getGridWindow(x, y, radius)
+
+    def getStencilDistance(self, x, y, radius, window):
+        """
+        Get the distance between a position and the nodes of a grid window.
+        If the stencil cache is enabled, distances are taken from the cached stencil.
+        Args:
+            x (float): x-position
+            y (float): y-position
+            radius (float): radius of the circle, see ``getStencilWindow``
+            window (tuple): grid window, i.e., (a part of) the window returned by ``getStencilWindow``
+        Returns:
+            numpy array with shape of window
+        """
+        stencil_cache = getattr(self, "distance_stencils", None)
+        if stencil_cache is not None and stencil_cache.covers(x, y, radius):
+            (rows, columns), distance = stencil_cache.getStencil(x, y, radius)
+            return distance[window[0].start - rows.start:window[0].stop - rows.start,
+                            window[1].start - columns.start:window[1].stop - columns.start]
+        # Share distances with other modules using the same grid, unless memory is limited or the window is not
+        # limited by the radius
+        if self.grid.isShared() and np.isfinite(radius) and not hasattr(self, "memory_limit"):
+            return self.grid.getDistance(x, y, window)
+        return self.grid.calculateDistance(x, y, window)
+
+    @staticmethod
+    def getAxisWindow(axis, position, radius):
+        """
+        Get the indices of the grid axis covering the range position ± radius, see ``getGridWindow``.
+        The range is extended by one node on each side to be robust against rounding errors.
+        Args:
+            axis (array): node coordinates along the axis (ascending)
+            position (float): position on the axis
+            radius (float): half length of the range
+        Returns:
+            slice
+        """
+        n = len(axis)
+        start = int(np.searchsorted(axis, position - radius, side="left")) - 1
+        stop = int(np.searchsorted(axis, position + radius, side="right")) + 1
+        closest = int(np.abs(axis - position).argmin()) if not 0 <= start < stop <= n else start
+        start = max(min(start, closest), 0)
+        stop = min(max(stop, closest + 1), n)
+        return slice(start, stop)
+
+    @staticmethod
+    def getWindowSizes(windows):
+        """
+        Get the number of nodes of grid windows, see ``getGridWindow``.
+        Args:
+            windows (list): grid windows
+        Returns:
+            numpy array with shape(number_of_windows)
+        """
+        return np.array([(rows.stop - rows.start) * (columns.stop - columns.start) for rows, columns in windows],
+                        dtype=int)
+
+    def getPlantChunks(self, window_sizes, bytes_per_cell, grid_bytes):
+        """
+        Split plants into consecutive chunks, such that the arrays stored for the grid windows of all plants of a
+        chunk and the arrays of grid size fit into the memory limit (``memory_limit``, in MB).
+        Without memory limit, all plants are in one chunk.
+        Args:
+            window_sizes (array): number of nodes of the grid window of each plant
+            bytes_per_cell (int): number of bytes stored per node of a grid window
+            grid_bytes (int): number of bytes of the arrays of grid size
+        Returns:
+            list of ranges
+        """
+        n_plants = len(window_sizes)
+        if not hasattr(self, "memory_limit"):
+            return [range(0, n_plants)]
+        budget = self.memory_limit * 1e6 - grid_bytes
+        cumulative_bytes = np.cumsum(window_sizes) * bytes_per_cell
+        chunks = []
+        start = 0
+        while start < n_plants:
+            offset = cumulative_bytes[start - 1] if start > 0 else 0
+            # Each chunk contains at least one plant
+            stop = max(int(np.searchsorted(cumulative_bytes, offset + budget, side="right")), start + 1)
+            chunks.append(range(start, stop))
+            start = stop
+        self.reportChunks(n_chunks=len(chunks), unit="plants")
+        return chunks
+
+    def getGridBands(self, bytes_per_cell):
+        """
+        Split the rows of the grid into bands, such that arrays of band size fit into the memory limit
+        (``memory_limit``, in MB).
+        Without memory limit, the grid is not split.
+        Args:
+            bytes_per_cell (int): number of bytes stored per node of a band
+        Returns:
+            list of slices
+        """
+        n_rows, n_columns = self.grid_shape
+        if not hasattr(self, "memory_limit"):
+            return [slice(0, n_rows)]
+        # Each band contains at least one row
+        band_rows = max(int(self.memory_limit * 1e6 // (bytes_per_cell * n_columns)), 1)
+        bands = [slice(start, min(start + band_rows, n_rows)) for start in range(0, n_rows, band_rows)]
+        self.reportChunks(n_chunks=len(bands), unit="grid")
+        return bands
+
+    def getGridBlocks(self, bytes_per_cell, windows):
+        """
+        Split the grid into blocks, which are processed one after another, and get the plants with a grid window
+        intersecting each block.
+        Without tiling, blocks are bands of rows (see ``getGridBands``) and contain all plants. If the grid is tiled,
+        blocks are the tiles intersecting at least one grid window, i.e., empty tiles are skipped.
+        With a thread pool (see ``makeThreadPool``), bands are split, such that each thread processes several bands,
+        and the memory limit is shared by the threads. Bands then only contain plants intersecting them.
+        Args:
+            bytes_per_cell (int): number of bytes stored per node of a block
+            windows (list): grid window of each plant, see ``getGridWindow``
+        Returns:
+            list of tuples (block window, plant indices in ascending order)
+        """
+        if self.tile_size is None:
+            n_threads = getattr(self, "n_threads", 1)
+            bands = self.getGridBands(bytes_per_cell=bytes_per_cell * n_threads)
+            if n_threads == 1:
+                return [((band, slice(0, self.grid_shape[1])), range(len(windows))) for band in bands]
+            band_rows = max(int(np.ceil(self.grid_shape[0] / (4 * n_threads))), 1)
+            bands = [slice(start, min(start + band_rows, band.stop))
+                     for band in bands for start in range(band.start, band.stop, band_rows)]
+            starts = np.array([window[0].start for window in windows], dtype=int)
+            stops = np.array([window[0].stop for window in windows], dtype=int)
+            return [((band, slice(0, self.grid_shape[1])), np.flatnonzero((starts < band.stop) & (stops > band.start)))
+                    for band in bands]
+        tiles = TiledGrid(self.grid_shape, self.tile_size)
+        plants = {}
+        for i, window in enumerate(windows):
+            for key in tiles.getTileKeys(window):
+                plants.setdefault(key, []).append(i)
+        return [(tiles.getTileWindow(key), plants[key]) for key in sorted(plants)]
+
+    def reportChunks(self, n_chunks, unit):
+        """
+        Print the number of chunks used to meet the memory limit, whenever it changes.
+        Args:
+            n_chunks (int): number of chunks
+            unit (string): split unit, i.e., "plants" or "grid"
+        """
+        if n_chunks != getattr(self, "_n_chunks", None):
+            print("INFO: " + type(self).__name__ + " splits " + unit + " into " + str(n_chunks) +
+                  " chunk(s) to meet the memory limit of " + str(self.memory_limit) + " MB.")
+        self._n_chunks = n_chunks
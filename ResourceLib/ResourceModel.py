@@ -1,9 +1,18 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+import weakref
 import numpy as np
+from ResourceLib.StencilCache import StencilCache
+from ResourceLib.TiledGrid import TiledGrid
+from ResourceLib.SharedGrid import SharedGrid
+from ResourceLib.AnalyticZOI import AnalyticZOI
+from ResourceLib.GridWindows import GridWindows
+from PopulationLib.PopManager.SpatialIndex import SpatialIndex
+from ProjectLib import helpers
 
 
-class ResourceModel:
+class ResourceModel(GridWindows):
     """
     Parent class for all resource modules.
     """
@@ -42,6 +51,65 @@ class ResourceModel:
         """
         pass
 
+    def addPlants(self, plant_store):
+        """
+        Add all plants of a group and their relevant geometry and parameters to the object to
+        be used in the next time step.
+        Modules that can process contiguous arrays override this method, by default ``addPlant`` is called for
+        each plant.
+        Args:
+            plant_store (PlantStore): columnar store of the plants of a group,
+                see ``pyMANGA.PopulationLib.PopManager.PlantStore``
+        """
+        for plant in plant_store.getPlants():
+            self.addPlant(plant)
+
+    def setGrowthConceptInformation(self, plants, key, values):
+        """
+        Write a variable to the growth information of plants.
+        Args:
+            plants (list): plants (see ``addPlant``) and plant stores (see ``addPlants``) in the order they were added
+            key (string): name of variable
+            values (array): values of all plants
+        """
+        start = 0
+        for plant in plants:
+            try:
+                n_plants = plant.getNumberOfPlants()
+            except AttributeError:
+                growth_concept_information = plant.getGrowthConceptInformation()
+                growth_concept_information[key] = values[start]
+                plant.setGrowthConceptInformation(growth_concept_information)
+                start += 1
+            else:
+                plant.growth_concept_information.setColumn(key, values[start:start + n_plants])
+                start += n_plants
+
+    def setSpatialIndex(self, spatial_index):
+        """
+        Set the spatial index of all plants of the current time step, provided by the time stepper.
+        Args:
+            spatial_index (SpatialIndex): spatial index, see ``pyMANGA.PopulationLib.PopManager.SpatialIndex``
+        """
+        self.spatial_index = spatial_index
+        grid = getattr(self, "grid", None)
+        if grid is not None:
+            grid.setSpatialIndex(spatial_index)
+
+    def getSpatialIndex(self, x, y):
+        """
+        Get the spatial index provided by the time stepper, if it contains the plants added to the module.
+        Args:
+            x (array): x-positions of plants added to the module
+            y (array): y-positions of plants added to the module
+        Returns:
+            SpatialIndex or None
+        """
+        spatial_index = getattr(self, "spatial_index", None)
+        if spatial_index is not None and spatial_index.hasPositions(x, y):
+            return spatial_index
+        return None
+
     def getInputParameters(self, **tags):
         """
         Read module tags from project file.
@@ -92,7 +160,11 @@ class ResourceModel:
 
     def makeGrid(self):
         """
-        Create grid with defined size and resolution
+        Create grid with defined size and resolution.
+        Modules with the same grid definition share the grid and the distances between plants and nodes, see
+        ``pyMANGA.ResourceLib.SharedGrid``.
+        If the optional tag ``tile_size`` is given, the grid is tiled, i.e., no arrays of grid size are allocated and
+        modules store node values in sparse tiled grids (see ``makeGridArray``).
         Sets:
             multiple float
         """
@@ -100,17 +172,230 @@ class ResourceModel:
         l_y = self.y_2 - self.y_1
         x_step = l_x / self.x_resolution
         y_step = l_y / self.y_resolution
-        xe = np.linspace(self.x_1 + x_step / 2.,
-                         self.x_2 - x_step / 2.,
-                         int(self.x_resolution),
-                         endpoint=True)
-        ye = np.linspace(self.y_1 + y_step / 2.,
-                         self.y_2 - y_step / 2.,
-                         int(self.y_resolution),
-                         endpoint=True)
-        self.my_grid = np.meshgrid(xe, ye)
+        self.tile_size = int(self.tile_size) if hasattr(self, "tile_size") else None
+        # Release the previous grid of the module, the grid is also released if the module is deleted
+        if getattr(self, "grid_release", None) is not None:
+            self.grid_release()
+        self.grid = SharedGrid.getGrid(self.x_1, self.x_2, self.y_1, self.y_2, self.x_resolution,
+                                       self.y_resolution, tile_size=self.tile_size)
+        self.grid_release = weakref.finalize(self, self.grid.releaseGrid)
+        self.grid_x, self.grid_y = self.grid.grid_x, self.grid.grid_y
+        self.grid_shape = self.grid.shape
+        if self.tile_size is None:
+            self.my_grid = self.grid.my_grid
         self.mesh_size = np.maximum(x_step, y_step)
         self.cell_area = x_step * y_step
+        self.makeStencilCache()
+        self.makeThreadPool()
+
+    def makeStencilCache(self):
+        """
+        Create a cache of distance stencils for the grid, if enabled by the optional tag ``stencil_cache``, see
+        ``pyMANGA.ResourceLib.StencilCache``.
+        Optional tags: ``stencil_resolution`` (sub-cell offsets per cell, default: 4) and ``stencil_cache_size``
+        (number of stencils, default: 1000).
+        Sets:
+            bool, StencilCache or None
+        """
+        self.stencil_cache = self.makeBoolFromArg("stencil_cache")
+        self.distance_stencils = None
+        if self.stencil_cache:
+            if not hasattr(self, "stencil_resolution"):
+                self.stencil_resolution = 4
+                print("> Set resource parameter 'stencil_resolution' to default:", self.stencil_resolution)
+            if not hasattr(self, "stencil_cache_size"):
+                self.stencil_cache_size = 1000
+                print("> Set resource parameter 'stencil_cache_size' to default:", self.stencil_cache_size)
+            self.distance_stencils = StencilCache(grid_x=self.grid_x, grid_y=self.grid_y,
+                                                  resolution=self.stencil_resolution, size=self.stencil_cache_size)
+
+    def makeThreadPool(self):
+        """
+        Create a pool of threads for the grid calculations, if enabled by the optional tag ``n_threads``.
+        Blocks of the grid (see ``getGridBlocks``) and groups of plants (see ``mapPlants``) are processed in parallel,
+        results are combined in a fixed order, i.e., they are identical to the serial calculation.
+        Sets:
+            int, ThreadPoolExecutor or None
+        """
+        self.n_threads = max(int(self.n_threads), 1) if hasattr(self, "n_threads") else 1
+        self.thread_pool = ThreadPoolExecutor(max_workers=self.n_threads) if self.n_threads > 1 else None
+
+    def shutdownThreadPool(self):
+        """
+        Shut down the pool of threads (see ``makeThreadPool``) at the end of the model run.
+        Sets:
+            None
+        """
+        if getattr(self, "thread_pool", None) is not None:
+            self.thread_pool.shutdown()
+            self.thread_pool = None
+
+    def mapParallel(self, function, items):
+        """
+        Apply a function to each item on the thread pool, or one after another if there is no thread pool.
+        Args:
+            function (function): function of an item
+            items (list): items
+        Returns:
+            list of results in the order of items
+        """
+        if getattr(self, "thread_pool", None) is None:
+            return [function(item) for item in items]
+        return list(self.thread_pool.map(function, items))
+
+    def mapPlants(self, function, plants):
+        """
+        Apply a function to each plant, processing groups of consecutive plants on the thread pool.
+        Args:
+            function (function): function of the plant index
+            plants (array): plant indices
+        Returns:
+            list of results in the order of plants
+        """
+        if getattr(self, "thread_pool", None) is None:
+            return [function(i) for i in plants]
+        groups = np.array_split(np.asarray(plants, dtype=int), 4 * self.n_threads)
+        results = self.mapParallel(lambda group: [function(i) for i in group], groups)
+        return [result for group in results for result in group]
+
+    def usesRandomState(self):
+        """
+        Check whether the module draws random numbers from the global random state of numpy during the calculation of
+        resources, see ``calculateConcurrently``. Modules, which do not draw random numbers, override this method.
+        Returns:
+            bool
+        """
+        return True
+
+    @staticmethod
+    def calculateConcurrently(resource_concepts, calculations, thread_pool):
+        """
+        Run the resource calculations of several modules concurrently on a thread pool.
+        Modules using the global random state (see ``usesRandomState``) are calculated one after another in the
+        calling thread, in the given order, while all other modules are calculated on the thread pool. Random numbers
+        are thus drawn in the same order as in the serial calculation, i.e., results are identical.
+        Args:
+            resource_concepts (list): resource modules
+            calculations (list): function calculating the resources of each module (without arguments)
+            thread_pool (ThreadPoolExecutor): thread pool, or None to calculate all modules one after another
+        Returns:
+            list of results in the order of resource_concepts
+        """
+        if thread_pool is None:
+            return [calculation() for calculation in calculations]
+        random = [resource_concept.usesRandomState() for resource_concept in resource_concepts]
+        futures = {k: thread_pool.submit(calculation) for k, calculation in enumerate(calculations) if not random[k]}
+        results = {k: calculation() for k, calculation in enumerate(calculations) if random[k]}
+        results.update({k: future.result() for k, future in futures.items()})
+        return [results[k] for k in range(len(calculations))]
+
+    def sumPlantValues(self, windows, function, dtype=float):
+        """
+        Sum up the values of all plants on the grid, processing blocks of the grid (see ``getGridBlocks``) on the
+        thread pool. Within each block, values are added in the order of the plants, i.e., sums are identical to
+        adding the values of the grid windows one after another.
+        Args:
+            windows (dict): grid window of each plant (keys in ascending order)
+            function (function): values of a plant within (a part of) its grid window, ``function(i, window)``
+            dtype (type): data type of the values
+        Returns:
+            grid array (see ``makeGridArray``), dictionary with the number of non-zero values of each plant
+        """
+        plants = np.array(list(windows.keys()), dtype=int)
+        window_list = list(windows.values())
+
+        def sumBlock(block_plants):
+            block, block_plants = block_plants
+            values = np.zeros((block[0].stop - block[0].start, block[1].stop - block[1].start), dtype=dtype)
+            counts = {}
+            for i in plants[block_plants]:
+                rows = slice(max(windows[i][0].start, block[0].start), min(windows[i][0].stop, block[0].stop))
+                columns = slice(max(windows[i][1].start, block[1].start), min(windows[i][1].stop, block[1].stop))
+                if rows.start >= rows.stop or columns.start >= columns.stop:
+                    continue
+                plant_values = function(i, (rows, columns))
+                values[rows.start - block[0].start:rows.stop - block[0].start,
+                       columns.start - block[1].start:columns.stop - block[1].start] += plant_values
+                counts[i] = np.count_nonzero(plant_values)
+            return values, counts
+
+        blocks = self.getGridBlocks(bytes_per_cell=np.dtype(dtype).itemsize, windows=window_list)
+        grid_array = self.makeGridArray(dtype=dtype)
+        counts = dict.fromkeys(windows.keys(), 0)
+        for (block, _), (values, block_counts) in zip(blocks, self.mapParallel(sumBlock, blocks)):
+            grid_array[block] = values
+            for i, count in block_counts.items():
+                counts[i] += count
+        return grid_array, counts
+
+    def makeBackend(self, backends):
+        """
+        Get the calculation backend of the module from the optional tag ``backend``.
+        Args:
+            backends (list): names of the backends supported by the module, the first one is the default
+        Returns:
+            string
+        """
+        if not hasattr(self, "backend"):
+            print("> Set resource parameter 'backend' to default:", backends[0])
+            return backends[0]
+        backend = str(self.backend).strip().lower()
+        if backend not in backends:
+            print("ERROR: backend '" + backend + "' is not supported by " + type(self).__name__ + ".")
+            print("Please choose one of: " + ", ".join(backends) + ".")
+            exit()
+        return backend
+
+    def getOverlappingPairs(self, x, y, radius):
+        """
+        Get all pairs of plants with overlapping radii, using the spatial index of the time step, if available (see
+        ``pyMANGA.PopulationLib.PopManager.SpatialIndex.getOverlappingPairs``).
+        Args:
+            x (array): x-positions of plants
+            y (array): y-positions of plants
+            radius (array): radius of each plant
+        Returns:
+            numpy array of shape(number_of_pairs, 2)
+        """
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        spatial_index = self.getSpatialIndex(x, y)
+        if spatial_index is None:
+            spatial_index = SpatialIndex(x, y)
+        return spatial_index.getOverlappingPairs(radius)
+
+    def getAnalyticZOI(self, x, y, radius):
+        """
+        Get the grid-free zone of influence geometry of the plants, see ``pyMANGA.ResourceLib.AnalyticZOI``.
+        Args:
+            x (array): x-positions of plants
+            y (array): y-positions of plants
+            radius (array): radius of the zone of influence of each plant
+        Returns:
+            AnalyticZOI
+        """
+        return AnalyticZOI(x, y, radius, self.getOverlappingPairs(x, y, radius))
+
+    def getIsolatedPlants(self, x, y, radius):
+        """
+        Find plants, which do not overlap with any other plant, i.e., which do not share a grid node with other
+        plants. As the stencil cache approximates distances, radii are extended by the mesh size if it is enabled.
+        Plants with infinite radius overlap with all other plants.
+        Args:
+            x (array): x-positions of plants
+            y (array): y-positions of plants
+            radius (array): radius of the grid window of each plant
+        Returns:
+            numpy array of bools with shape(number_of_plants)
+        """
+        radius = np.asarray(radius, dtype=float)
+        if len(radius) < 2:
+            return np.ones(len(radius), dtype=bool)
+        if not np.all(np.isfinite(radius)):
+            return np.zeros(len(radius), dtype=bool)
+        margin = self.mesh_size if self.distance_stencils is not None else 0
+        isolated = np.ones(len(radius), dtype=bool)
+        isolated[self.getOverlappingPairs(x, y, radius * (1 + 1e-9) + margin).ravel()] = False
+        return isolated
 
     def makeBoolFromArg(self, var_name):
         """
@@ -120,12 +405,4 @@ class ResourceModel:
         Returns:
             bool
         """
-        if hasattr(self, var_name):
-            var = str(getattr(self, var_name))
-            if var.lower() in ['true', '1', '1.0', 't', 'y', 'yes']:
-                var = True
-            else:
-                var = False
-        else:
-            var = False
-        return var
+        return helpers.makeBoolFromArg(self, var_name)
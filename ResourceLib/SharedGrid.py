@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import threading
+import weakref
+import numpy as np
+
+
+class SharedGrid:
+    """
+    Regular grid shared by all resource modules with the same domain, resolution and tiling (see
+    ``ResourceModel.makeGrid``).
+    Grids are kept in a registry as long as a module uses them. If several modules use a grid, e.g. above- and
+    below-ground modules or the modules of ``Merge``, the distances between plants and the nodes of their grid windows
+    (footprints) are calculated once and shared by all modules. Footprints are kept until a plant is no longer part of
+    the population.
+    Modules release the grid with ``releaseGrid``. Footprints are read and stored under a lock, i.e., modules may
+    calculate distances on several threads.
+    """
+    registry = weakref.WeakValueDictionary()
+
+    def __init__(self, x_1, x_2, y_1, y_2, x_resolution, y_resolution, tile_size=None):
+        """
+        Args:
+            x_1 (float): x-coordinate of left border of grid
+            x_2 (float): x-coordinate of right border of grid
+            y_1 (float): y-coordinate of bottom border of grid
+            y_2 (float): y-coordinate of top border of grid
+            x_resolution (int): number of nodes along the x-axis
+            y_resolution (int): number of nodes along the y-axis
+            tile_size (int): (optional) number of nodes per tile edge, no dense arrays of grid size are created if
+                the grid is tiled
+        """
+        x_step = (x_2 - x_1) / x_resolution
+        y_step = (y_2 - y_1) / y_resolution
+        self.grid_x = np.linspace(x_1 + x_step / 2., x_2 - x_step / 2., int(x_resolution), endpoint=True)
+        self.grid_y = np.linspace(y_1 + y_step / 2., y_2 - y_step / 2., int(y_resolution), endpoint=True)
+        self.shape = (len(self.grid_y), len(self.grid_x))
+        self.tile_size = tile_size
+        self.my_grid = np.meshgrid(self.grid_x, self.grid_y) if tile_size is None else None
+        self.n_modules = 0
+        self.footprints = {}
+        self.footprints_lock = threading.Lock()
+        self.spatial_index = None
+
+    @classmethod
+    def getGrid(cls, x_1, x_2, y_1, y_2, x_resolution, y_resolution, tile_size=None):
+        """
+        Get the grid with the given definition from the registry, create it if required.
+        Args:
+            see ``SharedGrid``
+        Returns:
+            SharedGrid
+        """
+        key = (float(x_1), float(x_2), float(y_1), float(y_2), int(x_resolution), int(y_resolution), tile_size)
+        grid = cls.registry.get(key)
+        if grid is None:
+            grid = cls(*key)
+            cls.registry[key] = grid
+        grid.n_modules += 1
+        return grid
+
+    def releaseGrid(self):
+        """
+        Release the grid by a module, e.g. if the module is deleted or creates a new grid. Footprints are removed if
+        the grid is no longer shared.
+        Sets:
+            int
+        """
+        self.n_modules = max(self.n_modules - 1, 0)
+        if not self.isShared():
+            with self.footprints_lock:
+                self.footprints = {}
+
+    def isShared(self):
+        """
+        Check whether the grid is used by more than one module, i.e., whether footprints are worth storing.
+        Returns:
+            bool
+        """
+        return self.n_modules > 1
+
+    def calculateDistance(self, x, y, window):
+        """
+        Calculate the distance between a position and the nodes of a grid window.
+        Args:
+            x (float): x-position
+            y (float): y-position
+            window (tuple): grid window (slices of rows and columns)
+        Returns:
+            numpy array with shape of window
+        """
+        return (((self.grid_x[np.newaxis, window[1]] - x)**2 +
+                 (self.grid_y[window[0], np.newaxis] - y)**2)**0.5)
+
+    def getDistance(self, x, y, window):
+        """
+        Get the distance between a position and the nodes of a grid window from the footprint of the position.
+        If the window is not covered by the footprint, the footprint is extended to the bounding box of both windows.
+        Distances are calculated outside the lock. If several threads extend the footprint of a position at the same
+        time, the last footprint is kept, unless the stored footprint covers it. As distances do not depend on the
+        footprint, results are the same in any case.
+        Args:
+            x (float): x-position
+            y (float): y-position
+            window (tuple): grid window (slices of rows and columns)
+        Returns:
+            numpy array with shape of window (read-only view)
+        """
+        key = (x, y)
+        rows, columns = window
+        with self.footprints_lock:
+            footprint = self.footprints.get(key)
+        if footprint is not None and self.coversWindow(footprint[0], window):
+            (rows, columns), distance = footprint
+        else:
+            if footprint is not None:
+                footprint_rows, footprint_columns = footprint[0]
+                rows = slice(min(rows.start, footprint_rows.start), max(rows.stop, footprint_rows.stop))
+                columns = slice(min(columns.start, footprint_columns.start), max(columns.stop, footprint_columns.stop))
+            distance = self.calculateDistance(x, y, (rows, columns))
+            distance.flags.writeable = False
+            with self.footprints_lock:
+                footprint = self.footprints.get(key)
+                if footprint is None or not self.coversWindow(footprint[0], (rows, columns)):
+                    self.footprints[key] = ((rows, columns), distance)
+        return distance[window[0].start - rows.start:window[0].stop - rows.start,
+                        window[1].start - columns.start:window[1].stop - columns.start]
+
+    @staticmethod
+    def coversWindow(footprint_window, window):
+        """
+        Check whether a footprint covers a grid window.
+        Args:
+            footprint_window (tuple): grid window of the footprint (slices of rows and columns)
+            window (tuple): grid window (slices of rows and columns)
+        Returns:
+            bool
+        """
+        (footprint_rows, footprint_columns), (rows, columns) = footprint_window, window
+        return (footprint_rows.start <= rows.start and rows.stop <= footprint_rows.stop and
+                footprint_columns.start <= columns.start and columns.stop <= footprint_columns.stop)
+
+    def setSpatialIndex(self, spatial_index):
+        """
+        Remove footprints of positions that are not part of the population of the current time step.
+        Args:
+            spatial_index (SpatialIndex): spatial index of all plants of the time step, see
+                ``pyMANGA.PopulationLib.PopManager.SpatialIndex``
+        """
+        if spatial_index is None or spatial_index is self.spatial_index:
+            return
+        self.spatial_index = spatial_index
+        positions = set(zip(spatial_index.x.tolist(), spatial_index.y.tolist()))
+        with self.footprints_lock:
+            self.footprints = {key: footprint for key, footprint in self.footprints.items() if key in positions}
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+import threading
+import numpy as np
+
+
+class StencilCache:
+    """
+    Cache of distance stencils on a regular grid (see ``ResourceModel.makeGrid``).
+    A stencil contains the distances of the grid nodes around a position to this position. Stencils are keyed on
+    the radius, rounded up to a multiple of 1/resolution of the mesh size, and on the position of the plant
+    relative to the grid nodes (sub-cell offset), rounded to 1/resolution of a cell. Thus, plants that only differ
+    by their offset on the grid share a stencil. The least recently used stencils are removed if the cache exceeds
+    its size. The cache can be used by several threads.
+    Note: distances are calculated from the rounded sub-cell offset, i.e., results differ slightly from the exact
+    distances.
+    """
+    def __init__(self, grid_x, grid_y, resolution, size):
+        """
+        Args:
+            grid_x (array): node coordinates along the x-axis (ascending, equidistant)
+            grid_y (array): node coordinates along the y-axis (ascending, equidistant)
+            resolution (int): number of sub-cell offsets per cell and radius steps per mesh size
+            size (int): maximum number of stencils in the cache
+        """
+        self.grid_x = np.asarray(grid_x)
+        self.grid_y = np.asarray(grid_y)
+        self.dx = (self.grid_x[-1] - self.grid_x[0]) / max(len(self.grid_x) - 1, 1) or 1.
+        self.dy = (self.grid_y[-1] - self.grid_y[0]) / max(len(self.grid_y) - 1, 1) or 1.
+        self.resolution = int(resolution)
+        self.radius_step = min(self.dx, self.dy) / self.resolution
+        self.size = int(size)
+        self.stencils = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def covers(self, x, y, radius):
+        """
+        Check whether a stencil can be used for a position and radius, i.e., whether the position is within the
+        range of grid nodes and the radius is finite.
+        Args:
+            x (float): x-position
+            y (float): y-position
+            radius (float): radius
+        Returns:
+            bool
+        """
+        return bool(np.isfinite(radius) and
+                    self.grid_x[0] <= x <= self.grid_x[-1] and self.grid_y[0] <= y <= self.grid_y[-1])
+
+    def getNode(self, axis, step, position):
+        """
+        Get the index of the grid node left of a position and the rounded sub-cell offset of the position.
+        Args:
+            axis (array): node coordinates along the axis
+            step (float): distance between nodes
+            position (float): position on the axis
+        Returns:
+            int, int
+        """
+        relative_position = (position - axis[0]) / step
+        node = int(np.floor(relative_position))
+        offset = int(round((relative_position - node) * self.resolution))
+        if offset == self.resolution:
+            node, offset = node + 1, 0
+        return node, offset
+
+    def getStencil(self, x, y, radius):
+        """
+        Get the grid window covering a circle around a position and the distance stencil of the window.
+        Args:
+            x (float): x-position
+            y (float): y-position
+            radius (float): radius
+        Returns:
+            tuple of slices (rows and columns of ``my_grid``), numpy array with shape of window
+        """
+        node_x, offset_x = self.getNode(self.grid_x, self.dx, x)
+        node_y, offset_y = self.getNode(self.grid_y, self.dy, y)
+        key = (int(np.ceil(radius / self.radius_step)), offset_x, offset_y)
+        with self.lock:
+            try:
+                stencil = self.stencils[key]
+                self.stencils.move_to_end(key)
+                self.hits += 1
+            except KeyError:
+                stencil = self.makeStencil(*key)
+                self.stencils[key] = stencil
+                if len(self.stencils) > self.size:
+                    self.stencils.popitem(last=False)
+                self.misses += 1
+        n_y, n_x = np.shape(stencil)
+        half_y, half_x = n_y // 2, n_x // 2
+        rows = slice(max(node_y - half_y, 0), min(node_y + half_y + 1, len(self.grid_y)))
+        columns = slice(max(node_x - half_x, 0), min(node_x + half_x + 1, len(self.grid_x)))
+        distance = stencil[rows.start - node_y + half_y:rows.stop - node_y + half_y,
+                           columns.start - node_x + half_x:columns.stop - node_x + half_x]
+        return (rows, columns), distance
+
+    def makeStencil(self, radius_steps, offset_x, offset_y):
+        """
+        Calculate the distance stencil for a rounded radius and sub-cell offset.
+        The stencil is centered on the grid node left of the position and extends one node beyond the radius.
+        Args:
+            radius_steps (int): radius in multiples of the radius step
+            offset_x (int): sub-cell offset in x-direction in multiples of 1/resolution of a cell
+            offset_y (int): sub-cell offset in y-direction in multiples of 1/resolution of a cell
+        Returns:
+            numpy array
+        """
+        radius = radius_steps * self.radius_step
+        half_x = int(np.ceil(radius / self.dx)) + 1
+        half_y = int(np.ceil(radius / self.dy)) + 1
+        nodes_x = (np.arange(-half_x, half_x + 1) - offset_x / self.resolution) * self.dx
+        nodes_y = (np.arange(-half_y, half_y + 1) - offset_y / self.resolution) * self.dy
+        return (nodes_x[np.newaxis, :]**2 + nodes_y[:, np.newaxis]**2)**0.5
+
+    def getMinimumDistance(self, x, y):
+        """
+        Get the distance between a position and its closest grid node, calculated from the rounded sub-cell offset
+        in the same way as the stencils.
+        Args:
+            x (float): x-position
+            y (float): y-position
+        Returns:
+            float
+        """
+        _, offset_x = self.getNode(self.grid_x, self.dx, x)
+        _, offset_y = self.getNode(self.grid_y, self.dy, y)
+        stencil = self.makeStencil(0, offset_x, offset_y)
+        return np.min(stencil)
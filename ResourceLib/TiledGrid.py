@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import numpy as np
+
+
+class TiledGrid:
+    """
+    Sparse grid of node values, split into square tiles (see ``ResourceModel.makeGrid``).
+    Tiles are only allocated when values are written to them. Nodes of tiles that are not allocated have the
+    background value, which is either a constant or a profile along the x-axis (i.e., one value per column).
+    Grid windows (tuple of row and column slices) and integer index arrays can be read and written like with numpy
+    arrays, e.g. ``grid[window] += values``.
+    """
+    def __init__(self, shape, tile_size, dtype=float, background=0):
+        """
+        Args:
+            shape (tuple): number of rows and columns of the grid
+            tile_size (int): number of nodes per tile edge
+            dtype (type): data type of node values
+            background (float or array): value of nodes in tiles that are not allocated, either constant or with
+                shape(number_of_columns)
+        """
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.tile_size = max(int(tile_size), 1)
+        self.dtype = np.dtype(dtype)
+        self.background = np.broadcast_to(np.asarray(background, dtype=self.dtype), (self.shape[1],)).copy()
+        self.tiles = {}
+
+    @classmethod
+    def fromArray(cls, array, tile_size):
+        """
+        Create tiled grid with all tiles allocated from a dense array.
+        Args:
+            array (array): node values with shape(number_of_rows, number_of_columns)
+            tile_size (int): number of nodes per tile edge
+        Returns:
+            TiledGrid
+        """
+        array = np.asarray(array)
+        grid = cls(np.shape(array), tile_size, dtype=array.dtype)
+        for key in grid.getTileKeys():
+            grid.tiles[key] = array[grid.getTileWindow(key)].copy()
+        return grid
+
+    @property
+    def nbytes(self):
+        return sum(tile.nbytes for tile in self.tiles.values()) + self.background.nbytes
+
+    def getTileWindow(self, key):
+        """
+        Get the grid window of a tile.
+        Args:
+            key (tuple): row and column of the tile
+        Returns:
+            slice, slice (rows and columns of the grid)
+        """
+        return (slice(key[0] * self.tile_size, min((key[0] + 1) * self.tile_size, self.shape[0])),
+                slice(key[1] * self.tile_size, min((key[1] + 1) * self.tile_size, self.shape[1])))
+
+    def getTileKeys(self, window=None):
+        """
+        Get all tiles (allocated or not) intersecting a grid window.
+        Args:
+            window (tuple): (optional) grid window. Default: whole grid
+        Returns:
+            list of tuples (row and column of the tile), in row-major order
+        """
+        if window is None:
+            window = (slice(0, self.shape[0]), slice(0, self.shape[1]))
+        rows, columns = window
+        if rows.start >= rows.stop or columns.start >= columns.stop:
+            return []
+        return [(tile_row, tile_column)
+                for tile_row in range(rows.start // self.tile_size, (rows.stop - 1) // self.tile_size + 1)
+                for tile_column in range(columns.start // self.tile_size, (columns.stop - 1) // self.tile_size + 1)]
+
+    def getAllocatedTileKeys(self):
+        """
+        Get all allocated tiles.
+        Returns:
+            list of tuples (row and column of the tile), in row-major order
+        """
+        return sorted(self.tiles.keys())
+
+    def getTile(self, key):
+        """
+        Get the node values of a tile, allocate the tile with background values if required.
+        Args:
+            key (tuple): row and column of the tile
+        Returns:
+            numpy array with shape of tile
+        """
+        try:
+            return self.tiles[key]
+        except KeyError:
+            rows, columns = self.getTileWindow(key)
+            tile = np.repeat(self.background[np.newaxis, columns], rows.stop - rows.start, axis=0)
+            self.tiles[key] = tile
+            return tile
+
+    def getIntersection(self, key, window):
+        """
+        Get the intersection of a tile and a grid window.
+        Args:
+            key (tuple): row and column of the tile
+            window (tuple): grid window
+        Returns:
+            tuple of slices (within the tile), tuple of slices (within the window)
+        """
+        tile_rows, tile_columns = self.getTileWindow(key)
+        rows = slice(max(window[0].start, tile_rows.start), min(window[0].stop, tile_rows.stop))
+        columns = slice(max(window[1].start, tile_columns.start), min(window[1].stop, tile_columns.stop))
+        return ((slice(rows.start - tile_rows.start, rows.stop - tile_rows.start),
+                 slice(columns.start - tile_columns.start, columns.stop - tile_columns.start)),
+                (slice(rows.start - window[0].start, rows.stop - window[0].start),
+                 slice(columns.start - window[1].start, columns.stop - window[1].start)))
+
+    def isWindow(self, index):
+        return isinstance(index, tuple) and len(index) == 2 and all(isinstance(i, slice) for i in index)
+
+    def getWindow(self, window):
+        """
+        Normalize a grid window, i.e., replace missing start and stop values of the slices.
+        Args:
+            window (tuple): grid window
+        Returns:
+            slice, slice
+        """
+        return tuple(slice(*index.indices(n)[:2]) for index, n in zip(window, self.shape))
+
+    def __getitem__(self, index):
+        """
+        Get node values of a grid window (copy) or of nodes given by integer index arrays.
+        Args:
+            index (tuple): grid window or tuple of row and column index arrays
+        Returns:
+            numpy array
+        """
+        if self.isWindow(index):
+            window = self.getWindow(index)
+            values = np.empty((window[0].stop - window[0].start, window[1].stop - window[1].start), dtype=self.dtype)
+            for key in self.getTileKeys(window):
+                tile_window, values_window = self.getIntersection(key, window)
+                if key in self.tiles:
+                    values[values_window] = self.tiles[key][tile_window]
+                else:
+                    values[values_window] = self.background[np.newaxis, window[1]][:, values_window[1]]
+            return values
+        rows, columns = (np.asarray(i, dtype=int) for i in index)
+        values = self.background[columns].copy()
+        keys = rows // self.tile_size * (self.shape[1] // self.tile_size + 1) + columns // self.tile_size
+        for key in np.unique(keys):
+            nodes = np.flatnonzero(keys == key)
+            tile_key = (rows[nodes[0]] // self.tile_size, columns[nodes[0]] // self.tile_size)
+            if tile_key in self.tiles:
+                values[nodes] = self.tiles[tile_key][rows[nodes] % self.tile_size, columns[nodes] % self.tile_size]
+        return values
+
+    def __setitem__(self, index, values):
+        """
+        Set node values of a grid window or of nodes given by integer index arrays. Tiles are allocated if required.
+        Args:
+            index (tuple): grid window or tuple of row and column index arrays
+            values (array): node values, broadcastable to the shape of the window or the index arrays
+        """
+        if self.isWindow(index):
+            window = self.getWindow(index)
+            values = np.broadcast_to(values, (window[0].stop - window[0].start, window[1].stop - window[1].start))
+            for key in self.getTileKeys(window):
+                tile_window, values_window = self.getIntersection(key, window)
+                self.getTile(key)[tile_window] = values[values_window]
+            return
+        rows, columns = (np.asarray(i, dtype=int) for i in index)
+        values = np.broadcast_to(values, np.shape(rows))
+        keys = rows // self.tile_size * (self.shape[1] // self.tile_size + 1) + columns // self.tile_size
+        for key in np.unique(keys):
+            nodes = np.flatnonzero(keys == key)
+            tile = self.getTile((rows[nodes[0]] // self.tile_size, columns[nodes[0]] // self.tile_size))
+            tile[rows[nodes] % self.tile_size, columns[nodes] % self.tile_size] = values[nodes]
+
+    def map(self, function, dtype=None):
+        """
+        Apply an element-wise function to all nodes, i.e., to all allocated tiles and to the background.
+        Args:
+            function (function): element-wise function of a numpy array
+            dtype (type): (optional) data type of the result. Default: data type of the grid
+        Returns:
+            TiledGrid
+        """
+        result = TiledGrid(self.shape, self.tile_size, dtype=dtype or self.dtype,
+                           background=function(self.background))
+        for key, tile in self.tiles.items():
+            result.tiles[key] = np.asarray(function(tile), dtype=result.dtype)
+        return result
+
+    def toArray(self):
+        """
+        Get the node values of the whole grid as dense array.
+        Returns:
+            numpy array with shape of grid
+        """
+        return self[(slice(0, self.shape[0]), slice(0, self.shape[1]))]
@@ -4,8 +4,10 @@
 @date: 2018-Today
 @author: jasper.bathmann@ufz.de, marie-christin.wimmler@tu-dresden.de
 """
-
-import copy
+from concurrent.futures import ThreadPoolExecutor
+from PopulationLib.PopManager.SpatialIndex import SpatialIndex
+from ProjectLib import helpers
+from ResourceLib import ResourceModel
 
 
 class DynamicTimeStep:
@@ -29,6 +31,34 @@ class DynamicTimeStep:
         self.aboveground_resources = []
         self.belowground_resources = []
         self._previous_plant_groups = []
+        self.spatial_index = SpatialIndex([], [])
+        self.iniConcurrentResources(project)
+
+    def iniConcurrentResources(self, project):
+        """
+        Create a pool of threads to calculate above- and below-ground resources concurrently, if enabled by the
+        optional time loop tag ``concurrent_resources``, see
+        ``pyMANGA.ResourceLib.ResourceModel.calculateConcurrently``.
+        Args:
+            project: project object
+        Sets:
+            ThreadPoolExecutor or None
+        """
+        self.thread_pool = None
+        time_loop = project.getProjectArgument("time_loop")
+        if time_loop is not None:
+            helpers.getInputParameters(self, prj_file=time_loop, optional=["concurrent_resources"])
+        if helpers.makeBoolFromArg(self, "concurrent_resources"):
+            self.thread_pool = ThreadPoolExecutor(max_workers=2)
+
+    def getSpatialIndex(self):
+        """
+        Get the spatial index of all plants of the current time step, e.g. for resource or dispersal modules.
+        Plants are indexed in the order of the plant groups and of the plants within each group.
+        Returns:
+            SpatialIndex, see ``pyMANGA.PopulationLib.PopManager.SpatialIndex``
+        """
+        return self.spatial_index
 
     def step(self, t_start, t_end, update_ag, update_bg):
         """
@@ -52,20 +82,36 @@ class DynamicTimeStep:
         for group_name, plant_group in plant_groups.items():
             plant_group.plant_dynamic_concept.prepareNextTimeStep(t_start, t_end)
 
-            for plant in plant_group.getPlants():
-                number_of_plants += 1
-                if update_ag:
-                    self.aboveground_resource_concept.addPlant(plant)
-                if update_bg:
-                    self.belowground_resource_concept.addPlant(plant)
+            plant_store = plant_group.getPlantStore()
+            number_of_plants += plant_store.getNumberOfPlants()
+            if update_ag:
+                self.aboveground_resource_concept.addPlants(plant_store)
+            if update_bg:
+                self.belowground_resource_concept.addPlants(plant_store)
+        # Spatial index of all plants for neighbourhood queries
+        self.spatial_index = SpatialIndex.fromPlantStores(
+            [plant_group.getPlantStore() for plant_group in plant_groups.values()])
+        for plant_group in plant_groups.values():
+            plant_group.setSpatialIndex(self.spatial_index)
+        if update_ag:
+            self.aboveground_resource_concept.setSpatialIndex(self.spatial_index)
+        if update_bg:
+            self.belowground_resource_concept.setSpatialIndex(self.spatial_index)
         # Only update resources if plants exist
         if number_of_plants > 0:
+            # Above- and below-ground resources are calculated concurrently, if enabled
+            resource_concepts, calculations = [], []
+            if update_ag:
+                resource_concepts.append(self.aboveground_resource_concept)
+                calculations.append(self.aboveground_resource_concept.calculateAbovegroundResources)
+            if update_bg:
+                resource_concepts.append(self.belowground_resource_concept)
+                calculations.append(self.belowground_resource_concept.calculateBelowgroundResources)
+            ResourceModel.calculateConcurrently(resource_concepts, calculations, self.thread_pool)
             if update_ag:
-                self.aboveground_resource_concept.calculateAbovegroundResources()
                 self.aboveground_resources = (
                     self.aboveground_resource_concept.getAbovegroundResources())
             if update_bg:
-                self.belowground_resource_concept.calculateBelowgroundResources()
                 self.belowground_resources = (
                     self.belowground_resource_concept.getBelowgroundResources())
 
@@ -83,33 +129,36 @@ class DynamicTimeStep:
         number_of_plants = 0
         eliminated_plant_groups = {}
         for group_name, plant_group in plant_groups.items():
-            kill_indices = []
-            for plant, i in zip(plant_group.getPlants(),
-                               range(plant_group.getNumberOfPlants())):
-                ## If a new plant is recruited in the current time step and
-                # the respective resource was not updated, set survival of
-                # the new plant to 1
-                try:
-                    ag = self.aboveground_resources[j]
-                    bg = self.belowground_resources[j]
-                    plant_group.plant_dynamic_concept.progressPlant(plant, ag, bg)
-                except IndexError:
-                    plant.setSurvival(1)
-
-                if not plant.getSurvival():
-                    kill_indices.append(i)
-
-                j += 1
-
-            # If all plants of a group died, make a copy of this plant set
-            if len(kill_indices) > 0 and plant_group.getNRecruits() == 0:
-                if len(kill_indices) == plant_group.getNumberOfPlants():
-                    eliminated_plant_groups[plant_group.group_name] = copy.deepcopy(
-                        plant_group)
+            n_plants = plant_group.getNumberOfPlants()
+            ag = self.aboveground_resources[j:j + n_plants]
+            bg = self.belowground_resources[j:j + n_plants]
+            if n_plants > 0 and len(ag) == n_plants and len(bg) == n_plants:
+                # Update all plants of the group at once
+                plant_group.plant_dynamic_concept.progressGroup(plant_group.getPlantStore(), ag, bg)
+                j += n_plants
+            else:
+                for plant in plant_group.getPlants():
+                    ## If a new plant is recruited in the current time step and
+                    # the respective resource was not updated, set survival of
+                    # the new plant to 1
+                    try:
+                        ag = self.aboveground_resources[j]
+                        bg = self.belowground_resources[j]
+                        plant_group.plant_dynamic_concept.progressPlant(plant, ag, bg)
+                    except IndexError:
+                        plant.setSurvival(1)
+
+                    j += 1
+
+            # If all plants of a group died, keep a snapshot of this plant set for the output
+            n_plants = plant_group.getNumberOfPlants()
+            if n_plants > 0 and plant_group.getNRecruits() == 0:
+                if not plant_group.getPlantStore().survival.any():
+                    eliminated_plant_groups[plant_group.group_name] = plant_group.getSnapshot()
                     self.model_output_concept.writeOutput(eliminated_plant_groups,
                                                  t_start,
                                                  group_died=True)
-            plant_group.removePlantsAtIndices(kill_indices)
+            plant_group.removeDeadPlants()
             plant_group.recruitPlants()
 
             # Add number of recruited plants to counter
@@ -133,6 +182,11 @@ class DynamicTimeStep:
         # Write output in last time step, even if not defined in the project
         # file
         self.model_output_concept.writeOutput(plant_groups, time, force_output=True)
+        self.aboveground_resource_concept.shutdownThreadPool()
+        self.belowground_resource_concept.shutdownThreadPool()
+        if self.thread_pool is not None:
+            self.thread_pool.shutdown()
+            self.thread_pool = None
 
     def setResources(self, ag_resources, bg_resources):
         """